@@ -1,8 +1,105 @@
+import logging
+import os
+import weakref
+
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event
+
+from RacketTracker.utils.logger import configure_logger
+from RacketTracker.utils.sql_utils import apply_sqlite_pragmas, read_sqlite_pragmas
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
 
 # from sqlalchemy.orm import DeclarativeBase
 
 # class Base(DeclarativeBase):
 #     pass
 
-db = SQLAlchemy()
\ No newline at end of file
+
+class Session(FlaskSession):
+    """Session that can take part in a group commit.
+
+    While ``info["group_commit"]`` is set (see RacketTracker.utils.write_queue), each
+    write runs inside its own savepoint of one shared transaction: ``commit()`` only
+    flushes and ``rollback()`` only discards the innermost savepoint. The write queue
+    commits the shared transaction once for the whole batch.
+    """
+
+    def commit(self) -> None:
+        if self.info.get("group_commit"):
+            self.flush()
+            return
+        super().commit()
+
+    def rollback(self) -> None:
+        if self.info.get("group_commit"):
+            savepoint = self.get_nested_transaction()
+            if savepoint is not None:
+                savepoint.rollback()
+            return
+        super().rollback()
+
+
+db = SQLAlchemy(session_options={"class_": Session})
+
+# Engines of the apps created in this process. Pooled connections must not be shared
+# with forked server workers, so a child drops them and opens its own. The set is weak
+# so engines of discarded apps (tests create many) are not kept alive by the hook.
+_fork_engines: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _dispose_engines_after_fork() -> None:
+    for engine in list(_fork_engines):
+        engine.dispose(close=False)
+
+
+# Fork hooks can never be removed, so this one is registered once for every engine.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_engines_after_fork)
+
+
+def configure_engine(app: Flask) -> dict:
+    """
+    Applies the SQLITE_PRAGMAS from the app config to every new database connection.
+
+    The values SQLite actually reports afterwards are logged and stored in
+    ``app.extensions["sqlite_pragmas"]``; some requests can be refused (an in-memory
+    database has no WAL, mmap_size is capped at compile time).
+
+    Args:
+        app (Flask): The application, already registered with ``db``.
+
+    Returns:
+        dict: The effective PRAGMA values, or an empty dict when nothing is configured
+            or the database is not SQLite.
+
+    Raises:
+        ValueError: If SQLITE_PRAGMAS names an unsupported PRAGMA or has a malformed value.
+    """
+    pragmas = {name: value for name, value in app.config.get("SQLITE_PRAGMAS", {}).items()
+               if value is not None and value != ""}
+    with app.app_context():
+        engine = db.engine
+        _fork_engines.add(engine)
+        if not pragmas or engine.dialect.name != "sqlite":
+            return {}
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+        # Pooled connections opened before the listener was added would keep the defaults.
+        engine.dispose()
+        with engine.connect() as conn:
+            effective = read_sqlite_pragmas(conn.connection.dbapi_connection, pragmas)
+
+    logger.info("SQLite engine settings: %s", ", ".join(f"{name}={value}" for name, value in effective.items()))
+    for name, requested in pragmas.items():
+        if str(effective[name]).upper() != str(requested).upper():
+            logger.warning("SQLite PRAGMA %s=%s was requested but %s is in effect", name, requested, effective[name])
+    app.extensions["sqlite_pragmas"] = effective
+    return effective
@@ -1,13 +1,13 @@
 import logging
 import json 
-from sqlalchemy import Text, Integer, Float, Boolean, Date, ForeignKey
+from sqlalchemy import Text, Integer, Float, Boolean, Date, ForeignKey, and_, or_, text, tuple_
 
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.sql.expression import select
+from sqlalchemy.sql.expression import Select, delete, insert, select, update
 # from sqlalchemy.orm import mapped_column
 # from RacketTracker.utils.api_utils import fetch_recommendation
-from typing import Optional, Union
-from datetime import date
+from typing import Iterator, Optional, Union
+from datetime import date, datetime
 
 # from RacketTracker.models.customer_model import Customers
 # from RacketTracker.models.string_model import Strings
@@ -15,10 +15,62 @@ from datetime import date
 
 from RacketTracker.db import db #, Base
 from RacketTracker.utils.logger import configure_logger
+from RacketTracker.utils.write_queue import run_write
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# Columns returned by the dictionary based read paths, in response order.
+ORDER_FIELDS = (
+    "order_id",
+    "customer",
+    "stringer",
+    "order_date",
+    "racket",
+    "mains_tension",
+    "mains_string",
+    "crosses_tension",
+    "crosses_string",
+    "replacement_grip",
+    "paid",
+    "completed",
+)
+
+# Columns of an order's status, polled by tablets at the counter.
+ORDER_STATUS_FIELDS = ("order_id", "stringer", "completed", "paid")
+
+# Filters accepted by Orders.search_orders and the bulk update and delete paths.
+ORDER_FILTERS = ("customer", "stringer", "racket", "string", "paid", "completed", "date_from", "date_to")
+
+# Sort keys accepted by Orders.search_orders; each one is served by an index.
+SEARCH_SORTS = ("order_id", "-order_id", "order_date", "-order_date")
+SEARCH_DEFAULT_LIMIT = 50
+SEARCH_MAX_LIMIT = 1000
+
+# Fields accepted per item by Orders.create_orders_bulk, and the batch size cap.
+BULK_ORDER_FIELDS = (
+    "customer",
+    "order_date",
+    "racket",
+    "mains_tension",
+    "mains_string",
+    "crosses_tension",
+    "crosses_string",
+    "replacement_grip",
+    "paid",
+)
+BULK_MAX_ORDERS = 1000
+
+# IDs per IN (...) list, well below SQLite's bound-parameter limit.
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# Rows removed per DELETE statement by the set-based delete paths.
+DELETE_CHUNK_SIZE = 5000
+
+# Indexes that older versions created and ensure_indexes now removes. ix_orders_done
+# covered completed orders, nearly the whole table, so SQLite never chose it.
+RETIRED_INDEXES = ("ix_orders_done",)
+
 
 
 # class Customers(db.Model):
@@ -852,6 +904,8 @@ class Orders(db.Model):
     """
 
     __tablename__ = "orders"
+    # Attributes FastJSONProvider writes when an order is passed to jsonify.
+    __json_fields__ = ORDER_FIELDS
 
     # also add grips parameter and an additional notes parameter
     order_id = db.Column(db.Integer, primary_key=True, autoincrement=True) # add price parameter
@@ -866,7 +920,63 @@ class Orders(db.Model):
     replacement_grip = db.Column(db.Text, nullable = True)
     paid = db.Column(db.Boolean, default=False)
     completed = db.Column(db.Boolean, default=False)
-    
+
+    # Secondary indexes backing the lookup, status and delete paths. The partial
+    # indexes only hold the small open/unpaid subsets of the history. Completed orders
+    # are most of it, so those are read with a table scan rather than an index.
+    __table_args__ = (
+        db.Index("ix_orders_customer_order_date", "customer", "order_date"),
+        db.Index("ix_orders_order_date", "order_date"),
+        db.Index("ix_orders_open", "order_id", sqlite_where=text("completed = 0")),
+        db.Index("ix_orders_unpaid", "order_id", sqlite_where=text("paid = 0")),
+        db.Index("ix_orders_stringer_completed", "stringer", "completed"),
+    )
+
+    @classmethod
+    def recreate_table(cls) -> None:
+        """
+        Drops and recreates the orders table with its indexes, deleting every order.
+
+        Runs on the session's connection so it can be queued with run_write like any
+        other write.
+
+        Raises:
+            SQLAlchemyError: For any database-related issues.
+        """
+        try:
+            connection = db.session.connection()
+            cls.__table__.drop(connection)
+            cls.__table__.create(connection)
+            db.session.commit()
+            logger.info("Recreated the orders table")
+        except SQLAlchemyError as e:
+            logger.error("Database error while recreating the orders table: %s", e)
+            db.session.rollback()
+            raise
+
+    @classmethod
+    def ensure_indexes(cls) -> None:
+        """
+        Creates any of the managed indexes that are missing from an existing orders table
+        and drops the ones in RETIRED_INDEXES.
+
+        ``db.create_all`` skips tables that already exist, so databases created before an
+        index was added would otherwise never receive it.
+
+        Raises:
+            SQLAlchemyError: For any database-related issues.
+        """
+        try:
+            for index in cls.__table__.indexes:
+                index.create(db.engine, checkfirst=True)
+            with db.engine.begin() as connection:
+                for name in RETIRED_INDEXES:
+                    connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+            logger.info("Ensured %s indexes on the orders table", len(cls.__table__.indexes))
+        except SQLAlchemyError as e:
+            logger.error("Database error while creating order indexes: %s", e)
+            raise
+
     def validate(self) -> None:
         """Validates the order instance before committing to the database.
 
@@ -920,7 +1030,7 @@ class Orders(db.Model):
             ValueError: If any field is invalid. 
             SQLAlchemyError: For any other database-related issues.
         """
-        logger.info(f"Received request to create order.")
+        logger.info("Received request to create order.")
 
         try:
             order = Orders(
@@ -937,20 +1047,90 @@ class Orders(db.Model):
             )
             order.validate()
         except ValueError as e:
-            logger.warning(f"Validation failed: {e}")
+            logger.warning("Validation failed: %s", e)
             raise
 
         try:           
             db.session.add(order)
             db.session.commit()
             paid_message = "Paid" if paid else "Unpaid"
-            logger.info(f"Order created. {order_date.strftime('%Y%m%d')} - {customer}: {racket} - {paid_message}")
+            logger.info("Order created. %s - %s: %s - %s", order_date.strftime('%Y%m%d'), customer, racket, paid_message)
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while creating order: {e}")
+            logger.error("Database error while creating order: %s", e)
             db.session.rollback()
             raise 
 
+    @classmethod
+    def create_orders_bulk(cls, orders: list[dict], all_or_nothing: bool = False) -> tuple[list[int], list[dict]]:
+        """
+        Validates and inserts many orders with one batched INSERT in a single transaction.
+
+        Every item is validated up front. Invalid items are reported by their position
+        in the input and skipped, unless all_or_nothing is set, in which case nothing
+        is inserted when any item is invalid.
+
+        Args:
+            orders (list[dict]): The orders to create. Each item takes the same fields as
+                create_order.
+            all_or_nothing (bool, optional): Insert nothing if any item is invalid.
+
+        Returns:
+            tuple[list[int], list[dict]]: The IDs of the created orders, in input order,
+            and one {"index", "message"} entry per invalid item.
+
+        Raises:
+            ValueError: If orders is not a list or holds more than BULK_MAX_ORDERS items.
+            SQLAlchemyError: For any database-related issues.
+        """
+        logger.info("Received request to create %s orders in bulk.", len(orders) if isinstance(orders, list) else 0)
+
+        if not isinstance(orders, list):
+            raise ValueError("orders must be a list.")
+        if len(orders) > BULK_MAX_ORDERS:
+            raise ValueError(f"At most {BULK_MAX_ORDERS} orders can be created at once.")
+
+        rows = []
+        errors = []
+        for index, item in enumerate(orders):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("order must be an object.")
+                unknown = set(item) - set(BULK_ORDER_FIELDS)
+                if unknown:
+                    raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+                row = {field: item.get(field) for field in BULK_ORDER_FIELDS}
+                row["paid"] = item.get("paid", False)
+                row["completed"] = False
+                cls(**row).validate()
+                rows.append(row)
+            except ValueError as e:
+                errors.append({"index": index, "message": str(e)})
+
+        if errors:
+            logger.warning("Validation failed for %s of %s bulk orders.", len(errors), len(orders))
+            if all_or_nothing:
+                return [], errors
+
+        if not rows:
+            return [], errors
+
+        try:
+            # A plain executemany: asking SQLite for ordered RETURNING rows makes SQLAlchemy
+            # fall back to one INSERT per row. Rowids are assigned consecutively while this
+            # transaction holds the write lock, so the IDs follow from the last one.
+            db.session.execute(insert(cls), rows)
+            last_id = db.session.execute(text("SELECT last_insert_rowid()")).scalar_one()
+            order_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+            db.session.commit()
+            logger.info("Created %s orders in bulk.", len(order_ids))
+            return order_ids, errors
+
+        except SQLAlchemyError as e:
+            logger.error("Database error while creating orders in bulk: %s", e)
+            db.session.rollback()
+            raise
+
 ##############################################
 # Delete orders
 ##############################################
@@ -967,110 +1147,202 @@ class Orders(db.Model):
             ValueError: If the order with the given ID does not exist.
             SQLAlchemyError: For any database-related issues.
         """
-        logger.info(f"Received request to delete order with ID {order_id}")
+        logger.info("Received request to delete order with ID %s", order_id)
 
         try:
             order = db.session.get(cls, order_id)
             if not order:
-                logger.warning(f"Attempted to delete non-existent order with ID {order_id}")
+                logger.warning("Attempted to delete non-existent order with ID %s", order_id)
                 raise ValueError(f"Order with ID {order_id} not found")
 
             db.session.delete(order)
             db.session.commit()
-            logger.info(f"Successfully deleted order with ID {order_id}")
+            logger.info("Successfully deleted order with ID %s", order_id)
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while deleting order with ID {order_id}: {e}")
+            logger.error("Database error while deleting order with ID %s: %s", order_id, e)
             db.session.rollback()
             raise
 
     @classmethod
-    def delete_order_by_customer(cls, customer: str) -> None:
+    def _delete_where(cls, condition, chunk_size: int) -> int:
         """
-        Permanently deletes an order by customer.
+        Deletes every order matching condition with set-based DELETE statements.
+
+        Rows are removed in chunks of at most chunk_size, each committed on its own, so
+        the SQLite write lock is released between chunks and a very large purge never
+        blocks other writers for long. Each chunk is a separate write queue job, so other
+        queued writes are committed in between. A failure part way through leaves the
+        chunks that were already committed deleted.
 
         Args:
-            customer (str): The name of the customer.
+            condition: The WHERE condition selecting the orders to delete.
+            chunk_size (int): Maximum number of rows deleted per statement.
+
+        Returns:
+            int: The number of deleted orders.
 
         Raises:
-            ValueError: If the order with the given customer does not exist.
+            ValueError: If chunk_size is not a positive integer.
             SQLAlchemyError: For any database-related issues.
+            WriteQueueUnavailable: If a queued chunk is not committed in time.
         """
-        logger.info(f"Received request to delete order with customer {customer}")
+        if isinstance(chunk_size, bool) or not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
 
-        try:
-            order = cls.query.filter_by(customer=customer).first() 
-            if not order:
-                logger.warning(f"Attempted to delete non-existent order with customer {customer}")
-                raise ValueError(f"Order with target {customer} not found")
+        deleted = 0
+        while True:
+            rowcount = run_write(cls._delete_chunk, condition, chunk_size)
+            deleted += rowcount
+            if rowcount < chunk_size:
+                return deleted
 
-            db.session.delete(order)
+    @classmethod
+    def _delete_chunk(cls, condition, chunk_size: int) -> int:
+        """Deletes and commits up to chunk_size orders matching condition; returns how many."""
+        try:
+            chunk = select(cls.order_id).where(condition).limit(chunk_size).scalar_subquery()
+            result = db.session.execute(
+                delete(cls).where(cls.order_id.in_(chunk)),
+                execution_options={"synchronize_session": "fetch"},
+            )
             db.session.commit()
-            logger.info(f"Successfully deleted order with customer {customer}")
-
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while deleting order with target {customer}: {e}")
+            return result.rowcount
+        except SQLAlchemyError:
             db.session.rollback()
             raise
 
     @classmethod
-    def delete_order_by_order_date(cls, order_date: date) -> None:
+    def delete_orders(cls, filters: dict, chunk_size: int = DELETE_CHUNK_SIZE) -> int:
         """
-        Permanently deletes an order by the order date.
+        Permanently deletes every order matching a combination of filters.
 
         Args:
-            order_date (int): The date of a given order.
+            filters (dict): Filters as accepted by search_orders, with at least one value set.
+            chunk_size (int, optional): Maximum number of rows deleted per statement.
+
+        Returns:
+            int: The number of deleted orders.
 
         Raises:
-            ValueError: If the order with the given order value does not exist.
+            ValueError: If the filters are invalid or empty, or no order matches them.
             SQLAlchemyError: For any database-related issues.
+            WriteQueueUnavailable: If a queued chunk is not committed in time.
         """
-        logger.info(f"Received request to delete order with date {order_date.strftime('%Y%m%d')}")
+        logger.info("Received request to delete orders matching %s", filters)
+
+        if not isinstance(filters, dict) or not filters:
+            raise ValueError("filter must be a non-empty object.")
 
         try:
-            order = cls.query.filter_by(order_date=order_date).first()
-            if not order:
-                logger.warning(f"Attempted to delete non-existent order with date {order_date.strftime('%Y%m%d')}")
-                raise ValueError(f"Order with order value {order_date.strftime('%Y%m%d')} not found")
+            [condition] = cls._bulk_target(None, filters)
+            deleted = cls._delete_where(condition, chunk_size)
+        except SQLAlchemyError as e:
+            logger.error("Database error while deleting orders matching %s: %s", filters, e)
+            raise
 
-            db.session.delete(order)
-            db.session.commit()
-            logger.info(f"Successfully deleted order with date {order_date.strftime('%Y%m%d')}")
+        if not deleted:
+            logger.warning("Attempted to delete non-existent orders matching %s", filters)
+            raise ValueError(f"No orders found matching {filters}")
+
+        logger.info("Successfully deleted %s order(s) matching %s", deleted, filters)
+        return deleted
+
+    @classmethod
+    def delete_order_by_customer(cls, customer: str, chunk_size: int = DELETE_CHUNK_SIZE) -> int:
+        """
+        Permanently deletes every order of a customer.
+
+        Args:
+            customer (str): The name of the customer.
+            chunk_size (int, optional): Maximum number of rows deleted per statement.
+
+        Returns:
+            int: The number of deleted orders.
+
+        Raises:
+            ValueError: If no order with the given customer exists.
+            SQLAlchemyError: For any database-related issues.
+            WriteQueueUnavailable: If a queued chunk is not committed in time.
+        """
+        logger.info("Received request to delete orders with customer %s", customer)
 
+        try:
+            deleted = cls._delete_where(cls.customer == customer, chunk_size)
         except SQLAlchemyError as e:
-            logger.error(f"Database error while deleting order with date {order_date.strftime('%Y%m%d')}: {e}")
-            db.session.rollback()
+            logger.error("Database error while deleting orders with customer %s: %s", customer, e)
             raise
-    
+
+        if not deleted:
+            logger.warning("Attempted to delete non-existent order with customer %s", customer)
+            raise ValueError(f"Order with customer {customer} not found")
+
+        logger.info("Successfully deleted %s order(s) with customer %s", deleted, customer)
+        return deleted
+
     @classmethod
-    def delete_order_by_completed(cls, completed: bool) -> None:
+    def delete_order_by_order_date(cls, order_date: date, chunk_size: int = DELETE_CHUNK_SIZE) -> int:
         """
-        Permanently deletes a order by the completion status.
+        Permanently deletes every order placed on a date.
 
         Args:
-            completed (bool): The completion status of that order. 
+            order_date (date): The date of the orders.
+            chunk_size (int, optional): Maximum number of rows deleted per statement.
+
+        Returns:
+            int: The number of deleted orders.
 
         Raises:
-            ValueError: If the order with the given completion status does not exist.
+            ValueError: If no order with the given date exists.
             SQLAlchemyError: For any database-related issues.
+            WriteQueueUnavailable: If a queued chunk is not committed in time.
         """
-        logger.info(f"Received request to delete order with completion status {completed}")
+        logger.info("Received request to delete orders with date %s", order_date.strftime('%Y%m%d'))
 
         try:
-            order = cls.query.filter_by(completed=completed).first()
-            if not order:
-                logger.warning(f"Attempted to delete non-existent order with completion {completed}")
-                raise ValueError(f"Order with completion {completed} not found")
+            deleted = cls._delete_where(cls.order_date == order_date, chunk_size)
+        except SQLAlchemyError as e:
+            logger.error("Database error while deleting orders with date %s: %s", order_date.strftime('%Y%m%d'), e)
+            raise
 
-            db.session.delete(order)
-            db.session.commit()
-            logger.info(f"Successfully deleted order with completion {completed}")
+        if not deleted:
+            logger.warning("Attempted to delete non-existent order with date %s", order_date.strftime('%Y%m%d'))
+            raise ValueError(f"Order with date {order_date.strftime('%Y%m%d')} not found")
+
+        logger.info("Successfully deleted %s order(s) with date %s", deleted, order_date.strftime('%Y%m%d'))
+        return deleted
+    
+    @classmethod
+    def delete_order_by_completed(cls, completed: bool, chunk_size: int = DELETE_CHUNK_SIZE) -> int:
+        """
+        Permanently deletes every order with the given completion status.
 
+        Args:
+            completed (bool): The completion status of the orders.
+            chunk_size (int, optional): Maximum number of rows deleted per statement.
+
+        Returns:
+            int: The number of deleted orders.
+
+        Raises:
+            ValueError: If no order with the given completion status exists.
+            SQLAlchemyError: For any database-related issues.
+            WriteQueueUnavailable: If a queued chunk is not committed in time.
+        """
+        logger.info("Received request to delete orders with completion status %s", completed)
+
+        try:
+            deleted = cls._delete_where(cls.completed == completed, chunk_size)
         except SQLAlchemyError as e:
-            logger.error(f"Database error while deleting order with completion {completed}: {e}")
-            db.session.rollback()
+            logger.error("Database error while deleting orders with completion %s: %s", completed, e)
             raise
 
+        if not deleted:
+            logger.warning("Attempted to delete non-existent order with completion %s", completed)
+            raise ValueError(f"Order with completion {completed} not found")
+
+        logger.info("Successfully deleted %s order(s) with completion %s", deleted, completed)
+        return deleted
 
 # ###############################################
 # # Get orders 
@@ -1091,20 +1363,48 @@ class Orders(db.Model):
             ValueError: If no order with the given ID is found.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to retrieve order with ID {order_id}")
+        logger.info("Attempting to retrieve order with ID %s", order_id)
 
         try:
             order = db.session.get(cls, order_id)
 
             if not order:
-                logger.info(f"Order with ID {order_id} not found")
+                logger.info("Order with ID %s not found", order_id)
                 raise ValueError(f"Order with ID {order_id} not found")
 
-            logger.info(f"Successfully retrieved order: ID={order.order_id}")
+            logger.info("Successfully retrieved order: ID=%s", order.order_id)
             return order
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving order by ID {order_id}: {e}")
+            logger.error("Database error while retrieving order by ID %s: %s", order_id, e)
+            raise
+
+    @classmethod
+    def get_order_status(cls, order_id: int) -> dict:
+        """
+        Retrieves the progress of an order: who strings it, and whether it is done and paid.
+
+        Only the status columns are selected, so polling clients stay cheap.
+
+        Args:
+            order_id (int): The ID of the order.
+
+        Returns:
+            dict: The order_id, stringer, completed and paid values.
+
+        Raises:
+            ValueError: If no order with the given ID is found.
+            SQLAlchemyError: If a database error occurs.
+        """
+        try:
+            row = db.session.execute(select(*[getattr(cls, field) for field in ORDER_STATUS_FIELDS])
+                                     .where(cls.order_id == order_id)).first()
+            if row is None:
+                raise ValueError(f"Order with ID {order_id} not found")
+            return row._asdict()
+
+        except SQLAlchemyError as e:
+            logger.error("Database error while retrieving the status of order %s: %s", order_id, e)
             raise
 
     @classmethod
@@ -1122,20 +1422,20 @@ class Orders(db.Model):
             ValueError: If no order with the given target are found.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to retrieve all orders for customer '{customer}'")
+        logger.info("Attempting to retrieve all orders for customer '%s'", customer)
 
         try:
             orders: list = cls.query.filter_by(customer=customer).all()
 
             if not orders:
-                logger.info(f"No orders found for customer '{customer}'")
+                logger.info("No orders found for customer '%s'", customer)
                 raise ValueError(f"No orders found for customer '{customer}'")
 
-            logger.info(f"Successfully retrieved {len(orders)} order(s) for customer '{customer}'")
+            logger.info("Successfully retrieved %s order(s) for customer '%s'", len(orders), customer)
             return orders
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving orders for customer '{customer}': {e}")
+            logger.error("Database error while retrieving orders for customer '%s': %s", customer, e)
             raise
 
     @classmethod
@@ -1153,20 +1453,20 @@ class Orders(db.Model):
             ValueError: If no orders with the given date are found.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to retrieve all orders with date '{order_date.strftime('%Y%m%d')}'")
+        logger.info("Attempting to retrieve all orders with date '%s'", order_date.strftime('%Y%m%d'))
 
         try:
             orders = cls.query.filter_by(order_date=order_date).all()
 
             if not orders:
-                logger.info(f"No orders found with date '{order_date.strftime('%Y%m%d')}'")
+                logger.info("No orders found with date '%s'", order_date.strftime('%Y%m%d'))
                 raise ValueError(f"No orders found with date '{order_date.strftime('%Y%m%d')}'")
 
-            logger.info(f"Successfully retrieved {len(orders)} order(s) with order value '{order_date.strftime('%Y%m%d')}'")
+            logger.info("Successfully retrieved %s order(s) with order value '%s'", len(orders), order_date.strftime('%Y%m%d'))
             return orders
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving orders by date '{order_date.strftime('%Y%m%d')}': {e}")
+            logger.error("Database error while retrieving orders by date '%s': %s", order_date.strftime('%Y%m%d'), e)
             raise
 
     @classmethod
@@ -1184,70 +1484,304 @@ class Orders(db.Model):
             ValueError: If no orders with the given completion status are found.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to retrieve all orders with completion status '{completed}'")
+        logger.info("Attempting to retrieve all orders with completion status '%s'", completed)
 
         try:
             orders = cls.query.filter_by(completed=completed).all()
 
             if not orders:
-                logger.info(f"No orders found with completion status '{completed}'")
+                logger.info("No orders found with completion status '%s'", completed)
                 raise ValueError(f"No orders found with completion status '{completed}'")
 
-            logger.info(f"Successfully retrieved {len(orders)} order(s) with completion status '{completed}'")
+            logger.info("Successfully retrieved %s order(s) with completion status '%s'", len(orders), completed)
             return orders
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving orders by completion status '{completed}': {e}")
+            logger.error("Database error while retrieving orders by completion status '%s': %s", completed, e)
             raise
 
     @classmethod
-    def get_all_orders(cls) -> list[dict]:
+    def _order_rows(cls, limit: Optional[int] = None, after: Optional[int] = None) -> list[dict]:
+        """
+        Fetches one keyset page of orders as plain dictionaries.
+
+        Only the mapped columns are selected, so no ORM instances are built.
+
+        Args:
+            limit (int, optional): Maximum number of rows to return.
+            after (int, optional): Only rows with an order_id greater than this are returned.
+
+        Returns:
+            list[dict]: The rows ordered by order_id.
+        """
+        return [row._asdict() for row in db.session.execute(cls.page_query(limit=limit, after=after))]
+
+    @classmethod
+    def page_query(cls, limit: Optional[int] = None, after: Optional[int] = None) -> Select:
         """
-        Retrieves all orders from the database as dictionaries.
+        Builds the keyset page query behind _order_rows; the async build runs it on its own engine.
+
+        Args:
+            limit (int, optional): Maximum number of rows to return.
+            after (int, optional): Only rows with an order_id greater than this are returned.
 
         Returns:
-            list[dict]: A list of dictionaries representing all orders.
+            Select: The query for the mapped columns, ordered by order_id.
 
         Raises:
+            ValueError: If limit or after are invalid.
+        """
+        cls._validate_page_args(limit, after)
+        stmt = select(*[getattr(cls, field) for field in ORDER_FIELDS]).order_by(cls.order_id)
+        if after is not None:
+            stmt = stmt.where(cls.order_id > after)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    @staticmethod
+    def _validate_page_args(limit: Optional[int], after: Optional[int]) -> None:
+        """
+        Validates keyset pagination arguments.
+
+        Raises:
+            ValueError: If limit is not a positive integer or after is not a non-negative integer.
+        """
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit < 1):
+            raise ValueError("limit must be a positive integer.")
+        if after is not None and (isinstance(after, bool) or not isinstance(after, int) or after < 0):
+            raise ValueError("after must be a non-negative integer.")
+
+    @classmethod
+    def get_all_orders(cls, limit: Optional[int] = None, after: Optional[int] = None) -> list[dict]:
+        """
+        Retrieves orders from the database as dictionaries, ordered by order_id.
+
+        Pagination is keyset based: pass the order_id of the last row of the previous
+        page as ``after`` to get the next page. Without a limit every order is returned.
+
+        Args:
+            limit (int, optional): Maximum number of orders to return.
+            after (int, optional): Only orders with an order_id greater than this are returned.
+
+        Returns:
+            list[dict]: A list of dictionaries representing the orders.
+
+        Raises:
+            ValueError: If limit or after are invalid.
             SQLAlchemyError: If any database error occurs.
         """
-        logger.info("Attempting to retrieve all orders from the database")
+        logger.info("Attempting to retrieve orders from the database (limit=%s, after=%s)", limit, after)
+        cls._validate_page_args(limit, after)
 
         try:
-            orders: list = db.session.scalars(select(cls)).all() # db.session.all()
+            results = cls._order_rows(limit=limit, after=after)
 
-            if not orders:
-                logger.warning("The orders table is empty.")
+            if not results:
+                logger.warning("No orders found (limit=%s, after=%s).", limit, after)
                 return []
 
-            results = [
-                {
-                    "order_id": order.order_id,
-                    "customer": order.customer,
-                    "stringer": order.stringer,
-                    "order_date": order.order_date,
-                    "racket": order.racket,
-                    "mains_tension": order.mains_tension,
-                    "mains_string": order.mains_string,
-                    "crosses_tension": order.crosses_tension,
-                    "crosses_string": order.crosses_string,
-                    "replacement_grip": order.replacement_grip,
-                    "paid": order.paid,
-                    "completed": order.completed
-                }
-                for order in orders
-            ]
-
-            logger.info(f"Retrieved {len(results)} orders from the database")
+            logger.info("Retrieved %s orders from the database", len(results))
             return results
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving all orders: {e}")
+            logger.error("Database error while retrieving all orders: %s", e)
             raise
 
-##########################################
-# Update orders
-##########################################
+    @classmethod
+    def iter_all_orders(cls, chunk_size: int = 1000, after: Optional[int] = None,
+                        limit: Optional[int] = None) -> Iterator[list[dict]]:
+        """
+        Lazily walks the orders table in keyset-paginated chunks.
+
+        Each chunk is a separate query, so memory use is bounded by chunk_size no matter
+        how large the table is. Arguments are validated eagerly, before the first chunk
+        is requested.
+
+        Args:
+            chunk_size (int, optional): Number of orders fetched per query.
+            after (int, optional): Start after this order_id.
+            limit (int, optional): Stop after this many orders in total.
+
+        Returns:
+            Iterator[list[dict]]: Chunks of orders, ordered by order_id.
+
+        Raises:
+            ValueError: If chunk_size, after or limit are invalid.
+            SQLAlchemyError: If any database error occurs while iterating.
+        """
+        cls._validate_page_args(chunk_size, after)
+        cls._validate_page_args(limit, None)
+        logger.info("Streaming orders in chunks of %s (after=%s, limit=%s)", chunk_size, after, limit)
+        return cls._iter_order_chunks(chunk_size, after, limit)
+
+    @classmethod
+    def _iter_order_chunks(cls, chunk_size: int, after: Optional[int], limit: Optional[int]) -> Iterator[list[dict]]:
+        """Generator backing iter_all_orders."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            try:
+                chunk = cls._order_rows(limit=size, after=after)
+            except SQLAlchemyError as e:
+                logger.error("Database error while streaming orders after ID %s: %s", after, e)
+                raise
+
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < size:
+                return
+            if remaining is not None:
+                remaining -= len(chunk)
+            after = chunk[-1]["order_id"]
+
+    @classmethod
+    def _filter_conditions(
+        cls,
+        customer: Optional[str] = None,
+        stringer: Optional[str] = None,
+        racket: Optional[str] = None,
+        string: Optional[str] = None,
+        paid: Optional[bool] = None,
+        completed: Optional[bool] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> list:
+        """
+        Builds the WHERE conditions for a combination of order filters.
+
+        Args:
+            customer (str, optional): Exact customer name.
+            stringer (str, optional): Exact stringer name.
+            racket (str, optional): Exact racket name.
+            string (str, optional): String used on either the mains or the crosses.
+            paid (bool, optional): Paid status.
+            completed (bool, optional): Completion status.
+            date_from (date, optional): Earliest order date (inclusive).
+            date_to (date, optional): Latest order date (inclusive).
+
+        Returns:
+            list: SQLAlchemy conditions to be AND-ed together.
+
+        Raises:
+            ValueError: If any filter has the wrong type or the date range is inverted.
+        """
+        conditions = []
+
+        for name, column, value in (
+            ("customer", cls.customer, customer),
+            ("stringer", cls.stringer, stringer),
+            ("racket", cls.racket, racket),
+        ):
+            if value is not None:
+                if not isinstance(value, str) or not value:
+                    raise ValueError(f"{name} must be a non-empty string.")
+                conditions.append(column == value)
+
+        if string is not None:
+            if not isinstance(string, str) or not string:
+                raise ValueError("string must be a non-empty string.")
+            conditions.append(or_(cls.mains_string == string, cls.crosses_string == string))
+
+        for name, column, value in (("paid", cls.paid, paid), ("completed", cls.completed, completed)):
+            if value is not None:
+                if not isinstance(value, bool):
+                    raise ValueError(f"{name} must be either true or false.")
+                conditions.append(column == value)
+
+        for name, value in (("date_from", date_from), ("date_to", date_to)):
+            if value is not None and not isinstance(value, date):
+                raise ValueError(f"{name} must be a date object.")
+        if date_from is not None and date_to is not None and date_from > date_to:
+            raise ValueError("date_from must not be after date_to.")
+        if date_from is not None:
+            conditions.append(cls.order_date >= date_from)
+        if date_to is not None:
+            conditions.append(cls.order_date <= date_to)
+
+        return conditions
+
+    @classmethod
+    def search_orders(
+        cls,
+        sort: str = "order_id",
+        limit: int = SEARCH_DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        **filters,
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        Searches orders by any combination of filters in a single query.
+
+        Results are keyset paginated on the sort key. Sorting is restricted to orders
+        the indexes can serve: order_id or order_date, ascending or descending (prefix
+        the key with '-').
+
+        Args:
+            sort (str, optional): One of 'order_id', '-order_id', 'order_date', '-order_date'.
+            limit (int, optional): Maximum number of orders to return.
+            cursor (str, optional): The next_cursor returned with the previous page.
+            **filters: Any of the filters accepted by _filter_conditions.
+
+        Returns:
+            tuple[list[dict], Optional[str]]: The matching orders and the cursor for the
+            next page, or None if this is the last page.
+
+        Raises:
+            ValueError: If a filter, the sort key, the limit or the cursor is invalid.
+            SQLAlchemyError: If a database error occurs.
+        """
+        logger.info("Searching orders with filters %s (sort=%s, limit=%s, cursor=%s)", filters, sort, limit, cursor)
+
+        if sort not in SEARCH_SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(SEARCH_SORTS)}.")
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= SEARCH_MAX_LIMIT:
+            raise ValueError(f"limit must be an integer between 1 and {SEARCH_MAX_LIMIT}.")
+
+        conditions = cls._filter_conditions(**filters)
+        descending = sort.startswith("-")
+        by_date = sort.lstrip("-") == "order_date"
+
+        if cursor is not None:
+            try:
+                if by_date:
+                    cursor_date, cursor_id = cursor.split(":")
+                    key = tuple_(cls.order_date, cls.order_id)
+                    bound = tuple_(datetime.strptime(cursor_date, "%Y%m%d").date(), int(cursor_id))
+                else:
+                    key, bound = cls.order_id, int(cursor)
+            except (AttributeError, ValueError):
+                raise ValueError(f"Invalid cursor: {cursor}")
+            conditions.append(key < bound if descending else key > bound)
+
+        order_by = [cls.order_date, cls.order_id] if by_date else [cls.order_id]
+        if descending:
+            order_by = [column.desc() for column in order_by]
+
+        stmt = (
+            select(*[getattr(cls, field) for field in ORDER_FIELDS])
+            .where(*conditions)
+            .order_by(*order_by)
+            .limit(limit + 1)
+        )
+
+        try:
+            results = [row._asdict() for row in db.session.execute(stmt)]
+        except SQLAlchemyError as e:
+            logger.error("Database error while searching orders: %s", e)
+            raise
+
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            last = results[-1]
+            if by_date:
+                next_cursor = f"{last['order_date'].strftime('%Y%m%d')}:{last['order_id']}"
+            else:
+                next_cursor = str(last["order_id"])
+
+        logger.info("Search returned %s order(s)", len(results))
+        return results, next_cursor
 
     @classmethod
     def update_order(
@@ -1283,13 +1817,13 @@ class Orders(db.Model):
             ValueError: If the order with the given ID does not exist or inputs are invalid.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to update order with ID {order_id}")
+        logger.info("Attempting to update order with ID %s", order_id)
 
         try:
             order: Orders = db.session.get(cls, order_id)
 
             if not order:
-                logger.warning(f"Order with ID {order_id} not found.")
+                logger.warning("Order with ID %s not found.", order_id)
                 raise ValueError(f"Order with ID {order_id} not found.")
 
             # Update only provided fields
@@ -1334,11 +1868,11 @@ class Orders(db.Model):
                 order.replacement_grip = replacement_grip
 
             db.session.commit()
-            logger.info(f"Successfully updated order with ID {order_id}")
+            logger.info("Successfully updated order with ID %s", order_id)
             return order
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while updating order with ID {order_id}: {e}")
+            logger.error("Database error while updating order with ID %s: %s", order_id, e)
             db.session.rollback()
             raise
 
@@ -1357,27 +1891,27 @@ class Orders(db.Model):
             ValueError: If the order with the given ID does not exist or inputs are invalid.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to mark order {order_id} as completed")
+        logger.info("Attempting to mark order %s as completed", order_id)
 
         try:
             order: Orders = db.session.get(cls, order_id)
 
             if not order:
-                logger.warning(f"Order with ID {order_id} not found.")
+                logger.warning("Order with ID %s not found.", order_id)
                 raise ValueError(f"Order with ID {order_id} not found.")
             
             if order.completed:
-                logger.warning(f"Order {order_id} already completed.")
+                logger.warning("Order %s already completed.", order_id)
                 return order
             
             order.completed = True
 
             db.session.commit()
-            logger.info(f"Successfully marked order {order_id} complete.")
+            logger.info("Successfully marked order %s complete.", order_id)
             return order
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while marking order {order_id} complete: {e}")
+            logger.error("Database error while marking order %s complete: %s", order_id, e)
             db.session.rollback()
             raise
 
@@ -1396,27 +1930,27 @@ class Orders(db.Model):
             ValueError: If the order with the given ID does not exist or inputs are invalid.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to mark order {order_id} as paid")
+        logger.info("Attempting to mark order %s as paid", order_id)
 
         try:
             order: Orders = db.session.get(cls, order_id)
 
             if not order:
-                logger.warning(f"Order with ID {order_id} not found.")
+                logger.warning("Order with ID %s not found.", order_id)
                 raise ValueError(f"Order with ID {order_id} not found.")
             
             if order.paid:
-                logger.warning(f"Order {order_id} already paid for.")
+                logger.warning("Order %s already paid for.", order_id)
                 return order
             
             order.paid = True
 
             db.session.commit()
-            logger.info(f"Successfully marked order {order_id} paid.")
+            logger.info("Successfully marked order %s paid.", order_id)
             return order
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while marking order {order_id} paid: {e}")
+            logger.error("Database error while marking order %s paid: %s", order_id, e)
             db.session.rollback()
             raise 
 
@@ -1436,28 +1970,194 @@ class Orders(db.Model):
             ValueError: If the order with the given ID does not exist or inputs are invalid.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to assign {stringer} to order {order_id}.")
+        logger.info("Attempting to assign %s to order %s.", stringer, order_id)
 
         try:
             order: Orders = db.session.get(cls, order_id)
 
             if not order:
-                logger.warning(f"Order with ID {order_id} not found.")
+                logger.warning("Order with ID %s not found.", order_id)
                 raise ValueError(f"Order with ID {order_id} not found.")
             
             if stringer is None or not isinstance(stringer, str):
                 raise ValueError(f"stringer must be a non-empty string")
             
             if order.stringer:
-                logger.warning(f"{order.stringer} already assigned to this order. Reassigning to {stringer}...")
+                logger.warning("%s already assigned to this order. Reassigning to %s...", order.stringer, stringer)
 
             order.stringer = stringer
 
             db.session.commit()
-            logger.info(f"Successfully assigned {stringer} to order {order_id}.")
+            logger.info("Successfully assigned %s to order %s.", stringer, order_id)
             return order
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while assigning {stringer} to  order {order_id}: {e}")
+            logger.error("Database error while assigning %s to  order %s: %s", stringer, order_id, e)
+            db.session.rollback()
+            raise
+
+    @classmethod
+    def _bulk_target(cls, order_ids: Optional[list[int]], filters: Optional[dict]) -> list:
+        """
+        Builds the WHERE conditions selecting the orders of a bulk operation, one per statement.
+
+        Exactly one of order_ids or filters must be given; filters must yield at least one
+        condition so a missing or all-null filter can never match the whole table. IDs
+        are split into IN lists of at most IN_CLAUSE_CHUNK_SIZE; a filter is a single
+        condition.
+
+        Raises:
+            ValueError: If the IDs or filters are invalid.
+        """
+        if (order_ids is None) == (filters is None):
+            raise ValueError("Provide either order_ids or filter.")
+
+        if order_ids is not None:
+            if not isinstance(order_ids, list) or not order_ids:
+                raise ValueError("order_ids must be a non-empty list.")
+            if any(isinstance(order_id, bool) or not isinstance(order_id, int) for order_id in order_ids):
+                raise ValueError("order_ids must only contain integers.")
+            if len(order_ids) > BULK_MAX_ORDERS:
+                raise ValueError(f"At most {BULK_MAX_ORDERS} orders can be updated at once.")
+            return [cls.order_id.in_(chunk) for chunk in _chunks(sorted(set(order_ids)), IN_CLAUSE_CHUNK_SIZE)]
+
+        if not isinstance(filters, dict) or not filters:
+            raise ValueError("filter must be a non-empty object.")
+        unknown = sorted(set(filters) - set(ORDER_FILTERS))
+        if unknown:
+            raise ValueError(f"Unknown filter(s): {', '.join(unknown)}.")
+        conditions = cls._filter_conditions(**filters)
+        if not conditions:
+            raise ValueError("filter must set at least one value.")
+        return [and_(*conditions)]
+
+    @classmethod
+    def _bulk_set(cls, field: str, value, order_ids: Optional[list[int]] = None, filters: Optional[dict] = None) -> dict:
+        """
+        Sets one column on many orders with set-based statements in a single transaction.
+
+        The orders are updated with UPDATE ... WHERE <target> AND <column> IS NOT <value>
+        RETURNING order_id, so "changed" is exactly what the statement changed even if
+        another writer touched the orders meanwhile. The orders still matching afterwards,
+        read in the same transaction, are the "unchanged" ones. A filter may match at most
+        BULK_MAX_ORDERS orders, the same cap as an explicit ID list.
+
+        Args:
+            field (str): The column to set.
+            value: The new value.
+            order_ids (list[int], optional): The IDs of the orders to update.
+            filters (dict, optional): Filters selecting the orders to update, as accepted
+                by _filter_conditions.
+
+        Returns:
+            dict: The IDs that "changed", those already in the state ("unchanged") and
+            the requested IDs that do not exist ("not_found").
+
+        Raises:
+            ValueError: If the IDs or filters are invalid, or the filter matches more than
+                BULK_MAX_ORDERS orders.
+            SQLAlchemyError: If a database error occurs.
+        """
+        column = getattr(cls, field)
+        targets = cls._bulk_target(order_ids, filters)
+
+        try:
+            if filters is not None:
+                matching = db.session.execute(
+                    select(cls.order_id).where(targets[0]).limit(BULK_MAX_ORDERS + 1)
+                ).all()
+                if len(matching) > BULK_MAX_ORDERS:
+                    raise ValueError(f"The filter matches more than {BULK_MAX_ORDERS} orders; narrow it down.")
+
+            changed = set()
+            for target in targets:
+                changed.update(db.session.execute(
+                    update(cls).where(target, column.is_distinct_from(value)).values({field: value})
+                    .returning(cls.order_id),
+                    execution_options={"synchronize_session": "fetch"},
+                ).scalars())
+            # Unchanged rows match the target as they did before the UPDATE; the ones it
+            # changed are left out, whether or not they still match.
+            found = set(changed)
+            unchanged = set()
+            for target in targets:
+                matched = db.session.execute(select(cls.order_id).where(target)).scalars().all()
+                unchanged.update(order_id for order_id in matched if order_id not in changed)
+            found |= unchanged
+            db.session.commit()
+
+        except SQLAlchemyError as e:
+            logger.error("Database error while setting %s on orders in bulk: %s", field, e)
             db.session.rollback()
-            raise
\ No newline at end of file
+            raise
+
+        changed, unchanged = sorted(changed), sorted(unchanged)
+        not_found = sorted(set(order_ids) - found) if order_ids is not None else []
+        logger.info("Set %s on %s order(s); %s already set, %s not found.", field, len(changed), len(unchanged), len(not_found))
+        return {"changed": changed, "unchanged": unchanged, "not_found": not_found}
+
+    @classmethod
+    def mark_completed_bulk(cls, order_ids: Optional[list[int]] = None, filters: Optional[dict] = None) -> dict:
+        """
+        Marks many orders as completed.
+
+        Args:
+            order_ids (list[int], optional): The IDs of the orders to mark completed.
+            filters (dict, optional): Filters selecting the orders instead of IDs.
+
+        Returns:
+            dict: The "changed", "unchanged" and "not_found" order IDs.
+
+        Raises:
+            ValueError: If the IDs or filters are invalid.
+            SQLAlchemyError: If a database error occurs.
+        """
+        logger.info("Attempting to mark orders as completed in bulk")
+        return cls._bulk_set("completed", True, order_ids=order_ids, filters=filters)
+
+    @classmethod
+    def mark_paid_bulk(cls, order_ids: Optional[list[int]] = None, filters: Optional[dict] = None) -> dict:
+        """
+        Marks many orders as paid.
+
+        Args:
+            order_ids (list[int], optional): The IDs of the orders to mark paid.
+            filters (dict, optional): Filters selecting the orders instead of IDs.
+
+        Returns:
+            dict: The "changed", "unchanged" and "not_found" order IDs.
+
+        Raises:
+            ValueError: If the IDs or filters are invalid.
+            SQLAlchemyError: If a database error occurs.
+        """
+        logger.info("Attempting to mark orders as paid in bulk")
+        return cls._bulk_set("paid", True, order_ids=order_ids, filters=filters)
+
+    @classmethod
+    def assign_stringer_bulk(cls, stringer: str, order_ids: Optional[list[int]] = None, filters: Optional[dict] = None) -> dict:
+        """
+        Assigns a stringer to many orders.
+
+        Args:
+            stringer (str): Name of the stringer.
+            order_ids (list[int], optional): The IDs of the orders to update.
+            filters (dict, optional): Filters selecting the orders instead of IDs.
+
+        Returns:
+            dict: The "changed", "unchanged" and "not_found" order IDs.
+
+        Raises:
+            ValueError: If the stringer, IDs or filters are invalid.
+            SQLAlchemyError: If a database error occurs.
+        """
+        logger.info("Attempting to assign %s to orders in bulk", stringer)
+        if not stringer or not isinstance(stringer, str):
+            raise ValueError("stringer must be a non-empty string")
+        return cls._bulk_set("stringer", stringer, order_ids=order_ids, filters=filters)
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    """Yields successive slices of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
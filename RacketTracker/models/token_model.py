@@ -0,0 +1,21 @@
+from RacketTracker.db import db
+
+
+class RevokedTokens(db.Model):
+    """Revoked API tokens, shared by every server process.
+
+    A row with a token_id revokes that one token. A row with only a username revokes
+    every token the user was issued up to revoked_at, and a row with neither revokes
+    everyone's. Rows are kept until expires_at, after which every token they cover has
+    expired on its own.
+
+    Read and written by RacketTracker.utils.api_tokens.RevocationList.
+    """
+    __tablename__ = "revoked_tokens"
+    __table_args__ = {"sqlite_autoincrement": True}  # Never reuse the IDs readers have already seen
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    token_id = db.Column(db.String(32), nullable=True)
+    username = db.Column(db.String(80), nullable=True)
+    revoked_at = db.Column(db.Float, nullable=False)
+    expires_at = db.Column(db.Float, nullable=False)
@@ -1,28 +1,80 @@
-import hashlib
 import logging
 import os
+import threading
+import time
+from typing import Optional
 
 from flask_login import UserMixin
+from sqlalchemy import delete, insert, update
 from sqlalchemy.exc import IntegrityError
 
 from RacketTracker.db import db
+from RacketTracker.utils.cache import TTLCache
+from RacketTracker.utils.kdf import PasswordHasher
 from RacketTracker.utils.logger import configure_logger
+from RacketTracker.utils.worker_pool import BoundedWorkerPool
+from RacketTracker.utils.write_queue import run_write
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+class SessionUser(UserMixin):
+    """Detached snapshot of a user for Flask-Login.
+
+    Holds only what authenticated requests need, never the salt or password hash, so it
+    can be cached across requests without touching the database.
+    """
+    __slots__ = ("id", "username")
+
+    def __init__(self, id: int, username: str):
+        self.id = id
+        self.username = username
+
+    def get_id(self) -> str:
+        return self.username
+
+
+class UserInvalidations(db.Model):
+    """Session cache invalidations, shared by every server process.
+
+    A row with a username drops that user from every process's session cache, a row
+    without one drops every user. Rows older than the cache TTL are pruned, since every
+    entry they could have dropped has expired by then.
+
+    Written by Users.invalidate_session_user and read by Users.load_session_user.
+    """
+    __tablename__ = "user_invalidations"
+    __table_args__ = {"sqlite_autoincrement": True}  # Never reuse the IDs readers have already seen
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    username = db.Column(db.String(80), nullable=True)
+    invalidated_at = db.Column(db.Float, nullable=False)
+
+
 class Users(db.Model, UserMixin):
     __tablename__ = 'users'
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     salt = db.Column(db.String(32), nullable=False)  # 16-byte salt in hex
-    password = db.Column(db.String(64), nullable=False)  # SHA-256 hash in hex
+    password = db.Column(db.String(128), nullable=False)  # pbkdf2_sha256$<iterations>$<hex>, or a legacy SHA-256 hex digest
 
-    @staticmethod
-    def _generate_hashed_password(password: str) -> tuple[str, str]:
+    # Session users by username; replaced in create_app with the configured size and TTL.
+    session_cache = TTLCache()
+    # Seconds between checks for invalidations made by other processes; set in create_app.
+    session_cache_refresh = 5.0
+    _invalidations_seen = 0
+    _next_invalidation_check = 0.0
+    _invalidation_lock = threading.Lock()
+    # Worker threads that verify passwords; replaced in create_app with the configured size.
+    password_pool = BoundedWorkerPool(name="password-hash")
+    # KDF for new hashes; replaced in create_app with the calibrated or configured cost.
+    password_hasher = PasswordHasher()
+
+    @classmethod
+    def _generate_hashed_password(cls, password: str) -> tuple[str, str]:
         """
         Generates a salted, hashed password.
 
@@ -33,9 +85,77 @@ class Users(db.Model, UserMixin):
             tuple: A tuple containing the salt and hashed password.
         """
         salt = os.urandom(16).hex()
-        hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
+        hashed_password = cls.password_hasher.hash(password, salt)
         return salt, hashed_password
 
+    @classmethod
+    def hash_password(cls, password: str) -> tuple[str, str]:
+        """
+        Generates a salted hash of a password on the password worker pool.
+
+        Hashing costs about as much as a login, so it is done before a write is handed
+        to the write queue, which then only stores the result.
+
+        Args:
+            password (str): The password to hash.
+
+        Returns:
+            tuple: A tuple containing the salt and hashed password.
+
+        Raises:
+            WorkerPoolBusy: If the password pool is saturated.
+        """
+        return cls.password_pool.run(cls._generate_hashed_password, password)
+
+    @classmethod
+    def _verify_password(cls, password: str, salt: str, hashed_password: str) -> tuple[bool, Optional[tuple[str, str]]]:
+        """
+        Checks a password against a stored salt and hash, and rehashes it if it is outdated.
+
+        Args:
+            password (str): The password to check.
+            salt (str): The stored salt.
+            hashed_password (str): The stored hash.
+
+        Returns:
+            tuple: Whether the password matches, and a new (salt, hash) pair when the
+                stored hash is a legacy SHA-256 digest or uses fewer KDF iterations than
+                currently configured (None otherwise).
+        """
+        if not cls.password_hasher.verify(password, salt, hashed_password):
+            return False, None
+        if cls.password_hasher.needs_rehash(hashed_password):
+            return True, cls._generate_hashed_password(password)
+        return True, None
+
+    @classmethod
+    def _upgrade_password_hash(cls, user_id: int, old_hash: str, salt: str, hashed_password: str) -> None:
+        """
+        Replaces an outdated password hash after a successful login.
+
+        The update goes through the write queue and only applies if the hash is still
+        the one that was verified, so a concurrent password change is never overwritten.
+        Failures are logged and otherwise ignored; the old hash keeps working.
+        """
+        try:
+            run_write(cls._replace_password_hash, user_id, old_hash, salt, hashed_password)
+            logger.info("Upgraded password hash for user ID %s", user_id)
+        except Exception as e:
+            logger.warning("Password hash upgrade failed for user ID %s: %s", user_id, str(e))
+
+    @classmethod
+    def _replace_password_hash(cls, user_id: int, old_hash: str, salt: str, hashed_password: str) -> None:
+        try:
+            db.session.execute(
+                update(cls)
+                .where(cls.id == user_id, cls.password == old_hash)
+                .values(salt=salt, password=hashed_password)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
     @classmethod
     def create_user(cls, username: str, password: str) -> None:
         """
@@ -45,10 +165,25 @@ class Users(db.Model, UserMixin):
             username (str): The username of the user.
             password (str): The password to hash and store.
 
+        Raises:
+            ValueError: If a user with the username already exists.
+            WorkerPoolBusy: If the password pool is saturated.
+        """
+        cls.add_user(username, *cls.hash_password(password))
+
+    @classmethod
+    def add_user(cls, username: str, salt: str, hashed_password: str) -> None:
+        """
+        Create a new user from a salt and hash made by hash_password.
+
+        Args:
+            username (str): The username of the user.
+            salt (str): The salt of the password hash.
+            hashed_password (str): The password hash.
+
         Raises:
             ValueError: If a user with the username already exists.
         """
-        salt, hashed_password = cls._generate_hashed_password(password)
         new_user = cls(username=username, salt=salt, password=hashed_password)
         try:
             db.session.add(new_user)
@@ -82,9 +217,45 @@ class Users(db.Model, UserMixin):
         if not user:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
-        logger.info("Password is correct")
-        return hashed_password == user.password
+        is_correct, upgrade = cls.password_pool.run(cls._verify_password, password, user.salt, user.password)
+        if upgrade is not None:
+            cls._upgrade_password_hash(user.id, user.password, *upgrade)
+        logger.info("Password is %s", "correct" if is_correct else "incorrect")
+        return is_correct
+
+    @classmethod
+    def authenticate(cls, username: str, password: str) -> Optional[SessionUser]:
+        """
+        Verifies a user's password and returns the user for login_user, with one query.
+
+        The hash comparison runs on the password worker pool so that a burst of logins
+        does not occupy request threads with hashing. Outdated hashes are upgraded to
+        the current KDF settings.
+
+        Args:
+            username (str): The username of the user.
+            password (str): The password to check.
+
+        Returns:
+            Optional[SessionUser]: The authenticated user, or None if the password is wrong.
+
+        Raises:
+            ValueError: If the user does not exist.
+            WorkerPoolBusy: If the password pool is saturated.
+        """
+        row = db.session.query(cls.id, cls.username, cls.salt, cls.password).filter_by(username=username).first()
+        if row is None:
+            logger.info("User %s not found", username)
+            raise ValueError(f"User {username} not found")
+        is_correct, upgrade = cls.password_pool.run(cls._verify_password, password, row.salt, row.password)
+        if not is_correct:
+            logger.info("Invalid password for user %s", username)
+            return None
+        if upgrade is not None:
+            cls._upgrade_password_hash(row.id, row.password, *upgrade)
+        user = SessionUser(row.id, row.username)
+        cls.session_cache.set(username, user)
+        return user
 
     @classmethod
     def delete_user(cls, username: str) -> None:
@@ -102,6 +273,7 @@ class Users(db.Model, UserMixin):
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
         db.session.delete(user)
+        cls.invalidate_session_user(username)
         db.session.commit()
         logger.info("User %s deleted successfully", username)
 
@@ -132,7 +304,7 @@ class Users(db.Model, UserMixin):
         if not user:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        logger.info(f"User {username} has ID {user.id}")
+        logger.info("User %s has ID %s", username, user.id)
         return user.id
 
     @classmethod
@@ -144,6 +316,22 @@ class Users(db.Model, UserMixin):
             username (str): The username of the user.
             new_password (str): The new password to set.
 
+        Raises:
+            ValueError: If the user does not exist.
+            WorkerPoolBusy: If the password pool is saturated.
+        """
+        cls.set_password_hash(username, *cls.hash_password(new_password))
+
+    @classmethod
+    def set_password_hash(cls, username: str, salt: str, hashed_password: str) -> None:
+        """
+        Replace a user's password with a salt and hash made by hash_password.
+
+        Args:
+            username (str): The username of the user.
+            salt (str): The salt of the new password hash.
+            hashed_password (str): The new password hash.
+
         Raises:
             ValueError: If the user does not exist.
         """
@@ -152,8 +340,103 @@ class Users(db.Model, UserMixin):
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
 
-        salt, hashed_password = cls._generate_hashed_password(new_password)
         user.salt = salt
         user.password = hashed_password
+        cls.invalidate_session_user(username)
         db.session.commit()
-        logger.info("Password updated successfully for user: %s", username)
\ No newline at end of file
+        logger.info("Password updated successfully for user: %s", username)
+
+    @classmethod
+    def recreate_table(cls) -> None:
+        """
+        Drops and recreates the users table, deleting every user and emptying the
+        session cache of every process.
+
+        Runs on the session's connection so it can be queued with run_write like any
+        other write.
+        """
+        try:
+            connection = db.session.connection()
+            cls.__table__.drop(connection)
+            cls.__table__.create(connection)
+            cls.invalidate_session_user()
+            db.session.commit()
+            logger.info("Recreated the users table")
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Database error: %s", str(e))
+            raise
+
+    @classmethod
+    def load_session_user(cls, username: str) -> Optional[SessionUser]:
+        """
+        Resolves the user of an authenticated session, from the cache when possible.
+
+        Invalidations made by other processes are loaded at most every
+        session_cache_refresh seconds, so a user deleted or changed in another gunicorn
+        worker can still be served from this one's cache for up to that long.
+
+        Args:
+            username (str): The username stored in the session.
+
+        Returns:
+            Optional[SessionUser]: The user, or None if no such user exists. Unknown
+                usernames are not cached.
+        """
+        cls._refresh_session_cache()
+        user = cls.session_cache.get(username)
+        if user is not None:
+            return user
+        row = db.session.query(cls.id, cls.username).filter_by(username=username).first()
+        if row is None:
+            return None
+        user = SessionUser(row.id, row.username)
+        cls.session_cache.set(username, user)
+        return user
+
+    @classmethod
+    def invalidate_session_user(cls, username: Optional[str] = None) -> None:
+        """
+        Drops a user from the session cache, or every user when no username is given.
+
+        This process's cache is updated at once. The invalidation is also added to the
+        current transaction for the other processes, which pick it up after the caller
+        commits (see load_session_user).
+
+        Args:
+            username (str, optional): The user to drop.
+        """
+        if username is None:
+            cls.session_cache.clear()
+        else:
+            cls.session_cache.pop(username)
+        now = time.time()
+        table = UserInvalidations.__table__
+        db.session.execute(delete(table).where(table.c.invalidated_at < now - cls.session_cache.ttl))
+        db.session.execute(insert(table).values(username=username, invalidated_at=now))
+
+    @classmethod
+    def _refresh_session_cache(cls) -> None:
+        """Drops the cached users other processes invalidated, if session_cache_refresh has passed."""
+        if time.monotonic() < cls._next_invalidation_check:
+            return
+        # One thread loads; lookups running meanwhile go on with the cache as it is.
+        if not cls._invalidation_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() < cls._next_invalidation_check:
+                return
+            cls._next_invalidation_check = time.monotonic() + cls.session_cache_refresh
+            rows = (db.session.query(UserInvalidations.id, UserInvalidations.username)
+                    .filter(UserInvalidations.id > cls._invalidations_seen)
+                    .order_by(UserInvalidations.id)
+                    .all())
+            for row in rows:
+                if row.username is None:
+                    cls.session_cache.clear()
+                else:
+                    cls.session_cache.pop(row.username)
+            if rows:
+                cls._invalidations_seen = rows[-1].id
+        finally:
+            cls._invalidation_lock.release()
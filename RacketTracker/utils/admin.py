@@ -0,0 +1,33 @@
+from functools import wraps
+from typing import Callable
+
+from flask import current_app, jsonify, make_response
+from flask_login import current_user
+
+
+def admin_users() -> set[str]:
+    """Returns the usernames listed in the app's ADMIN_USERS setting."""
+    users = current_app.config.get("ADMIN_USERS") or ()
+    if isinstance(users, str):
+        users = users.split(",")
+    return {user.strip() for user in users if user.strip()}
+
+
+def admin_required(view: Callable) -> Callable:
+    """
+    Restricts a route to the users named in ADMIN_USERS.
+
+    Anonymous requests get the login manager's 401 response; authenticated users who
+    are not admins get a 403.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return current_app.login_manager.unauthorized()
+        if current_user.username not in admin_users():
+            return make_response(jsonify({
+                "status": "error",
+                "message": "Admin access required"
+            }), 403)
+        return view(*args, **kwargs)
+    return wrapper
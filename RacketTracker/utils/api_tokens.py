@@ -0,0 +1,287 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from flask import Flask, current_app, request
+from flask_login import LoginManager
+from sqlalchemy import Engine, delete, insert, select
+
+from RacketTracker.db import db
+from RacketTracker.models.token_model import RevokedTokens
+from RacketTracker.models.user_model import SessionUser
+from RacketTracker.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class InvalidToken(ValueError):
+    """Raised when an API token is malformed, forged, expired or revoked."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class RevocationList:
+    """Record of revoked tokens, shared between server processes through the database.
+
+    Single tokens are remembered by ID until they would have expired anyway. Revoking
+    a user (or everyone) records a cut-off time instead, so every token issued before
+    it is rejected without having to know the tokens.
+
+    Given an engine, every revocation is also written to the revoked_tokens table, and
+    the rows other processes added are loaded at most once every refresh_interval
+    seconds, by whichever check comes first after it has passed; every other check only
+    looks at memory. A token revoked in one gunicorn worker is therefore rejected by the
+    others after up to refresh_interval seconds (immediately by the worker that revoked
+    it). Without an engine the list only lives in memory.
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, ttl: float = 3600.0, refresh_interval: float = 10.0):
+        """
+        Args:
+            engine (Engine, optional): Engine of the database holding revoked_tokens.
+            ttl (float, optional): Lifetime of the tokens; a cut-off is kept this long.
+            refresh_interval (float, optional): Seconds between two loads of revocations
+                made elsewhere, the longest they go unnoticed. Zero checks the database
+                on every call.
+        """
+        self._tokens: dict[str, float] = {}
+        self._users: dict[str, float] = {}
+        self._everyone = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._engine = engine
+        self._ttl = ttl
+        self._refresh_interval = refresh_interval
+        self._last_id = 0
+        self._next_refresh = 0.0
+
+    def revoke(self, token_id: str, expires_at: float) -> None:
+        """Revokes one token until its expiry."""
+        now = time.time()
+        self._record(token_id, None, now, expires_at)
+        self._apply(token_id, None, now, expires_at)
+        with self._lock:
+            # Forget tokens that have expired on their own.
+            for expired in [jti for jti, exp in self._tokens.items() if exp <= now]:
+                del self._tokens[expired]
+
+    def revoke_user(self, username: str) -> None:
+        """Revokes every token of a user issued until now."""
+        now = time.time()
+        self._record(None, username, now, now + self._ttl)
+        self._apply(None, username, now, now + self._ttl)
+
+    def revoke_all(self) -> None:
+        """Revokes every token issued until now."""
+        now = time.time()
+        self._record(None, None, now, now + self._ttl)
+        self._apply(None, None, now, now + self._ttl)
+
+    def is_revoked(self, token_id: str, username: str, issued_at: float) -> bool:
+        self._refresh()
+        with self._lock:
+            return (
+                token_id in self._tokens
+                or issued_at <= self._everyone
+                or issued_at <= self._users.get(username, 0.0)
+            )
+
+    def _apply(self, token_id: Optional[str], username: Optional[str], revoked_at: float, expires_at: float) -> None:
+        with self._lock:
+            if token_id is not None:
+                self._tokens[token_id] = expires_at
+            elif username is not None:
+                self._users[username] = max(self._users.get(username, 0.0), revoked_at)
+            else:
+                self._everyone = max(self._everyone, revoked_at)
+
+    def _record(self, token_id: Optional[str], username: Optional[str], revoked_at: float, expires_at: float) -> None:
+        """Stores a revocation for the other processes, dropping rows that no longer matter."""
+        if self._engine is None:
+            return
+        table = RevokedTokens.__table__
+        with self._engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.expires_at <= revoked_at))
+            conn.execute(insert(table).values(token_id=token_id, username=username,
+                                              revoked_at=revoked_at, expires_at=expires_at))
+
+    def _refresh(self) -> None:
+        """Loads the revocations stored since the last refresh, if refresh_interval has passed."""
+        if self._engine is None or time.monotonic() < self._next_refresh:
+            return
+        # One thread loads; checks running meanwhile go on with what is in memory.
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() < self._next_refresh:
+                return
+            self._next_refresh = time.monotonic() + self._refresh_interval
+            table = RevokedTokens.__table__
+            with self._engine.connect() as conn:
+                rows = conn.execute(
+                    select(table.c.id, table.c.token_id, table.c.username, table.c.revoked_at, table.c.expires_at)
+                    .where(table.c.id > self._last_id, table.c.expires_at > time.time())
+                    .order_by(table.c.id)
+                ).all()
+            for row in rows:
+                self._apply(row.token_id, row.username, row.revoked_at, row.expires_at)
+            if rows:
+                with self._lock:
+                    self._last_id = max(self._last_id, rows[-1].id)
+        finally:
+            self._refresh_lock.release()
+
+
+class TokenSigner:
+    """Issues and verifies HMAC-SHA256 signed, expiring bearer tokens.
+
+    A token is ``<payload>.<signature>``: the payload is base64url JSON with the user's
+    ID and username, an issue time, an expiry and a random token ID. Verifying needs
+    only the secret and the revocation list, never a lookup of the user.
+    """
+
+    def __init__(self, secret_key: str, ttl: float = 3600.0, revocations: Optional[RevocationList] = None):
+        """
+        Args:
+            secret_key (str): Key used to sign tokens.
+            ttl (float, optional): Seconds a token stays valid.
+            revocations (RevocationList, optional): Where revocations are kept; defaults
+                to an in-memory list.
+
+        Raises:
+            ValueError: If the secret key is empty.
+        """
+        if not secret_key:
+            raise ValueError("A secret key is required to sign API tokens")
+        self._key = hashlib.sha256(b"api-token:" + secret_key.encode()).digest()
+        self.ttl = ttl
+        self.revocations = revocations if revocations is not None else RevocationList(ttl=ttl)
+
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._key, payload.encode(), hashlib.sha256).digest())
+
+    def issue(self, user_id: int, username: str) -> tuple[str, float]:
+        """
+        Args:
+            user_id (int): The user's ID.
+            username (str): The user's username.
+
+        Returns:
+            tuple: The token and its expiry as a Unix timestamp.
+        """
+        now = time.time()
+        claims = {"uid": user_id, "sub": username, "iat": now, "exp": now + self.ttl, "jti": os.urandom(8).hex()}
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        return f"{payload}.{self._sign(payload)}", claims["exp"]
+
+    def verify(self, token: str) -> dict:
+        """
+        Args:
+            token (str): The bearer token.
+
+        Returns:
+            dict: The token claims (uid, sub, iat, exp, jti).
+
+        Raises:
+            InvalidToken: If the token is malformed, has a bad signature, has expired or
+                has been revoked.
+        """
+        payload, _, signature = token.partition(".")
+        if not payload or not hmac.compare_digest(signature.encode(), self._sign(payload).encode()):
+            raise InvalidToken("Invalid API token")
+        try:
+            claims = json.loads(_b64decode(payload))
+            if not isinstance(claims, dict) or not {"uid", "sub", "iat", "exp", "jti"} <= claims.keys():
+                raise ValueError("missing claims")
+        except ValueError:
+            raise InvalidToken("Invalid API token") from None
+        if claims["exp"] <= time.time():
+            raise InvalidToken("API token has expired")
+        if self.revocations.is_revoked(claims["jti"], claims["sub"], claims["iat"]):
+            raise InvalidToken("API token has been revoked")
+        return claims
+
+    def revoke(self, token: str) -> dict:
+        """
+        Revokes a token that is currently valid.
+
+        Returns:
+            dict: The claims of the revoked token.
+
+        Raises:
+            InvalidToken: If the token is not currently valid.
+        """
+        claims = self.verify(token)
+        self.revocations.revoke(claims["jti"], claims["exp"])
+        logger.info("Revoked API token %s of user %s", claims["jti"], claims["sub"])
+        return claims
+
+
+def bearer_token() -> Optional[str]:
+    """Returns the bearer token of the current request, if it sent one."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token.strip()
+
+
+def get_token_signer() -> Optional[TokenSigner]:
+    """Returns the app's TokenSigner, or None when API tokens are not configured."""
+    return current_app.extensions.get("api_tokens")
+
+
+def init_api_tokens(app: Flask, login_manager: LoginManager) -> Optional[TokenSigner]:
+    """
+    Lets requests authenticate with an ``Authorization: Bearer`` API token.
+
+    The token is checked by a Flask-Login request loader, which only runs when the
+    request has no logged-in session. It resolves to a SessionUser built from the token
+    claims, so no user lookup is needed. Revocations are kept in the app's database so
+    every server process sees them, after up to API_TOKEN_REVOCATION_REFRESH seconds.
+
+    Args:
+        app (Flask): The application.
+        login_manager (LoginManager): The application's login manager.
+
+    Returns:
+        Optional[TokenSigner]: The signer, or None if neither API_TOKEN_SECRET nor
+            SECRET_KEY is set.
+    """
+    secret_key = app.config.get("API_TOKEN_SECRET") or app.config.get("SECRET_KEY")
+    if not secret_key:
+        logger.warning("API tokens are disabled: no API_TOKEN_SECRET or SECRET_KEY configured")
+        return None
+    ttl = app.config.get("API_TOKEN_TTL", 3600)
+    with app.app_context():
+        revocations = RevocationList(db.engine, ttl=ttl,
+                                     refresh_interval=app.config.get("API_TOKEN_REVOCATION_REFRESH", 10.0))
+    signer = TokenSigner(secret_key, ttl=ttl, revocations=revocations)
+    app.extensions["api_tokens"] = signer
+
+    @login_manager.request_loader
+    def load_user_from_token(req) -> Optional[SessionUser]:
+        token = bearer_token()
+        if token is None:
+            return None
+        try:
+            claims = signer.verify(token)
+        except InvalidToken as e:
+            logger.info("Rejected API token: %s", e)
+            return None
+        return SessionUser(claims["uid"], claims["sub"])
+
+    return signer
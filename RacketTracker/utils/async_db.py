@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import Optional
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from RacketTracker.utils.logger import configure_logger
+from RacketTracker.utils.sql_utils import apply_sqlite_pragmas
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def async_database_url(app: Flask) -> str:
+    """
+    Returns the URL the async engine connects with.
+
+    ASYNC_DATABASE_URL wins when set; otherwise SQLALCHEMY_DATABASE_URI is used with
+    its SQLite driver swapped for aiosqlite, so both engines open the same file.
+
+    Raises:
+        ValueError: If the database is not SQLite and no ASYNC_DATABASE_URL is set, or
+            it is an in-memory database, which a second engine could never see.
+    """
+    if app.config.get("ASYNC_DATABASE_URL"):
+        return app.config["ASYNC_DATABASE_URL"]
+    url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() != "sqlite":
+        raise ValueError("ASYNC_DATABASE_URL must be set for databases other than SQLite")
+    if url.database in (None, "", ":memory:"):
+        raise ValueError("The async engine cannot share an in-memory SQLite database")
+    return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+
+
+def create_async_db_engine(app: Flask) -> AsyncEngine:
+    """
+    Creates an aiosqlite engine for the app's database with the app's SQLITE_PRAGMAS.
+
+    Must be called from the event loop that will use it; every worker process creates
+    its own.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        AsyncEngine: The engine.
+    """
+    engine = create_async_engine(async_database_url(app))
+    pragmas = {name: value for name, value in app.config.get("SQLITE_PRAGMAS", {}).items()
+               if value is not None and value != ""}
+    if pragmas and engine.dialect.name == "sqlite":
+        @event.listens_for(engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+    return engine
+
+
+class ChangeFeed:
+    """Wakes long-polling requests when another connection commits to the SQLite database.
+
+    One background task reads ``PRAGMA data_version`` every ``interval`` seconds on a
+    connection of its own; the value changes whenever any other connection commits. A
+    thousand waiting clients therefore cost one tiny query per interval, and each of them
+    only re-reads its own row after something was actually written.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float = 0.25):
+        """
+        Args:
+            engine (AsyncEngine): Engine of the watched database.
+            interval (float, optional): Seconds between checks.
+        """
+        self.engine = engine
+        self.interval = interval
+        self.changes = 0
+        self._changed: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Waits for the next commit to the database.
+
+        Returns:
+            bool: True if something was committed, False if the timeout passed first.
+        """
+        if self._task is None or self._task.done():
+            self._changed = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="change-feed")
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _run(self) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                last = (await conn.exec_driver_sql("PRAGMA data_version")).scalar()
+                while True:
+                    await asyncio.sleep(self.interval)
+                    version = (await conn.exec_driver_sql("PRAGMA data_version")).scalar()
+                    if version != last:
+                        last = version
+                        self.changes += 1
+                        # Waiters hold the old event; the next ones wait for the following change.
+                        changed, self._changed = self._changed, asyncio.Event()
+                        changed.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Waiters time out and fall back to answering with the current row; the next wait restarts the task.
+            logger.error("Change feed stopped: %s", e)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded, thread-safe in-process cache whose entries expire after a fixed time.
+
+    When the cache is full, the least recently used entry is evicted. Hits and misses
+    are counted so the hit rate can be reported.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        """
+        Args:
+            max_size (int, optional): Maximum number of entries kept.
+            ttl (float, optional): Seconds an entry stays valid after it is set.
+
+        Raises:
+            ValueError: If max_size is less than 1 or ttl is negative.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Looks up a key, counting the lookup as a hit or a miss.
+
+        Returns:
+            Any: The cached value, or default if the key is absent or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value, evicting the least recently used entry if the cache is full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Removes a key if it is cached."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes every entry. The hit and miss counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Size, capacity, hits, misses and hit_rate (None before any lookup).
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+            }
@@ -0,0 +1,243 @@
+"""Populates a SQLite database with realistic synthetic orders and users.
+
+Usage:
+    python -m RacketTracker.utils.data_generator path/to/app.db [--orders 1000000]
+        [--users 100 --password PASSWORD] [--seed 42] [--today 2025-06-30]
+"""
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex
+
+from config import ProductionConfig
+from RacketTracker.models.order_model import Orders
+from RacketTracker.models.user_model import Users
+from RacketTracker.utils.kdf import PasswordHasher, calibrate
+from RacketTracker.utils.logger import configure_logger
+from RacketTracker.utils.sql_utils import apply_sqlite_pragmas
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+RACKETS = ["Babolat Pure Aero", "Babolat Pure Drive", "Wilson Pro Staff 97", "Wilson Blade 98", "Wilson Clash 100",
+           "Head Speed MP", "Head Radical MP", "Head Gravity Pro", "Yonex EZONE 98", "Yonex VCORE 100",
+           "Prince Phantom 100", "Tecnifibre TF40", "Dunlop CX 200"]
+# Most jobs use a handful of strings; the rest are spread over a long tail.
+POPULAR_STRINGS = ["Luxilon ALU Power", "RPM Blast", "Solinco Hyper-G", "Wilson NXT", "Head Lynx Tour",
+                   "Tecnifibre X-One Biphase", "Yonex Poly Tour Pro", "Luxilon 4G"]
+TAIL_STRINGS = [f"Specialty string {n}" for n in range(200)]
+STRINGERS = ["Sam", "Jordan", "Riley", "Casey", "Morgan"]
+GRIPS = ["Wilson Pro Overgrip", "Tourna Grip", "Head Prime Tour"]
+
+ORDER_COLUMNS = ("customer", "stringer", "order_date", "racket", "mains_tension", "mains_string",
+                 "crosses_tension", "crosses_string", "replacement_grip", "paid", "completed")
+
+# Orders older than this many days have almost always been picked up and paid for.
+SETTLE_DAYS = 14
+
+
+def customer_count(orders: int) -> int:
+    """Number of distinct customers for a history of this size (about 8 orders each)."""
+    return max(50, orders // 8)
+
+
+def generate_orders(rows: int, seed: int = 42, today: date = date(2025, 6, 30),
+                    batch_size: int = 50000) -> Iterator[list[tuple]]:
+    """
+    Yields batches of order rows in ORDER_COLUMNS order, ready for executemany.
+
+    Customers follow a Zipf-Mandelbrot distribution (a core of regulars without one
+    customer owning the history), mains strings a popular head with a long tail, and
+    dates span three years, busier from March to August and on weekends. Orders older
+    than SETTLE_DAYS are nearly all completed and paid; recent ones are mostly open.
+
+    Args:
+        rows (int): Number of orders.
+        seed (int, optional): Seed of the random generator; equal seeds give equal data.
+        today (date, optional): Date of the newest orders.
+        batch_size (int, optional): Rows per batch.
+    """
+    rng = random.Random(seed)
+    customers = customer_count(rows)
+    customer_names = [f"Customer {n}" for n in range(customers)]
+    customer_weights = [1 / (rank + 10) ** 1.1 for rank in range(1, customers + 1)]
+    strings = POPULAR_STRINGS + TAIL_STRINGS
+    string_weights = [30] * len(POPULAR_STRINGS) + [1] * len(TAIL_STRINGS)
+    days = [today - timedelta(days=offset) for offset in range(3 * 365)]
+    day_weights = [(2.0 if 3 <= day.month <= 8 else 1.0) * (1.5 if day.weekday() >= 5 else 1.0) for day in days]
+    # Dates as SQLAlchemy stores them on SQLite, computed once per day instead of per row.
+    day_values = [(day.isoformat(), (today - day).days > SETTLE_DAYS) for day in days]
+    day_indexes = range(len(days))
+
+    for offset in range(0, rows, batch_size):
+        size = min(batch_size, rows - offset)
+        names = rng.choices(customer_names, weights=customer_weights, k=size)
+        picked_days = rng.choices(day_indexes, weights=day_weights, k=size)
+        mains = rng.choices(strings, weights=string_weights, k=size)
+        rand = rng.random
+        batch = []
+        for name, day, mains_string in zip(names, picked_days, mains):
+            order_date, settled = day_values[day]
+            completed = rand() < (0.98 if settled else 0.4)
+            paid = rand() < (0.97 if completed else 0.3)
+            tension = rng.randint(48, 60)
+            hybrid = rand() < 0.3
+            batch.append((
+                name,
+                rng.choice(STRINGERS) if completed else None,
+                order_date,
+                rng.choice(RACKETS),
+                tension,
+                mains_string,
+                tension - 2 if hybrid else None,
+                rng.choice(POPULAR_STRINGS) if hybrid else None,
+                rng.choice(GRIPS) if rand() < 0.2 else None,
+                paid,
+                completed,
+            ))
+        yield batch
+
+
+def app_kdf_iterations() -> int:
+    """The PBKDF2 cost the app would hash new passwords with on this host."""
+    return ProductionConfig.PASSWORD_KDF_ITERATIONS or calibrate(
+        ProductionConfig.PASSWORD_KDF_TARGET_MS, min_iterations=ProductionConfig.PASSWORD_KDF_MIN_ITERATIONS)
+
+
+def generate_users(count: int, password: str, iterations: int) -> list[tuple]:
+    """
+    Returns (username, salt, password) rows for staff accounts named ``user<n>``.
+
+    Every user gets the given password with its own random salt.
+    """
+    hasher = PasswordHasher(iterations)
+    users = []
+    for n in range(count):
+        salt = os.urandom(16).hex()
+        users.append((f"user{n}", salt, hasher.hash(password, salt)))
+    return users
+
+
+def populate(db_path: str, orders: int, users: int = 0, seed: int = 42, today: date = date(2025, 6, 30),
+             password: Optional[str] = None, kdf_iterations: Optional[int] = None) -> dict:
+    """
+    Creates the schema if needed and bulk-loads generated orders and users.
+
+    Rows go through one sqlite3 connection in a single transaction. On an empty orders
+    table the indexes are dropped for the load and rebuilt afterwards, which is far
+    faster than maintaining them row by row, and journaling and syncing are relaxed;
+    the database is only usable once this returns. The indexes are rebuilt even if the
+    load fails. A table that already holds orders is topped up with its indexes in place
+    and with the app's SQLITE_PRAGMAS, so a crash cannot corrupt a live database.
+
+    Args:
+        db_path (str): Path of the SQLite database file.
+        orders (int): Orders to add.
+        users (int, optional): Users to add.
+        seed (int, optional): Seed of the random generator.
+        today (date, optional): Date of the newest orders.
+        password (str, optional): Password of the added users; required if users is set.
+        kdf_iterations (int, optional): PBKDF2 cost of their hashes; defaults to the
+            cost the app calibrates on this host.
+
+    Returns:
+        dict: Rows added, number of customers, and seconds spent inserting and indexing.
+
+    Raises:
+        ValueError: If users are requested without a password.
+    """
+    if users and not password:
+        raise ValueError("A password is required to generate users.")
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        Orders.__table__.create(engine, checkfirst=True)
+        Users.__table__.create(engine, checkfirst=True)
+        with engine.connect() as connection:
+            drop_indexes = connection.execute(select(Orders.order_id).limit(1)).first() is None
+        if drop_indexes:
+            for index in Orders.__table__.indexes:
+                index.drop(engine, checkfirst=True)
+        else:
+            logger.info("%s already holds orders; loading with its indexes in place", db_path)
+    finally:
+        engine.dispose()
+
+    user_rows = generate_users(users, password, kdf_iterations or app_kdf_iterations()) if users else []
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if drop_indexes:
+            # Nothing to lose yet: a crash only costs the data being generated.
+            conn.execute("PRAGMA journal_mode = MEMORY")
+            conn.execute("PRAGMA synchronous = OFF")
+        else:
+            apply_sqlite_pragmas(conn, ProductionConfig.SQLITE_PRAGMAS)
+        conn.execute("PRAGMA cache_size = -262144")
+        conn.execute("PRAGMA temp_store = MEMORY")
+
+        try:
+            start = time.perf_counter()
+            conn.execute("BEGIN")
+            insert_orders = f"INSERT INTO orders ({', '.join(ORDER_COLUMNS)}) VALUES ({', '.join('?' * len(ORDER_COLUMNS))})"
+            for batch in generate_orders(orders, seed, today):
+                conn.executemany(insert_orders, batch)
+            if user_rows:
+                # INSERT OR IGNORE so running the generator twice keeps the first accounts.
+                conn.executemany("INSERT OR IGNORE INTO users (username, salt, password) VALUES (?, ?, ?)", user_rows)
+            conn.execute("COMMIT")
+            insert_seconds = time.perf_counter() - start
+        finally:
+            if conn.in_transaction:
+                logger.error("Loading generated data into %s failed; rolling back", db_path)
+                conn.execute("ROLLBACK")
+            start = time.perf_counter()
+            conn.execute("BEGIN")
+            for index in Orders.__table__.indexes:
+                conn.execute(str(CreateIndex(index, if_not_exists=True).compile(dialect=sqlite.dialect())))
+            conn.execute("COMMIT")
+            conn.execute("ANALYZE")
+            index_seconds = time.perf_counter() - start
+    finally:
+        conn.close()
+
+    stats = {
+        "orders": orders,
+        "users": users,
+        "customers": customer_count(orders),
+        "insert_seconds": round(insert_seconds, 3),
+        "index_seconds": round(index_seconds, 3),
+    }
+    logger.info("Generated %s orders and %s users in %s (insert %.1f s, indexes %.1f s)",
+                orders, users, db_path, insert_seconds, index_seconds)
+    return stats
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("database", help="path of the SQLite database file")
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=0, help="staff accounts user0, user1, ... to add")
+    parser.add_argument("--password", help="password of the added users; required with --users")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--today", type=date.fromisoformat, default=date.today(), help="date of the newest orders")
+    args = parser.parse_args(argv)
+    if args.users and not args.password:
+        parser.error("--users requires --password")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.database)), exist_ok=True)
+    stats = populate(args.database, args.orders, args.users, args.seed, args.today, password=args.password)
+    print(f"Added {stats['orders']} orders ({stats['customers']} customers) and {stats['users']} users to "
+          f"{args.database}: insert {stats['insert_seconds']:.1f} s, indexes {stats['index_seconds']:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
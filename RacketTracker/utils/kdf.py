@@ -0,0 +1,126 @@
+import hashlib
+import hmac
+import logging
+import time
+
+from RacketTracker.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+ALGORITHM = "pbkdf2_sha256"
+DEFAULT_ITERATIONS = 600_000  # OWASP's recommendation for PBKDF2-HMAC-SHA256
+MIN_ITERATIONS = 100_000
+MAX_ITERATIONS = 10_000_000
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations).hex()
+
+
+def calibrate(target_ms: float, min_iterations: int = MIN_ITERATIONS, max_iterations: int = MAX_ITERATIONS,
+              probe_iterations: int = 20_000) -> int:
+    """
+    Picks the PBKDF2 iteration count that takes about target_ms to verify on this host.
+
+    Args:
+        target_ms (float): The verify latency to aim for, in milliseconds.
+        min_iterations (int, optional): Floor applied however slow the host is.
+        max_iterations (int, optional): Ceiling applied however fast the host is.
+        probe_iterations (int, optional): Iterations timed to measure the host.
+
+    Returns:
+        int: The iteration count, rounded to a multiple of 1000.
+    """
+    # Best of three probes, so a scheduling hiccup does not lower the cost factor.
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        _pbkdf2("calibration", "0" * 32, probe_iterations)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    iterations = int(probe_iterations * (target_ms / 1000) / max(elapsed, 1e-9))
+    iterations = max(min_iterations, min(max_iterations, iterations // 1000 * 1000))
+    logger.info("Calibrated %s to %d iterations for a %.0f ms verify target", ALGORITHM, iterations, target_ms)
+    return iterations
+
+
+class PasswordHasher:
+    """Hashes passwords with PBKDF2-HMAC-SHA256 and recognizes legacy hashes.
+
+    Hashes are stored as ``pbkdf2_sha256$<iterations>$<hex digest>``, so each one keeps
+    the cost it was made with and can still be verified after the cost changes. The
+    original unsalted-format SHA-256 hex digests are accepted by verify() and reported
+    by needs_rehash() so they can be upgraded on the next successful login.
+    """
+
+    def __init__(self, iterations: int = DEFAULT_ITERATIONS, rehash_tolerance: float = 0.0):
+        """
+        Args:
+            iterations (int, optional): PBKDF2 iterations used for new hashes.
+            rehash_tolerance (float, optional): Fraction by which a stored hash may fall
+                short of iterations before needs_rehash() reports it. Calibration measures
+                the host anew at every start, so without slack its noise would rewrite
+                hashes on login for no gain in cost.
+
+        Raises:
+            ValueError: If iterations is less than 1 or rehash_tolerance is not in [0, 1).
+        """
+        if iterations < 1:
+            raise ValueError("iterations must be at least 1")
+        if not 0 <= rehash_tolerance < 1:
+            raise ValueError("rehash_tolerance must be at least 0 and below 1")
+        self.iterations = iterations
+        self.rehash_tolerance = rehash_tolerance
+
+    def hash(self, password: str, salt: str) -> str:
+        """
+        Args:
+            password (str): The password to hash.
+            salt (str): The salt stored alongside the hash.
+
+        Returns:
+            str: The encoded hash.
+        """
+        return f"{ALGORITHM}${self.iterations}${_pbkdf2(password, salt, self.iterations)}"
+
+    def verify(self, password: str, salt: str, encoded: str) -> bool:
+        """
+        Checks a password against a stored hash in constant time.
+
+        Args:
+            password (str): The password to check.
+            salt (str): The stored salt.
+            encoded (str): The stored hash, in either the current or the legacy format.
+
+        Returns:
+            bool: True if the password matches.
+        """
+        if encoded.startswith(f"{ALGORITHM}$"):
+            try:
+                _, iterations, digest = encoded.split("$")
+                candidate = _pbkdf2(password, salt, int(iterations))
+            except ValueError:
+                logger.error("Malformed %s hash", ALGORITHM)
+                return False
+        else:
+            digest = encoded
+            candidate = hashlib.sha256((password + salt).encode()).hexdigest()
+        return hmac.compare_digest(candidate, digest)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """
+        Args:
+            encoded (str): A stored hash.
+
+        Returns:
+            bool: True for legacy SHA-256 hashes and hashes made with more than
+                rehash_tolerance fewer iterations than this hasher uses.
+        """
+        if not encoded.startswith(f"{ALGORITHM}$"):
+            return True
+        try:
+            return int(encoded.split("$")[1]) < self.iterations * (1 - self.rehash_tolerance)
+        except (IndexError, ValueError):
+            return True
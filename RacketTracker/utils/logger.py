@@ -1,26 +1,144 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+from typing import Optional
 
-from flask import current_app, has_request_context
+from flask import g, has_request_context
 
 
-def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(request_id)s - %(message)s'
+
+_lock = threading.RLock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def parse_log_levels(spec: str) -> dict[str, int]:
+    """
+    Parses per-logger levels such as ``"RacketTracker.models=DEBUG,werkzeug=WARNING"``.
+
+    Args:
+        spec (str): Comma-separated ``logger=LEVEL`` pairs.
+
+    Returns:
+        dict: Mapping of logger name to numeric level.
+
+    Raises:
+        ValueError: If a pair is malformed or names an unknown level.
+    """
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, level = item.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid LOG_LEVELS entry: {item!r}")
+        levels[name.strip()] = _to_level(level)
+    return levels
+
+
+def _to_level(level: str) -> int:
+    value = logging.getLevelName(level.strip().upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Unknown log level: {level!r}")
+    return value
+
+
+class RequestIdFilter(logging.Filter):
+    """Tags every record with the ID of the request it was logged in ("-" outside requests).
+
+    It runs on the QueueHandler, in the thread that logs, where the request context is
+    still available.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = g.get("request_id", "-") if has_request_context() else "-"
+        return True
+
 
-    # Create a console handler that logs to stderr
+class PipelineFormatter(logging.Formatter):
+    """Formats records with LOG_FORMAT, except ``raw`` records, which are written as-is.
+
+    Raw records (``extra={"raw": True}``) are already complete lines, such as the JSON
+    access log, and must not get a prefix.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "raw", False):
+            return record.getMessage()
+        return super().format(record)
+
+
+def _start_listener() -> None:
+    """Starts the thread that writes queued records to stderr."""
+    global _listener
     handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(PipelineFormatter(LOG_FORMAT))
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_after_fork() -> None:
+    """The listener thread does not survive fork(); give the child its own."""
+    global _listener
+    if _queue_handler is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _start_listener()
+
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+def shutdown_logging() -> None:
+    """Flushes queued records and stops the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+def configure_logging(level: Optional[str] = None, levels: Optional[str] = None) -> None:
+    """
+    Installs the process-wide logging pipeline. Only the first call has any effect.
+
+    Records go through a QueueHandler on the root logger and are formatted and
+    written to stderr by a QueueListener thread, so request threads never block on
+    I/O. Every other logger propagates to the root and has no handlers of its own.
+
+    Args:
+        level (str, optional): Root level; defaults to LOG_LEVEL from the environment (INFO).
+        levels (str, optional): Per-logger levels as ``name=LEVEL,...``; defaults to
+            LOG_LEVELS from the environment.
+    """
+    global _queue_handler
+    with _lock:
+        if _queue_handler is not None:
+            return
+        root = logging.getLogger()
+        root.setLevel(_to_level(level or os.getenv("LOG_LEVEL", "INFO")))
+        for name, logger_level in parse_log_levels(levels if levels is not None else os.getenv("LOG_LEVELS", "")).items():
+            logging.getLogger(name).setLevel(logger_level)
+
+        _queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        _queue_handler.addFilter(RequestIdFilter())
+        root.addHandler(_queue_handler)
+        _start_listener()
+        atexit.register(shutdown_logging)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def configure_logger(logger):
+    """
+    Routes a logger through the shared pipeline. Safe to call any number of times.
 
-    if has_request_context():
-        app_logger = current_app.logger
-        for handler in app_logger.handlers:
-            logger.addHandler(handler)
\ No newline at end of file
+    The logger keeps its level if one was configured through LOG_LEVELS and otherwise
+    inherits the root level. Handlers attached directly to it (such as Flask's default
+    handler on app.logger) are removed so every record is emitted exactly once.
+    """
+    configure_logging()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.propagate = True
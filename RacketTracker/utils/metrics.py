@@ -0,0 +1,220 @@
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyTracker:
+    """Keeps the most recent latency samples of one operation and reports percentiles.
+
+    Only the last ``window`` samples are kept, so the percentiles follow current load
+    rather than the whole life of the process.
+    """
+
+    def __init__(self, window: int = 1024):
+        """
+        Args:
+            window (int, optional): Number of most recent samples kept.
+        """
+        self.count = 0
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Records one sample."""
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Records how long the block takes, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Args:
+            q (float): The percentile, between 0 and 100.
+
+        Returns:
+            Optional[float]: The nearest-rank percentile in seconds, or None without samples.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, -(-len(samples) * q // 100))
+        return samples[int(rank) - 1]
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            dict: Total count plus p50 and p99 of the recent window, in milliseconds.
+        """
+        p50, p99 = self.percentile(50), self.percentile(99)
+        return {
+            "count": self.count,
+            "p50_ms": round(p50 * 1000, 3) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 3) if p99 is not None else None,
+        }
+
+
+class _Shard:
+    """Metric values written by one thread."""
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters: dict = {}
+        self.histograms: dict = {}
+
+
+class MetricsRegistry:
+    """Counters and histograms with per-thread shards, rendered in Prometheus text format.
+
+    Each thread only ever writes to its own shard, so recording a value takes no lock;
+    the shards are summed when the metrics are collected. Labels are passed as a tuple
+    of (name, value) pairs in a fixed order.
+    """
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        """
+        Args:
+            buckets (Iterable[float], optional): Histogram bucket upper bounds in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._help: dict[str, tuple[str, str]] = {}
+        self._shards: list[tuple[threading.Thread, _Shard]] = []
+        # Values of threads that have exited, so per-request threads do not pile up shards.
+        self._retired = _Shard()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        """Registers the TYPE and HELP lines of a metric."""
+        self._help[name] = (kind, help_text)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._retire_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_dead_shards(self) -> None:
+        """Folds the shards of exited threads into the retired shard. Caller holds the lock."""
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                _merge(self._retired, shard)
+        self._shards = alive
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1) -> None:
+        """Adds value to a counter."""
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        """Records one histogram sample."""
+        histograms = self._shard().histograms
+        key = (name, labels)
+        entry = histograms.get(key)
+        if entry is None:
+            entry = histograms[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def collect(self) -> tuple[dict, dict]:
+        """
+        Returns:
+            tuple: Counter totals and histogram totals (per-bucket counts, sum) keyed
+                by (name, labels), summed over every thread.
+        """
+        total = _Shard()
+        with self._lock:
+            self._retire_dead_shards()
+            _merge(total, self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            _merge(total, shard)
+        return total.counters, total.histograms
+
+    def render(self, gauges: Iterable[tuple[str, tuple, float]] = ()) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Args:
+            gauges (Iterable[tuple], optional): Point-in-time (name, labels, value)
+                samples collected by the caller, such as cache sizes.
+
+        Returns:
+            str: The exposition text.
+        """
+        counters, histograms = self.collect()
+        samples: dict[str, list[str]] = {}
+
+        for (name, labels), value in sorted(counters.items()):
+            samples.setdefault(name, []).append(f"{name}{_labels(labels)} {_number(value)}")
+        for name, labels, value in sorted(gauges, key=lambda gauge: (gauge[0], gauge[1])):
+            if value is not None:
+                samples.setdefault(name, []).append(f"{name}{_labels(labels)} {_number(value)}")
+        for (name, labels), (bucket_counts, total) in sorted(histograms.items()):
+            lines = samples.setdefault(name, [])
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+
+        out = []
+        for name in sorted(samples):
+            if name in self._help:
+                kind, help_text = self._help[name]
+                out.append(f"# HELP {name} {help_text}")
+                out.append(f"# TYPE {name} {kind}")
+            out.extend(samples[name])
+        return "\n".join(out) + "\n"
+
+
+def _merge(into: _Shard, shard: _Shard) -> None:
+    """Adds the values of shard to into. list() snapshots each dict in one step under the GIL."""
+    for key, value in list(shard.counters.items()):
+        into.counters[key] = into.counters.get(key, 0) + value
+    for key, (bucket_counts, total) in list(shard.histograms.items()):
+        merged = into.histograms.setdefault(key, [[0] * len(bucket_counts), 0.0])
+        merged[0] = [a + b for a, b in zip(merged[0], bucket_counts)]
+        merged[1] += total
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
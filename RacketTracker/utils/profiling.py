@@ -0,0 +1,369 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from functools import wraps
+from types import CodeType, FrameType
+from typing import Callable, Optional
+
+from flask import Flask, g, request
+from flask_login import current_user
+
+from RacketTracker.utils.admin import admin_users
+from RacketTracker.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_FILE_HEADER = "X-Profile-File"
+
+# Deep recursion would make unbounded stack keys; the outermost frames are dropped past this.
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(code: CodeType) -> str:
+    """Names a frame ``function (file.py:line)``; semicolons would break the collapsed format."""
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collect_stack(frame: Optional[FrameType], stop_at: Optional[CodeType] = None) -> tuple[str, ...]:
+    """
+    Walks a frame's call stack.
+
+    Args:
+        frame (FrameType): The innermost frame.
+        stop_at (CodeType, optional): Frames of this code and everything outside them
+            are left out, so a stack can start at a view function.
+
+    Returns:
+        tuple[str, ...]: Frame labels, outermost first.
+    """
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        if frame.f_code is stop_at:
+            break
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+def to_collapsed(stacks: Counter) -> str:
+    """
+    Renders stack counts in the collapsed format read by flamegraph.pl and speedscope.
+
+    Returns:
+        str: One ``frame;frame;frame count`` line per distinct stack, busiest first.
+    """
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks.most_common() if stack)
+
+
+def to_speedscope(stacks: Counter, name: str, interval: float) -> dict:
+    """
+    Renders stack counts as a speedscope sampled profile.
+
+    Args:
+        stacks (Counter): Sample counts keyed by stack, outermost frame first.
+        name (str): Profile name shown by speedscope.
+        interval (float): Seconds between samples, used to weight each stack.
+
+    Returns:
+        dict: A document in the speedscope file format.
+    """
+    frames: dict[str, int] = {}
+    samples, weights = [], []
+    for stack, count in stacks.most_common():
+        if stack:
+            samples.append([frames.setdefault(label, len(frames)) for label in stack])
+            weights.append(round(count * interval * 1000, 3))
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "RacketTracker",
+        "shared": {"frames": [{"name": label} for label in frames]},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": round(sum(weights), 3),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+class StackSampler:
+    """Samples the Python stack of one thread from a background thread.
+
+    Every ``interval`` seconds the target thread's current frame is read with
+    ``sys._current_frames()`` and its stack counted, so the profiled code runs
+    unmodified, without tracing hooks.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001, stop_at: Optional[CodeType] = None):
+        """
+        Args:
+            thread_id (int): Ident of the thread to sample.
+            interval (float, optional): Seconds between samples.
+            stop_at (CodeType, optional): Code object where recorded stacks start.
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stop_at = stop_at
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            self.stacks[collect_stack(frame, self.stop_at)] += 1
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        """Stops sampling and returns the stack counts."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+
+def write_profile(stacks: Counter, directory: str, name: str, interval: float) -> list[str]:
+    """
+    Writes a collapsed-stack file and a speedscope file for one profile.
+
+    Returns:
+        list[str]: Paths of the written files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, name)
+    with open(f"{base}.collapsed.txt", "w") as f:
+        f.write(to_collapsed(stacks))
+    with open(f"{base}.speedscope.json", "w") as f:
+        json.dump(to_speedscope(stacks, name, interval), f)
+    return [f"{base}.collapsed.txt", f"{base}.speedscope.json"]
+
+
+class ContinuousProfiler:
+    """Samples the stacks of request-handling threads for as long as the process runs.
+
+    Threads register while they handle a request, so idle server, logging and writer
+    threads do not drown out the application code. Samples are counted in buckets of
+    ``bucket_seconds``; buckets older than ``window`` seconds are dropped, so the
+    profile always covers recent traffic.
+    """
+
+    def __init__(self, interval: float = 0.01, window: float = 300.0, bucket_seconds: float = 10.0,
+                 stop_at: Optional[CodeType] = None):
+        """
+        Args:
+            interval (float, optional): Seconds between samples.
+            window (float, optional): Seconds of history kept.
+            bucket_seconds (float, optional): Granularity at which history expires.
+            stop_at (CodeType, optional): Code object where recorded stacks start.
+        """
+        self.interval = interval
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self.stop_at = stop_at
+        self.samples = 0
+        self.busy_seconds = 0.0
+        self._buckets: deque[tuple[float, Counter]] = deque()
+        self._threads: set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    def track(self) -> None:
+        """Starts sampling the calling thread."""
+        self._threads.add(threading.get_ident())
+
+    def untrack(self) -> None:
+        """Stops sampling the calling thread."""
+        self._threads.discard(threading.get_ident())
+
+    def sample(self) -> None:
+        """Takes one sample of every tracked thread."""
+        start = time.perf_counter()
+        frames = sys._current_frames()
+        stacks = [collect_stack(frames[ident], self.stop_at) for ident in list(self._threads) if ident in frames]
+        now = time.monotonic()
+        with self._lock:
+            if not self._buckets or now - self._buckets[-1][0] >= self.bucket_seconds:
+                self._buckets.append((now, Counter()))
+            while now - self._buckets[0][0] > self.window:
+                self._buckets.popleft()
+            bucket = self._buckets[-1][1]
+            for stack in stacks:
+                bucket[stack] += 1
+            self.samples += len(stacks)
+            self.busy_seconds += time.perf_counter() - start
+
+    def snapshot(self, seconds: Optional[float] = None) -> Counter:
+        """
+        Args:
+            seconds (float, optional): Only include roughly the last this many seconds;
+                defaults to the whole window.
+
+        Returns:
+            Counter: Sample counts keyed by stack, outermost frame first.
+        """
+        cutoff = time.monotonic() - (seconds if seconds is not None else self.window) - self.bucket_seconds
+        total = Counter()
+        with self._lock:
+            for started, bucket in self._buckets:
+                if started >= cutoff:
+                    total.update(bucket)
+        return total
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Sampling settings, samples taken and the share of wall time spent sampling.
+        """
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "interval_ms": self.interval * 1000,
+            "window_seconds": self.window,
+            "samples": self.samples,
+            "overhead": round(self.busy_seconds / uptime, 6) if uptime else 0.0,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error("Profiler sample failed: %s", e)
+
+    def start(self) -> "ContinuousProfiler":
+        """Starts the sampling thread; it is restarted in children after a fork."""
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="continuous-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _restart_after_fork(self) -> None:
+        """Threads do not survive fork(); a forked worker samples its own requests."""
+        if self._thread is None:
+            return
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = set()
+        self._buckets.clear()
+        self.samples = 0
+        self.busy_seconds = 0.0
+        self.start()
+
+
+# Profilers started in this process, restarted in forked children by one fork hook.
+_profilers: "weakref.WeakSet[ContinuousProfiler]" = weakref.WeakSet()
+
+
+def _restart_profilers_after_fork() -> None:
+    for profiler in list(_profilers):
+        profiler._restart_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_profilers_after_fork)
+
+
+def init_continuous_profiler(app: Flask) -> Optional[ContinuousProfiler]:
+    """
+    Starts a ContinuousProfiler for the app's request threads if PROFILER_ENABLED is set.
+
+    Settings: PROFILER_HZ (samples per second) and PROFILER_WINDOW_SECONDS (history kept).
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        Optional[ContinuousProfiler]: The profiler, or None when it is disabled.
+    """
+    if not app.config.get("PROFILER_ENABLED", False):
+        return None
+    profiler = ContinuousProfiler(
+        interval=1 / float(app.config.get("PROFILER_HZ", 100)),
+        window=float(app.config.get("PROFILER_WINDOW_SECONDS", 300)),
+        # Leave out the WSGI server frames every request has in common.
+        stop_at=type(app).wsgi_app.__code__,
+    )
+    app.before_request(profiler.track)
+    app.teardown_request(lambda exc: profiler.untrack())
+    app.extensions["profiler"] = profiler
+    profiler.start()
+    _profilers.add(profiler)
+    return profiler
+
+
+def _may_profile() -> bool:
+    return current_user.is_authenticated and current_user.username in admin_users()
+
+
+def init_request_profiling(app: Flask) -> None:
+    """
+    Lets admins profile a single request by sending an ``X-Profile`` header.
+
+    Only enabled when PROFILE_REQUESTS_ENABLED is set; otherwise nothing is installed
+    and requests pay nothing. When enabled, every view function is wrapped; a request
+    from a user listed in ADMIN_USERS that carries the header has its view sampled
+    every PROFILE_INTERVAL_MS, and a collapsed-stack and a speedscope file are written
+    to PROFILE_DIR. The file name is returned in the X-Profile-File response header.
+    Must be called after every route is registered.
+
+    Args:
+        app (Flask): The application.
+    """
+    if not app.config.get("PROFILE_REQUESTS_ENABLED", False):
+        return
+    directory = app.config.get("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "racket-profiles")
+    interval = float(app.config.get("PROFILE_INTERVAL_MS", 1)) / 1000
+
+    def profiled(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not request.headers.get(PROFILE_HEADER) or not _may_profile():
+                return view(*args, **kwargs)
+            sampler = StackSampler(threading.get_ident(), interval, stop_at=wrapper.__code__).start()
+            start = time.perf_counter()
+            try:
+                rv = view(*args, **kwargs)
+            finally:
+                stacks = sampler.stop()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            name = f"{g.get('request_id', 'request')}-{request.endpoint}"
+            paths = write_profile(stacks, directory, name, interval)
+            logger.info("Profiled %s %s (%.1f ms, %d samples): %s",
+                        request.method, request.path, elapsed_ms, sum(stacks.values()), ", ".join(paths))
+            response = app.make_response(rv)
+            response.headers[PROFILE_FILE_HEADER] = name
+            return response
+        return wrapper
+
+    for endpoint, view in list(app.view_functions.items()):
+        if endpoint != "static":
+            app.view_functions[endpoint] = profiled(view)
+    logger.warning("Per-request profiling is enabled; profiles are written to %s", directory)
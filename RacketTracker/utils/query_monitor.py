@@ -0,0 +1,208 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+
+from RacketTracker.db import db
+from RacketTracker.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# Expanded IN lists render one placeholder per value; collapse them so the shape is stable.
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalizes a SQL statement so executions that differ only in their values match.
+
+    Args:
+        statement (str): The statement as sent to the driver.
+
+    Returns:
+        str: The statement with whitespace collapsed and IN lists reduced to ``(?...)``.
+    """
+    return _IN_LIST.sub("(?...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def parameter_shape(parameters, executemany: bool) -> str:
+    """
+    Describes bound parameters by type only, so no customer data ends up in the log.
+
+    Args:
+        parameters: The parameters passed to the cursor.
+        executemany (bool): Whether parameters is a sequence of parameter sets.
+
+    Returns:
+        str: For example ``"(int, str)"`` or ``"300 x (str, date)"``.
+    """
+    def describe(params) -> str:
+        if isinstance(params, dict):
+            return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + "}"
+        return "(" + ", ".join(type(value).__name__ for value in params or ()) + ")"
+
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {describe(rows[0]) if rows else '()'}"
+    return describe(parameters)
+
+
+class QueryMonitor:
+    """Records slow statements and requests that repeat one statement shape many times.
+
+    Statements slower than ``slow_ms`` are kept with their parameter types and SQLite's
+    ``EXPLAIN QUERY PLAN``. A request that runs the same statement shape more than
+    ``repeat_threshold`` times (the usual sign of an N+1 access pattern) is recorded once
+    per shape. Both are logged as warnings and kept in bounded in-memory lists.
+    """
+
+    def __init__(self, slow_ms: float = 100.0, repeat_threshold: int = 10, max_entries: int = 200):
+        """
+        Args:
+            slow_ms (float, optional): Statements at least this slow are recorded.
+            repeat_threshold (int, optional): More executions of one shape in a request
+                than this are flagged.
+            max_entries (int, optional): Findings kept per list; older ones are dropped.
+        """
+        self.slow_ms = slow_ms
+        self.repeat_threshold = repeat_threshold
+        self.slow_queries: deque = deque(maxlen=max_entries)
+        self.repeated_queries: deque = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def attach(self, engine) -> None:
+        """Adds the cursor event listeners to an engine."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_monitor_start"] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop("query_monitor_start", None)
+        if start is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        in_request = has_request_context()
+
+        if in_request:
+            counts = g.setdefault("query_shapes", {})
+            shape = statement_shape(statement)
+            counts[shape] = counts.get(shape, 0) + 1
+
+        if elapsed_ms >= self.slow_ms:
+            entry = {
+                "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "request_id": g.get("request_id") if in_request else None,
+                "route": request.url_rule.rule if in_request and request.url_rule else None,
+                "duration_ms": round(elapsed_ms, 3),
+                "statement": statement_shape(statement),
+                "parameters": parameter_shape(parameters, executemany),
+                "plan": self._explain(cursor, statement, parameters, executemany),
+            }
+            with self._lock:
+                self.slow_queries.append(entry)
+            logger.warning("Slow query (%.1f ms, params %s): %s | plan: %s",
+                           elapsed_ms, entry["parameters"], entry["statement"], "; ".join(entry["plan"]) or "-")
+
+    @staticmethod
+    def _explain(cursor, statement: str, parameters, executemany: bool) -> list[str]:
+        """Runs EXPLAIN QUERY PLAN on the same connection; empty if it does not apply."""
+        if executemany or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return []
+        try:
+            plan_cursor = cursor.connection.cursor()
+            try:
+                rows = plan_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+            finally:
+                plan_cursor.close()
+            return [row[3] for row in rows]
+        except Exception as e:
+            logger.debug("EXPLAIN QUERY PLAN failed: %s", e)
+            return []
+
+    def end_request(self) -> list[dict]:
+        """
+        Flags the statement shapes the current request ran too often.
+
+        Returns:
+            list[dict]: The findings recorded for this request.
+        """
+        counts = g.pop("query_shapes", None) or {}
+        findings = []
+        for shape, count in counts.items():
+            if count > self.repeat_threshold:
+                findings.append({
+                    "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                    "request_id": g.get("request_id"),
+                    "route": request.url_rule.rule if request.url_rule else None,
+                    "count": count,
+                    "statement": shape,
+                })
+                logger.warning("Possible N+1: statement ran %d times in one request to %s: %s",
+                               count, request.path, shape)
+        if findings:
+            with self._lock:
+                self.repeated_queries.extend(findings)
+        return findings
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: The thresholds and the recorded slow and repeated queries, oldest first.
+        """
+        with self._lock:
+            return {
+                "slow_ms": self.slow_ms,
+                "repeat_threshold": self.repeat_threshold,
+                "slow_queries": list(self.slow_queries),
+                "repeated_queries": list(self.repeated_queries),
+            }
+
+    def clear(self) -> None:
+        """Forgets every recorded finding."""
+        with self._lock:
+            self.slow_queries.clear()
+            self.repeated_queries.clear()
+
+
+def init_query_monitor(app: Flask) -> Optional[QueryMonitor]:
+    """
+    Installs a QueryMonitor on the app's engine if QUERY_MONITOR_ENABLED is set.
+
+    Settings: QUERY_MONITOR_SLOW_MS, QUERY_MONITOR_REPEAT_THRESHOLD and
+    QUERY_MONITOR_MAX_ENTRIES.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        Optional[QueryMonitor]: The monitor, or None when it is disabled.
+    """
+    if not app.config.get("QUERY_MONITOR_ENABLED", True):
+        return None
+    monitor = QueryMonitor(
+        slow_ms=app.config.get("QUERY_MONITOR_SLOW_MS", 100.0),
+        repeat_threshold=app.config.get("QUERY_MONITOR_REPEAT_THRESHOLD", 10),
+        max_entries=app.config.get("QUERY_MONITOR_MAX_ENTRIES", 200),
+    )
+    with app.app_context():
+        monitor.attach(db.engine)
+    app.extensions["query_monitor"] = monitor
+
+    @app.after_request
+    def flag_repeated_queries(response: Response) -> Response:
+        monitor.end_request()
+        return response
+
+    return monitor
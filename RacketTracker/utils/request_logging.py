@@ -0,0 +1,118 @@
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+
+from RacketTracker.db import db
+from RacketTracker.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# One JSON line per request; a separate logger so it can be levelled or routed on its own.
+access_logger = logging.getLogger("RacketTracker.access")
+configure_logger(access_logger)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Incoming request IDs are echoed into logs, so only accept short, plain tokens.
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop("query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    # Writes handed to the write queue run outside the request and are not counted.
+    if has_request_context() and "request_start" in g:
+        g.db_time += elapsed
+        g.db_queries += 1
+
+
+def should_log(method: str, status: int, duration_ms: float, sample_rate: float, slow_ms: float) -> bool:
+    """
+    Decides whether a request gets an access log line.
+
+    Only successful GETs are sampled; errors, writes and slow requests are always logged.
+
+    Args:
+        method (str): The HTTP method.
+        status (int): The response status code.
+        duration_ms (float): Total request time in milliseconds.
+        sample_rate (float): Fraction of successful GETs to log, between 0 and 1.
+        slow_ms (float): Requests at least this slow are always logged.
+
+    Returns:
+        bool: True if the request should be logged.
+    """
+    if method != "GET" or status >= 400 or duration_ms >= slow_ms or sample_rate >= 1:
+        return True
+    return random.random() < sample_rate
+
+
+def init_request_logging(app: Flask) -> None:
+    """
+    Assigns every request an ID and writes one compact JSON access line per request.
+
+    The ID is taken from a well-formed incoming X-Request-ID header or generated, is
+    returned in the X-Request-ID response header and tags every log line written while
+    the request runs. The access line records the route, status, total latency, and the
+    time and number of database queries, measured with engine events.
+
+    Settings: REQUEST_LOG_ENABLED, REQUEST_LOG_GET_SAMPLE_RATE (fraction of successful
+    GETs logged) and REQUEST_LOG_SLOW_MS (slower requests are always logged). With the
+    access log disabled, request IDs and the timings in ``g`` (request_start, db_time,
+    db_queries) are still maintained for metrics.
+
+    Args:
+        app (Flask): The application.
+    """
+    log_enabled = app.config.get("REQUEST_LOG_ENABLED", True)
+    sample_rate = float(app.config.get("REQUEST_LOG_GET_SAMPLE_RATE", 1.0))
+    slow_ms = float(app.config.get("REQUEST_LOG_SLOW_MS", 500))
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def start_request_timer() -> None:
+        incoming = request.headers.get(REQUEST_ID_HEADER, "")
+        g.request_id = incoming if VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        g.request_start = time.perf_counter()
+        g.db_time = 0.0
+        g.db_queries = 0
+
+    @app.after_request
+    def log_request(response: Response) -> Response:
+        if "request_start" not in g:
+            return response
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+        duration_ms = (time.perf_counter() - g.request_start) * 1000
+        if log_enabled and access_logger.isEnabledFor(logging.INFO) and should_log(request.method, response.status_code, duration_ms, sample_rate, slow_ms):
+            access_logger.info(json.dumps({
+                "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "request_id": g.request_id,
+                "method": request.method,
+                "route": request.url_rule.rule if request.url_rule else None,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round(duration_ms, 3),
+                "db_ms": round(g.db_time * 1000, 3),
+                "db_queries": g.db_queries,
+            }, separators=(",", ":")), extra={"raw": True})
+        return response
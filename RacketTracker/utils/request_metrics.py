@@ -0,0 +1,48 @@
+import time
+
+from flask import Flask, Response, g, request
+
+from RacketTracker.utils.metrics import MetricsRegistry
+
+
+def init_request_metrics(app: Flask) -> MetricsRegistry:
+    """
+    Records request counts, errors, latency and database usage per route and method.
+
+    Uses the timings that request logging keeps in ``g``, so init_request_logging must be
+    called first. The registry is stored in ``app.extensions["metrics"]``; with
+    METRICS_ENABLED off it stays empty and nothing is recorded.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        MetricsRegistry: The registry the request metrics are recorded in.
+    """
+    registry = MetricsRegistry()
+    registry.describe("http_requests_total", "counter", "Requests handled, by route, method and status.")
+    registry.describe("http_request_errors_total", "counter", "Requests that ended in a 5xx response.")
+    registry.describe("http_request_duration_seconds", "histogram", "Request latency, by route and method.")
+    registry.describe("db_queries_total", "counter", "Database queries issued while handling requests.")
+    registry.describe("db_query_duration_seconds_total", "counter", "Time spent in database queries while handling requests.")
+    app.extensions["metrics"] = registry
+    if not app.config.get("METRICS_ENABLED", True):
+        return registry
+
+    @app.after_request
+    def record_request_metrics(response: Response) -> Response:
+        if "request_start" not in g:
+            return response
+        elapsed = time.perf_counter() - g.request_start
+        # Unmatched paths share one label so 404 scans cannot blow up the label set.
+        labels = (("route", request.url_rule.rule if request.url_rule else "unmatched"), ("method", request.method))
+        registry.inc("http_requests_total", labels + (("status", response.status_code),))
+        if response.status_code >= 500:
+            registry.inc("http_request_errors_total", labels)
+        registry.observe("http_request_duration_seconds", labels, elapsed)
+        if g.db_queries:
+            registry.inc("db_queries_total", labels, g.db_queries)
+            registry.inc("db_query_duration_seconds_total", labels, g.db_time)
+        return response
+
+    return registry
@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from flask import Flask, Response, g, request
+
+from RacketTracker.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# Body fields replaced before a request is written; matched case-insensitively.
+SCRUBBED_FIELDS = ("password", "new_password", "old_password", "current_password", "token", "secret")
+SCRUBBED_VALUE = "***"
+
+# Request headers kept in a trace; cookies and Authorization never are.
+RECORDED_HEADERS = ("Content-Type", "Accept", "X-Request-ID")
+
+
+def scrub(value: Any) -> Any:
+    """
+    Returns a copy of a JSON body with every credential field replaced by ``"***"``.
+
+    Args:
+        value: The decoded JSON body.
+
+    Returns:
+        The body with fields named in SCRUBBED_FIELDS replaced, at any depth.
+    """
+    if isinstance(value, dict):
+        return {
+            key: SCRUBBED_VALUE if key.lower() in SCRUBBED_FIELDS else scrub(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub(item) for item in value]
+    return value
+
+
+class RequestRecorder:
+    """Appends one JSON line per request to a trace file that the load generator replays.
+
+    Each line holds the time offset since recording started, the method, route, path,
+    query string, a few headers, the scrubbed JSON body, and the status and latency
+    that were served. Lines are written under a lock so concurrent requests do not
+    interleave.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The trace file; new lines are appended.
+        """
+        self.path = path
+        self.recorded = 0
+        self._started = time.time()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", buffering=1)
+
+    def record(self, response: Response, duration_ms: Optional[float]) -> None:
+        """Writes the current request and its response status."""
+        body = request.get_json(silent=True) if request.is_json else None
+        entry = {
+            "offset": round(time.time() - self._started, 4),
+            "method": request.method,
+            "route": request.url_rule.rule if request.url_rule else None,
+            "path": request.path,
+            "query": request.query_string.decode("latin-1"),
+            "headers": {name: request.headers[name] for name in RECORDED_HEADERS if name in request.headers},
+            "body": scrub(body),
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 3) if duration_ms is not None else None,
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self.recorded += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def init_request_recorder(app: Flask) -> Optional[RequestRecorder]:
+    """
+    Records every request to REQUEST_RECORD_PATH if REQUEST_RECORD_ENABLED is set.
+
+    Passwords, tokens and secrets in request bodies are scrubbed, and cookies and
+    Authorization headers are never written. Requests to /api/admin routes are not
+    recorded.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        Optional[RequestRecorder]: The recorder, or None when recording is disabled.
+    """
+    if not app.config.get("REQUEST_RECORD_ENABLED", False):
+        return None
+    recorder = RequestRecorder(app.config.get("REQUEST_RECORD_PATH") or "requests.jsonl")
+    app.extensions["request_recorder"] = recorder
+    logger.warning("Recording requests to %s", recorder.path)
+
+    @app.after_request
+    def record_request(response: Response) -> Response:
+        if request.path.startswith("/api/admin/"):
+            return response
+        start = g.get("request_start")
+        try:
+            recorder.record(response, (time.perf_counter() - start) * 1000 if start is not None else None)
+        except Exception as e:
+            logger.error("Failed to record request %s %s: %s", request.method, request.path, e)
+        return response
+
+    return recorder
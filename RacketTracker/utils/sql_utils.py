@@ -1,7 +1,11 @@
 from contextlib import contextmanager
 import logging
 import os
+import queue
+import re
 import sqlite3
+import threading
+from typing import Iterator, Optional
 
 from RacketTracker.utils.logger import configure_logger
 
@@ -13,6 +17,196 @@ configure_logger(logger)
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "/app/sql/fitness.db")
 
+# PRAGMAs the engine layer may set, in the order they are applied. busy_timeout goes
+# first so that switching journal_mode waits for other connections instead of failing.
+SQLITE_PRAGMA_NAMES = ("busy_timeout", "journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store")
+
+# SQLite reports these as integers; map them back to the names used in config.
+_PRAGMA_ENUMS = {
+    "synchronous": {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"},
+    "temp_store": {0: "DEFAULT", 1: "FILE", 2: "MEMORY"},
+}
+
+_PRAGMA_VALUE = re.compile(r"^(-?\d+|[A-Za-z]+)$")
+
+# Pool settings for the raw sqlite3 helpers below. The PRAGMAs are the app's SQLITE_PRAGMAS,
+# passed in by create_app through configure_pool so both connection paths behave alike.
+POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "5"))
+POOL_TIMEOUT = float(os.getenv("SQLITE_POOL_TIMEOUT", "5"))
+_pool_pragmas: dict = {}
+
+class SQLiteConnectionPool:
+    """Thread-safe pool of sqlite3 connections to one database file.
+
+    At most max_size connections exist at once. Idle connections are reused last-in,
+    first-out so the warmest page cache is used first, checked with ``SELECT 1`` on
+    checkout and replaced if they no longer work. PRAGMAs are applied once, when a
+    connection is opened.
+    """
+
+    def __init__(self, db_path: str, max_size: int = 5, timeout: float = 5.0, pragmas: Optional[dict] = None):
+        """
+        Args:
+            db_path (str): Path of the SQLite database file.
+            max_size (int, optional): Maximum number of open connections.
+            timeout (float, optional): Seconds to wait for a free connection.
+            pragmas (dict, optional): PRAGMAs applied to each new connection.
+
+        Raises:
+            ValueError: If max_size is less than 1.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = pragmas or {}
+        self.opened = 0
+        self.closed = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+
+    def _open(self) -> sqlite3.Connection:
+        logger.debug("Opening pooled database connection to %s...", self.db_path)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            apply_sqlite_pragmas(conn, self.pragmas)
+        except Exception:
+            conn.close()
+            raise
+        self.opened += 1
+        return conn
+
+    @staticmethod
+    def _close(conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        logger.debug("Pooled database connection closed.")
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Checks a connection out of the pool, opening one if none is idle.
+
+        Returns:
+            sqlite3.Connection: A working connection; hand it back with release().
+
+        Raises:
+            sqlite3.OperationalError: If no connection frees up within the timeout.
+        """
+        if self._pid != os.getpid():
+            # Connections must not be shared with a forked child; start over.
+            self._reset()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError(
+                f"Timed out after {self.timeout}s waiting for one of {self.max_size} pooled connections")
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._open()
+                if self._is_healthy(conn):
+                    return conn
+                logger.warning("Discarding broken pooled connection to %s", self.db_path)
+                self._close(conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Returns a connection to the pool, rolling back anything left uncommitted.
+
+        Once the pool has been closed, returned connections are closed instead.
+        """
+        try:
+            if self.closed:
+                self._close(conn)
+                return
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+            if self.closed:
+                # close() ran while this connection was being put back.
+                self._drain()
+        except sqlite3.Error:
+            self._close(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Context manager that checks a connection out and always returns it."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Maximum size, connections opened so far and connections currently idle.
+        """
+        return {"max_size": self.max_size, "opened": self.opened, "idle": self._idle.qsize()}
+
+    def close(self) -> None:
+        """Closes every idle connection. Connections checked out are closed on release."""
+        self.closed = True
+        self._drain()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+_pool: Optional[SQLiteConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool_stats() -> Optional[dict]:
+    """Returns the shared pool's stats, or None if the raw helpers have not been used yet."""
+    pool = _pool
+    return pool.stats() if pool is not None else None
+
+def configure_pool(pragmas: dict) -> None:
+    """
+    Sets the PRAGMAs applied to connections of the shared pool.
+
+    A pool already opened with other PRAGMAs is replaced on its next use.
+
+    Args:
+        pragmas (dict): Mapping of PRAGMA name to value, as in SQLITE_PRAGMAS.
+    """
+    global _pool_pragmas
+    _pool_pragmas = dict(pragmas)
+
+def get_pool() -> SQLiteConnectionPool:
+    """Returns the shared pool for DB_PATH, creating it on first use."""
+    global _pool
+    if _pool is None or _pool.db_path != DB_PATH or _pool.pragmas != _pool_pragmas:
+        with _pool_lock:
+            if _pool is None or _pool.db_path != DB_PATH or _pool.pragmas != _pool_pragmas:
+                if _pool is not None:
+                    _pool.close()
+                _pool = SQLiteConnectionPool(DB_PATH, max_size=POOL_SIZE, timeout=POOL_TIMEOUT, pragmas=_pool_pragmas)
+    return _pool
 
 def check_database_connection():
     """
@@ -23,14 +217,11 @@ def check_database_connection():
 
     """
     try:
-        logger.info(f"Checking database connection to {DB_PATH}...")
+        logger.info("Checking database connection to %s...", DB_PATH)
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        # Execute a simple query to verify the connection is active
-        cursor.execute("SELECT 1;")
-        conn.close()
+        with get_pool().connection() as conn:
+            # Execute a simple query to verify the connection is active
+            conn.execute("SELECT 1;")
 
         logger.info("Database connection is healthy.")
 
@@ -51,23 +242,19 @@ def check_table_exists(tablename: str):
 
     """
     try:
-        logger.info(f"Checking if table '{tablename}' exists in {DB_PATH}...")
-
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+        logger.info("Checking if table '%s' exists in %s...", tablename, DB_PATH)
 
-        # Use parameterized query to avoid SQL injection
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (tablename,))
-        result = cursor.fetchone()
-
-        conn.close()
+        with get_pool().connection() as conn:
+            # Use parameterized query to avoid SQL injection
+            cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (tablename,))
+            result = cursor.fetchone()
 
         if result is None:
             error_message = f"Table '{tablename}' does not exist."
             logger.error(error_message)
             raise Exception(error_message)
 
-        logger.info(f"Table '{tablename}' exists.")
+        logger.info("Table '%s' exists.", tablename)
 
     except sqlite3.Error as e:
         error_message = f"Table check error for '{tablename}': {e}"
@@ -76,7 +263,10 @@ def check_table_exists(tablename: str):
 
 @contextmanager
 def get_db_connection():
-    """Context manager for SQLite database connection.
+    """Context manager for a pooled SQLite database connection.
+
+    The connection goes back to the pool afterwards; anything left uncommitted is
+    rolled back.
 
     Yields:
         sqlite3.Connection: The SQLite connection object.
@@ -85,15 +275,70 @@ def get_db_connection():
         sqlite3.Error: If there is an issue connecting to the database.
 
     """
-    conn = None
     try:
-        logger.info(f"Opening database connection to {DB_PATH}...")
-        conn = sqlite3.connect(DB_PATH)
-        yield conn
+        with get_pool().connection() as conn:
+            yield conn
     except sqlite3.Error as e:
-        logger.error(f"Database connection error: {e}")
+        logger.error("Database connection error: %s", e)
         raise e
+
+
+def apply_sqlite_pragmas(conn, pragmas: dict) -> None:
+    """
+    Applies PRAGMAs to a DB-API SQLite connection.
+
+    Args:
+        conn (sqlite3.Connection): The connection to configure.
+        pragmas (dict): Mapping of PRAGMA name to value. Values that are None or
+            empty are left at SQLite's default.
+
+    Raises:
+        ValueError: If a PRAGMA name is not supported or a value is malformed.
+
+    """
+    unknown = set(pragmas) - set(SQLITE_PRAGMA_NAMES)
+    if unknown:
+        raise ValueError(f"Unsupported SQLite PRAGMA(s): {', '.join(sorted(unknown))}")
+
+    cursor = conn.cursor()
+    try:
+        for name in SQLITE_PRAGMA_NAMES:
+            value = pragmas.get(name)
+            if value is None or value == "":
+                continue
+            # PRAGMA values cannot be bound as parameters, so only plain numbers and keywords are allowed.
+            if not _PRAGMA_VALUE.match(str(value)):
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+            cursor.execute(f"PRAGMA {name} = {value}")
     finally:
-        if conn:
-            conn.close()
-            logger.info("Database connection closed.")
\ No newline at end of file
+        cursor.close()
+
+def read_sqlite_pragmas(conn, names=SQLITE_PRAGMA_NAMES) -> dict:
+    """
+    Reads the PRAGMA values currently in effect on a DB-API SQLite connection.
+
+    Args:
+        conn (sqlite3.Connection): The connection to inspect.
+        names (Iterable[str], optional): The PRAGMAs to read.
+
+    Returns:
+        dict: Mapping of PRAGMA name to its effective value (None if SQLite reports
+            nothing). Enumerated PRAGMAs (synchronous, temp_store) are reported by name,
+            journal_mode in upper case.
+
+    """
+    cursor = conn.cursor()
+    try:
+        effective = {}
+        for name in names:
+            row = cursor.execute(f"PRAGMA {name}").fetchone()
+            # Some PRAGMAs (mmap_size on an in-memory database) return no row at all.
+            value = row[0] if row is not None else None
+            if name in _PRAGMA_ENUMS:
+                value = _PRAGMA_ENUMS[name].get(value, value)
+            elif isinstance(value, str):
+                value = value.upper()
+            effective[name] = value
+        return effective
+    finally:
+        cursor.close()
@@ -0,0 +1,79 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+
+class WorkerPoolBusy(Exception):
+    """Raised when a BoundedWorkerPool cannot take or finish a job in time."""
+
+
+class BoundedWorkerPool:
+    """Runs CPU-heavy calls (password hashing) on a fixed set of worker threads.
+
+    hashlib releases the GIL while hashing, so the workers run in parallel while request
+    threads only wait on a future. At most ``max_pending`` jobs may be queued or running;
+    beyond that, and when a job does not finish within ``timeout``, WorkerPoolBusy is
+    raised instead of piling up request threads behind a burst.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 64, timeout: float = 5.0,
+                 name: str = "worker"):
+        """
+        Args:
+            max_workers (int, optional): Worker threads; defaults to the CPU count.
+            max_pending (int, optional): Jobs allowed to be queued or running at once.
+            timeout (float, optional): Seconds to wait for a slot and for the result.
+            name (str, optional): Prefix of the worker thread names.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.name = name
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._pid: Optional[int] = None
+
+    def _ensure_started(self) -> None:
+        """Creates the executor on first use, and again in a forked child."""
+        if self._executor is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._slots = threading.BoundedSemaphore(self.max_pending)
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+
+    def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Runs fn(*args, **kwargs) on a worker and waits for the result.
+
+        Returns:
+            Any: The return value of fn.
+
+        Raises:
+            WorkerPoolBusy: If the pool is saturated or the job does not finish in time.
+        """
+        self._ensure_started()
+        slots = self._slots
+        if not slots.acquire(timeout=self.timeout):
+            raise WorkerPoolBusy(f"{self.name} pool is saturated ({self.max_pending} jobs pending)")
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise WorkerPoolBusy(f"{self.name} job did not finish within {self.timeout}s") from None
+
+    def shutdown(self) -> None:
+        """Stops the workers after the jobs already submitted."""
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
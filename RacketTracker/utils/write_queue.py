@@ -0,0 +1,267 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+from flask import Flask, current_app
+from sqlalchemy import event
+
+from RacketTracker.db import db
+from RacketTracker.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class WriteQueueUnavailable(Exception):
+    """Raised when a queued write is not committed within the queue's timeout."""
+
+
+class WriteQueue:
+    """Funnels database writes through a single writer thread with group commit.
+
+    SQLite allows one writer at a time, so concurrent request threads committing on
+    their own mostly wait on the database lock (and eventually fail with "database is
+    locked"). Instead, writes are submitted here as callables. The writer thread takes
+    every job that is waiting (up to max_batch), runs each one in its own savepoint of
+    one shared transaction and commits once for the batch. Each caller's future is
+    resolved with its own return value or exception.
+
+    Model methods need no changes: their ``db.session.commit()``/``rollback()`` calls
+    are scoped to the job's savepoint while a batch is running (see RacketTracker.db).
+
+    The queue and its writer thread belong to one process. Under gunicorn each preforked
+    worker has its own, so writes are serialized within a worker while the workers still
+    take turns on the SQLite lock, waiting up to the busy_timeout PRAGMA for it.
+    """
+
+    def __init__(self, app: Flask, max_batch: int = 64, max_wait: float = 0.0, timeout: float = 30.0):
+        """
+        Args:
+            app (Flask): The application whose database the writer uses.
+            max_batch (int, optional): Maximum number of jobs committed together.
+            max_wait (float, optional): Seconds to wait for more jobs once a batch has
+                started. Zero commits whatever is already queued.
+            timeout (float, optional): Seconds run() waits for a write to be committed.
+        """
+        self.app = app
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.batches = 0
+        self.jobs = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queues a write for the writer thread.
+
+        Args:
+            fn (Callable): The write to run; it is called as fn(*args, **kwargs).
+
+        Returns:
+            Future: Resolved with the return value or exception of fn.
+        """
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Submits a write and blocks until its batch has been committed.
+
+        Returns:
+            Any: The return value of fn.
+
+        Raises:
+            WriteQueueUnavailable: If the write is not committed within the timeout. A
+                write that has not started by then is cancelled; one already running may
+                still be committed.
+        """
+        if threading.current_thread() is self._thread:
+            # A queued write issuing another write: waiting for itself would deadlock.
+            return fn(*args, **kwargs)
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise WriteQueueUnavailable(f"write was not committed within {self.timeout}s") from None
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops the writer thread once the jobs already queued have been processed."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                self._queue.put(None)
+                self._thread.join(timeout)
+            self._thread = None
+
+    def _running(self) -> bool:
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def _ensure_started(self) -> None:
+        """Starts the writer thread on first use, in a forked child, and after it died."""
+        if self._running():
+            return
+        with self._lock:
+            if not self._running():
+                if self._thread is not None and self._pid == os.getpid():
+                    logger.error("Write queue writer thread died; restarting it")
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._writer, name="write-queue", daemon=True)
+                self._thread.start()
+                logger.info("Write queue started (max_batch=%s, max_wait=%ss)", self.max_batch, self.max_wait)
+
+    def _next_batch(self) -> Optional[list]:
+        """Blocks for the first job, then collects whatever else is ready."""
+        job = self._queue.get()
+        if job is None:
+            return None
+        batch = [job]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                self._queue.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _writer(self) -> None:
+        with self.app.app_context():
+            session = db.session()
+            session.expire_on_commit = False
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                try:
+                    self._run_batch(session, batch)
+                except Exception as e:
+                    # Never leave callers waiting on a batch the writer could not finish.
+                    logger.error("Write queue batch of %s write(s) failed: %s", len(batch), e)
+                    session.rollback()
+                    session.expunge_all()
+                    for future, *_ in batch:
+                        if not future.done():
+                            future.set_exception(e)
+
+    def _run_batch(self, session, batch: list) -> None:
+        results = []
+        session.info["group_commit"] = True
+        try:
+            for future, fn, args, kwargs in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                savepoint = session.begin_nested()
+                try:
+                    result = fn(*args, **kwargs)
+                    if savepoint.is_active:
+                        savepoint.commit()
+                    results.append((future, result, None))
+                except BaseException as e:
+                    if session.get_nested_transaction() is savepoint:
+                        savepoint.rollback()
+                    results.append((future, None, e))
+        finally:
+            session.info["group_commit"] = False
+
+        try:
+            session.commit()
+        except Exception as e:
+            logger.error("Group commit of %s write(s) failed: %s", len(results), e)
+            session.rollback()
+            results = [(future, None, error or e) for future, _, error in results]
+        finally:
+            # Hand detached, fully loaded objects back to the callers' threads.
+            session.expunge_all()
+
+        self.batches += 1
+        self.jobs += len(results)
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+def _enable_savepoints(engine) -> None:
+    """
+    Lets SQLAlchemy control SQLite transactions so SAVEPOINTs nest properly.
+
+    pysqlite only emits BEGIN before DML, so a SAVEPOINT issued first opens the
+    transaction itself and releasing it commits. Turning off pysqlite's own
+    transaction handling and emitting BEGIN from SQLAlchemy keeps every savepoint
+    inside the batch transaction.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    # Connections opened before the listener was added keep pysqlite's behaviour.
+    engine.dispose()
+
+
+def init_write_queue(app: Flask) -> Optional[WriteQueue]:
+    """
+    Installs a WriteQueue on the app if WRITE_QUEUE_ENABLED is set.
+
+    The queue is per process; see WriteQueue for what that means under gunicorn.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        Optional[WriteQueue]: The queue, or None when write serialization is disabled.
+    """
+    if not app.config.get("WRITE_QUEUE_ENABLED", False):
+        return None
+    with app.app_context():
+        _enable_savepoints(db.engine)
+    write_queue = WriteQueue(
+        app,
+        max_batch=app.config.get("WRITE_QUEUE_MAX_BATCH", 64),
+        max_wait=app.config.get("WRITE_QUEUE_MAX_WAIT_MS", 0) / 1000,
+        timeout=app.config.get("WRITE_QUEUE_TIMEOUT", 30.0),
+    )
+    app.extensions["write_queue"] = write_queue
+    return write_queue
+
+
+def run_write(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Runs a database write through the app's write queue, or inline when it is disabled.
+
+    Args:
+        fn (Callable): The write to run; it is called as fn(*args, **kwargs).
+
+    Returns:
+        Any: The return value of fn.
+
+    Raises:
+        WriteQueueUnavailable: If the queued write is not committed in time.
+    """
+    write_queue = current_app.extensions.get("write_queue")
+    if write_queue is None:
+        return fn(*args, **kwargs)
+    return write_queue.run(fn, *args, **kwargs)
@@ -1,30 +1,110 @@
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
+from flask import Flask, jsonify, make_response, Response, request, stream_with_context
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 
 from config import ProductionConfig
 
-from RacketTracker.db import db
-from RacketTracker.models.order_model import Orders
+from RacketTracker.db import configure_engine, db
+from RacketTracker.models.order_model import ORDER_FILTERS, Orders, SEARCH_DEFAULT_LIMIT
 from RacketTracker.models.user_model import Users
+from RacketTracker.utils.admin import admin_required
+from RacketTracker.utils.api_tokens import InvalidToken, bearer_token, get_token_signer, init_api_tokens
+from RacketTracker.utils.cache import TTLCache
+from RacketTracker.utils.json_provider import FastJSONProvider
+from RacketTracker.utils.kdf import MIN_ITERATIONS, PasswordHasher, calibrate
 from RacketTracker.utils.logger import configure_logger
+from RacketTracker.utils.metrics import LatencyTracker
+from RacketTracker.utils.profiling import init_continuous_profiler, init_request_profiling, to_collapsed, to_speedscope
+from RacketTracker.utils.query_monitor import init_query_monitor
+from RacketTracker.utils.request_logging import init_request_logging
+from RacketTracker.utils.request_recorder import init_request_recorder
+from RacketTracker.utils.request_metrics import init_request_metrics
+from RacketTracker.utils.sql_utils import configure_pool, get_pool_stats
+from RacketTracker.utils.worker_pool import BoundedWorkerPool, WorkerPoolBusy
+from RacketTracker.utils.write_queue import WriteQueueUnavailable, init_write_queue, run_write
 from datetime import date
 import datetime
 from werkzeug.routing import BaseConverter
 from pydantic import ValidationError
 import logging
+import os
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 load_dotenv()
 
-def json_serial(obj):
-    """JSON serializer for objects not serializable by default json code"""
+# Rows fetched per query when streaming orders without an explicit limit.
+STREAM_CHUNK_SIZE = 1000
 
-    if isinstance(obj, date):
-        return obj.strftime('%Y%m%d')
-    raise TypeError ("Type %s not serializable" % type(obj))
+def parse_int_arg(name: str) -> Optional[int]:
+    """Reads an optional integer query parameter from the current request.
+
+    Raises:
+        ValueError: If the parameter is present but is not an integer.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer.")
+
+def parse_bool_arg(name: str) -> Optional[bool]:
+    """Reads an optional 'true'/'false' query parameter from the current request.
+
+    Raises:
+        ValueError: If the parameter is present but is not 'true' or 'false'.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return None
+    if value.lower() not in ("true", "false"):
+        raise ValueError(f"{name} must be either true or false.")
+    return value.lower() == "true"
+
+def parse_date_arg(name: str) -> Optional[date]:
+    """Reads an optional YYYYMMDD date query parameter from the current request.
+
+    Raises:
+        ValueError: If the parameter is present but is not a YYYYMMDD date.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return datetime.datetime.strptime(value, "%Y%m%d").date()
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYYMMDD format.")
+
+def parse_order_filter(data: dict) -> Optional[dict]:
+    """Converts the "filter" object of a JSON body into Orders filter arguments.
+
+    The date bounds arrive as YYYYMMDD strings; every other value is passed through
+    for the model to validate.
+
+    Raises:
+        ValueError: If the filter is not an object, names an unknown filter or has a
+            malformed date bound.
+    """
+    filters = data.get("filter")
+    if filters is None:
+        return None
+    if not isinstance(filters, dict):
+        raise ValueError("filter must be an object.")
+    unknown = sorted(set(filters) - set(ORDER_FILTERS))
+    if unknown:
+        raise ValueError(f"Unknown filter(s): {', '.join(unknown)}.")
+    filters = dict(filters)
+    for name in ("date_from", "date_to"):
+        if isinstance(filters.get(name), str):
+            try:
+                filters[name] = datetime.datetime.strptime(filters[name], "%Y%m%d").date()
+            except ValueError:
+                raise ValueError(f"{name} must be a date in YYYYMMDD format.")
+    return filters
 
 class DateConverter(BaseConverter):
     """Extracts a ISO8601 date from the path and validates it."""
@@ -52,20 +132,78 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     app.config.from_object(config_class)
     app.url_map.converters['date'] = DateConverter
+    # Encode responses with orjson when it is installed; dates go out as YYYYMMDD
+    app.json = FastJSONProvider(app)
 
     # Initialize database
     db.init_app(app)
+    configure_engine(app)
+    # The raw sqlite3 helpers open their connections with the same PRAGMAs
+    configure_pool(app.config.get("SQLITE_PRAGMAS", {}))
     with app.app_context():
         db.create_all()
+        Orders.ensure_indexes()
+
+    # Optionally serialize writes through a single group-committing writer
+    init_write_queue(app)
+
+    # Request IDs and one JSON access log line per request
+    init_request_logging(app)
+    metrics = init_request_metrics(app)
+    metrics.describe("user_cache_hits_total", "counter", "Session user lookups served from the cache.")
+    metrics.describe("user_cache_misses_total", "counter", "Session user lookups that went to the database.")
+    metrics.describe("user_cache_hit_ratio", "gauge", "Share of session user lookups served from the cache.")
+    metrics.describe("user_cache_entries", "gauge", "Session users currently cached.")
+    metrics.describe("login_latency_seconds", "summary", "Password verification latency over recent logins.")
+    metrics.describe("db_pool_connections", "gauge", "SQLAlchemy engine pool connections, by state.")
+    metrics.describe("sqlite_helper_pool_connections", "gauge", "Raw sqlite3 helper pool connections, by state.")
+    metrics.describe("write_queue_batches_total", "counter", "Group commits made by the write queue.")
+    metrics.describe("write_queue_jobs_total", "counter", "Writes committed through the write queue.")
+
+    # Log slow statements with their query plans and flag N+1 access patterns
+    query_monitor = init_query_monitor(app)
+    # Optionally record request traces for replay by the load generator
+    init_request_recorder(app)
+    # Optionally sample request threads continuously to find hot paths under real traffic
+    profiler = init_continuous_profiler(app)
 
     # Initialize login manager
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = 'login'
 
+    # Cache session users so authenticated requests skip the users lookup
+    Users.session_cache = TTLCache(
+        max_size=app.config.get("USER_CACHE_SIZE", 1024),
+        ttl=app.config.get("USER_CACHE_TTL", 60),
+    )
+    Users.session_cache_refresh = app.config.get("USER_CACHE_INVALIDATION_REFRESH", 5)
+
+    # Verify passwords on a bounded pool of hashing threads
+    Users.password_pool = BoundedWorkerPool(
+        max_workers=app.config.get("PASSWORD_HASH_WORKERS"),
+        max_pending=app.config.get("PASSWORD_HASH_MAX_PENDING", 64),
+        timeout=app.config.get("PASSWORD_HASH_TIMEOUT", 5.0),
+        name="password-hash",
+    )
+    # Hash new passwords at a cost calibrated to this host unless one is configured.
+    # A pinned cost upgrades every cheaper hash; a calibrated one allows for measurement noise.
+    pinned_iterations = app.config.get("PASSWORD_KDF_ITERATIONS")
+    Users.password_hasher = PasswordHasher(
+        pinned_iterations or calibrate(
+            app.config.get("PASSWORD_KDF_TARGET_MS", 100),
+            min_iterations=app.config.get("PASSWORD_KDF_MIN_ITERATIONS", MIN_ITERATIONS),
+        ),
+        rehash_tolerance=0.0 if pinned_iterations else app.config.get("PASSWORD_KDF_REHASH_TOLERANCE", 0.2),
+    )
+    login_latency = LatencyTracker()
+
     @login_manager.user_loader
     def load_user(user_id):
-        return Users.query.filter_by(username=user_id).first()
+        return Users.load_session_user(user_id)
+
+    # Let machine clients authenticate with signed bearer tokens instead of a session
+    init_api_tokens(app, login_manager)
 
     @login_manager.unauthorized_handler
     def unauthorized():
@@ -90,6 +228,147 @@ def create_app(config_class=ProductionConfig) -> Flask:
             'message': 'Service is running'
         }), 200)
 
+    @app.route('/api/stats', methods=['GET'])
+    def stats() -> Response:
+        """Report in-process cache statistics.
+
+        Returns:
+            JSON response with the size, hits, misses and hit rate of the user cache,
+            and p50/p99 login latency.
+
+        """
+        return make_response(jsonify({
+            'status': 'success',
+            'user_cache': Users.session_cache.stats(),
+            'login_latency': login_latency.summary()
+        }), 200)
+
+    @app.route('/api/metrics', methods=['GET'])
+    def prometheus_metrics() -> Response:
+        """Expose request, database, cache and pool metrics for Prometheus.
+
+        Returns:
+            Plain-text response in the Prometheus exposition format.
+
+        """
+        cache = Users.session_cache.stats()
+        latency = login_latency.summary()
+        gauges = [
+            ("user_cache_hits_total", (), cache["hits"]),
+            ("user_cache_misses_total", (), cache["misses"]),
+            ("user_cache_hit_ratio", (), cache["hit_rate"]),
+            ("user_cache_entries", (), cache["size"]),
+            ("login_latency_seconds", (("quantile", "0.5"),), latency["p50_ms"] / 1000 if latency["p50_ms"] is not None else None),
+            ("login_latency_seconds", (("quantile", "0.99"),), latency["p99_ms"] / 1000 if latency["p99_ms"] is not None else None),
+            ("login_latency_seconds_count", (), latency["count"]),
+        ]
+
+        pool = db.engine.pool
+        if hasattr(pool, "checkedout"):
+            gauges += [
+                ("db_pool_connections", (("state", "checked_out"),), pool.checkedout()),
+                ("db_pool_connections", (("state", "idle"),), pool.checkedin()),
+                ("db_pool_connections", (("state", "pool_size"),), pool.size()),
+            ]
+        helper_pool = get_pool_stats()
+        if helper_pool is not None:
+            gauges += [
+                ("sqlite_helper_pool_connections", (("state", "opened"),), helper_pool["opened"]),
+                ("sqlite_helper_pool_connections", (("state", "idle"),), helper_pool["idle"]),
+                ("sqlite_helper_pool_connections", (("state", "max"),), helper_pool["max_size"]),
+            ]
+        write_queue = app.extensions.get("write_queue")
+        if write_queue is not None:
+            gauges += [
+                ("write_queue_batches_total", (), write_queue.batches),
+                ("write_queue_jobs_total", (), write_queue.jobs),
+            ]
+
+        response = make_response(metrics.render(gauges), 200)
+        response.mimetype = "text/plain"
+        response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+        return response
+
+    @app.route('/api/admin/queries', methods=['GET', 'DELETE'])
+    @admin_required
+    def admin_queries() -> Response:
+        """Report slow SQL statements and requests that repeat one statement many times.
+
+        DELETE clears the recorded findings.
+
+        Returns:
+            JSON response with the thresholds, the slow statements (parameter types and
+            query plan) and the repeated-statement findings, oldest first.
+
+        """
+        if query_monitor is None:
+            return make_response(jsonify({
+                'status': 'error',
+                'message': 'Query monitoring is disabled'
+            }), 404)
+        if request.method == 'DELETE':
+            query_monitor.clear()
+            app.logger.info("Cleared query monitor findings")
+            return make_response(jsonify({
+                'status': 'success',
+                'message': 'Query monitor findings cleared'
+            }), 200)
+        return make_response(jsonify({
+            'status': 'success',
+            **query_monitor.report()
+        }), 200)
+
+    @app.route('/api/admin/profile', methods=['GET'])
+    @admin_required
+    def admin_profile() -> Response:
+        """Return the stacks sampled by the continuous profiler.
+
+        Query Parameters:
+            - seconds (int, optional): Only include roughly the last this many seconds.
+            - format (str, optional): "collapsed" (default), "speedscope" or "json".
+
+        Returns:
+            Collapsed stacks as plain text, a speedscope document, or JSON with the
+            profiler statistics and the busiest stacks.
+
+        """
+        if profiler is None:
+            return make_response(jsonify({
+                'status': 'error',
+                'message': 'The continuous profiler is disabled'
+            }), 404)
+        try:
+            seconds = parse_int_arg('seconds')
+            output = request.args.get('format', 'collapsed')
+            if output not in ('collapsed', 'speedscope', 'json'):
+                raise ValueError("format must be one of collapsed, speedscope or json")
+        except ValueError as e:
+            return make_response(jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400)
+
+        stacks = profiler.snapshot(seconds)
+        if output == 'collapsed':
+            response = make_response(to_collapsed(stacks), 200)
+            response.mimetype = "text/plain"
+            return response
+        if output == 'speedscope':
+            return make_response(jsonify(to_speedscope(stacks, "continuous", profiler.interval)), 200)
+        return make_response(jsonify({
+            'status': 'success',
+            **profiler.stats(),
+            'stacks': [{'stack': list(stack), 'samples': count} for stack, count in stacks.most_common(100) if stack]
+        }), 200)
+
+    def write_queue_unavailable(e: WriteQueueUnavailable) -> Response:
+        """The 503 sent when a write is not committed by the write queue in time."""
+        app.logger.error("Write rejected, write queue unavailable: %s", e)
+        return make_response(jsonify({
+            "status": "error",
+            "message": "The database is busy, try again shortly"
+        }), 503)
+
     ##########################################################
     #
     # User Management
@@ -110,6 +389,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
         Raises:
             400 error if the username or password is missing.
             500 error if there is an issue creating the user in the database.
+            503 error if the password pool is busy or the write queue does not commit the change in time.
         """
         try:
             data = request.get_json()
@@ -122,7 +402,8 @@ def create_app(config_class=ProductionConfig) -> Flask:
                     "message": "Username and password are required"
                 }), 400)
 
-            Users.create_user(username, password)
+            # Hash before queueing so the writer thread only stores the result.
+            run_write(Users.add_user, username, *Users.hash_password(password))
             return make_response(jsonify({
                 "status": "success",
                 "message": f"User '{username}' created successfully"
@@ -133,8 +414,16 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 "status": "error",
                 "message": str(e)
             }), 400)
+        except WorkerPoolBusy as e:
+            app.logger.warning("User creation rejected, password pool busy: %s", e)
+            return make_response(jsonify({
+                "status": "error",
+                "message": "Too many password operations in progress, try again shortly"
+            }), 503)
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
         except Exception as e:
-            app.logger.error(f"User creation failed: {e}")
+            app.logger.error("User creation failed: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "An internal error occurred while creating user",
@@ -154,6 +443,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
         Raises:
             401 error if the username or password is incorrect.
+            503 error if too many logins are already being verified.
         """
         try:
             data = request.get_json()
@@ -166,8 +456,9 @@ def create_app(config_class=ProductionConfig) -> Flask:
                     "message": "Username and password are required"
                 }), 400)
 
-            if Users.check_password(username, password):
-                user = Users.query.filter_by(username=username).first()
+            with login_latency.time():
+                user = Users.authenticate(username, password)
+            if user is not None:
                 login_user(user)
                 return make_response(jsonify({
                     "status": "success",
@@ -184,8 +475,14 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 "status": "error",
                 "message": str(e)
             }), 401)
+        except WorkerPoolBusy as e:
+            app.logger.warning("Login rejected, password pool busy: %s", e)
+            return make_response(jsonify({
+                "status": "error",
+                "message": "Too many login attempts in progress, try again shortly"
+            }), 503)
         except Exception as e:
-            app.logger.error(f"Login failed: {e}")
+            app.logger.error("Login failed: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "An internal error occurred during login",
@@ -207,6 +504,132 @@ def create_app(config_class=ProductionConfig) -> Flask:
             "message": "User logged out successfully"
         }), 200)
 
+    @app.route('/api/tokens', methods=['POST'])
+    def create_api_token() -> Response:
+        """Issue a signed API token for machine clients.
+
+        Requests that send ``Authorization: Bearer <token>`` are authenticated from the
+        token alone, without a session cookie or a database lookup.
+
+        Expected JSON Input:
+            - username (str): The username of the user.
+            - password (str): The password of the user.
+
+        Returns:
+            JSON response with the token and its expiry (Unix timestamp).
+
+        Raises:
+            400 error if the username or password is missing.
+            401 error if the username or password is incorrect.
+            503 error if API tokens are not configured or the password pool is busy.
+        """
+        try:
+            signer = get_token_signer()
+            if signer is None:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "API tokens are not configured"
+                }), 503)
+
+            data = request.get_json()
+            username = data.get("username")
+            password = data.get("password")
+
+            if not username or not password:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Username and password are required"
+                }), 400)
+
+            with login_latency.time():
+                user = Users.authenticate(username, password)
+            if user is None:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Invalid username or password"
+                }), 401)
+
+            token, expires_at = signer.issue(user.id, user.username)
+            return make_response(jsonify({
+                "status": "success",
+                "token": token,
+                "token_type": "Bearer",
+                "expires_at": expires_at
+            }), 201)
+
+        except ValueError as e:
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 401)
+        except WorkerPoolBusy as e:
+            app.logger.warning("Token request rejected, password pool busy: %s", e)
+            return make_response(jsonify({
+                "status": "error",
+                "message": "Too many login attempts in progress, try again shortly"
+            }), 503)
+        except Exception as e:
+            app.logger.error("Token creation failed: %s", e)
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while creating the token",
+                "details": str(e)
+            }), 500)
+
+    @app.route('/api/tokens/revoke', methods=['POST'])
+    @login_required
+    def revoke_api_token() -> Response:
+        """Revoke an API token of the current user.
+
+        Expected JSON Input:
+            - token (str, optional): The token to revoke. Defaults to the bearer token
+              the request was authenticated with.
+
+        Returns:
+            JSON response indicating the success of the revocation.
+
+        Raises:
+            400 error if no token is given or it is not a valid token of the current user.
+            500 error if the revocation could not be stored.
+            503 error if API tokens are not configured.
+        """
+        signer = get_token_signer()
+        if signer is None:
+            return make_response(jsonify({
+                "status": "error",
+                "message": "API tokens are not configured"
+            }), 503)
+
+        data = request.get_json(silent=True) or {}
+        token = data.get("token") or bearer_token()
+        if not token:
+            return make_response(jsonify({
+                "status": "error",
+                "message": "Token is required"
+            }), 400)
+
+        try:
+            claims = signer.verify(token)
+            if claims["sub"] != current_user.username:
+                raise InvalidToken("API token belongs to another user")
+            signer.revoke(token)
+        except InvalidToken as e:
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+        except Exception as e:
+            app.logger.error("API token revocation failed: %s", e)
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while revoking the token"
+            }), 500)
+
+        return make_response(jsonify({
+            "status": "success",
+            "message": "API token revoked"
+        }), 200)
+
     @app.route('/api/change-password', methods=['POST'])
     @login_required
     def change_password() -> Response:
@@ -221,6 +644,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
         Raises:
             400 error if the new password is not provided.
             500 error if there is an issue updating the password in the database.
+            503 error if the password pool is busy or the write queue does not commit the change in time.
         """
         try:
             data = request.get_json()
@@ -233,7 +657,10 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 }), 400)
 
             username = current_user.username
-            Users.update_password(username, new_password)
+            run_write(Users.set_password_hash, username, *Users.hash_password(new_password))
+            signer = get_token_signer()
+            if signer is not None:
+                signer.revocations.revoke_user(username)
             return make_response(jsonify({
                 "status": "success",
                 "message": "Password changed successfully"
@@ -244,8 +671,16 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 "status": "error",
                 "message": str(e)
             }), 400)
+        except WorkerPoolBusy as e:
+            app.logger.warning("Password change rejected, password pool busy: %s", e)
+            return make_response(jsonify({
+                "status": "error",
+                "message": "Too many password operations in progress, try again shortly"
+            }), 503)
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
         except Exception as e:
-            app.logger.error(f"Password change failed: {e}")
+            app.logger.error("Password change failed: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "An internal error occurred while changing password",
@@ -261,20 +696,24 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
         Raises:
             500 error if there is an issue recreating the Users table.
+            503 error if the write queue does not commit the reset in time.
         """
         try:
             app.logger.info("Received request to recreate Users table")
-            with app.app_context():
-                Users.__table__.drop(db.engine)
-                Users.__table__.create(db.engine)
+            run_write(Users.recreate_table)
+            signer = get_token_signer()
+            if signer is not None:
+                signer.revocations.revoke_all()
             app.logger.info("Users table recreated successfully")
             return make_response(jsonify({
                 "status": "success",
                 "message": f"Users table recreated successfully"
             }), 200)
 
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
         except Exception as e:
-            app.logger.error(f"Users table recreation failed: {e}")
+            app.logger.error("Users table recreation failed: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "An internal error occurred while deleting users",
@@ -296,20 +735,21 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
         Raises:
             500 error if there is an issue recreating the orders table.
+            503 error if the write queue does not commit the reset in time.
         """
         try:
             app.logger.info("Received request to recreate orders table")
-            with app.app_context():
-                Orders.__table__.drop(db.engine)
-                Orders.__table__.create(db.engine)
+            run_write(Orders.recreate_table)
             app.logger.info("Orders table recreated successfully")
             return make_response(jsonify({
                 "status": "success",
                 "message": f"Orders table recreated successfully"
             }), 200)
 
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
         except Exception as e:
-            app.logger.error(f"Orders table recreation failed: {e}")
+            app.logger.error("Orders table recreation failed: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "An internal error occurred while deleting orders",
@@ -339,6 +779,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
         Raises:
             400 error if input validation fails.
             500 error if there is an issue adding the order to the plan.
+            503 error if the write queue does not commit the change in time.
 
         """
         app.logger.info("Received request to add a new order")
@@ -350,7 +791,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             missing_fields = [field for field in required_fields if field not in data]
 
             if missing_fields:
-                app.logger.warning(f"Missing required fields: {missing_fields}")
+                app.logger.warning("Missing required fields: %s", missing_fields)
                 return make_response(jsonify({
                     "status": "error",
                     "message": f"Missing required fields: {', '.join(missing_fields)}"
@@ -449,17 +890,19 @@ def create_app(config_class=ProductionConfig) -> Flask:
             
             paid_status = "paid" if paid else "unpaid"
 
-            app.logger.info(f"Adding order: {customer} - {racket}: {order_date} - {paid_status}")
-            Orders.create_order(customer=customer, order_date=order_date, racket=racket, mains_tension=mains_tension, mains_string=mains_string, crosses_tension=crosses_tension, crosses_string=crosses_string, replacement_grip=replacement_grip, paid=paid)
+            app.logger.info("Adding order: %s - %s: %s - %s", customer, racket, order_date, paid_status)
+            run_write(Orders.create_order, customer=customer, order_date=order_date, racket=racket, mains_tension=mains_tension, mains_string=mains_string, crosses_tension=crosses_tension, crosses_string=crosses_string, replacement_grip=replacement_grip, paid=paid)
 
-            app.logger.info(f"Order added successfully: {customer} - {racket}: {order_date} - {paid_status}")
+            app.logger.info("Order added successfully: %s - %s: %s - %s", customer, racket, order_date, paid_status)
             return make_response(jsonify({
                 "status": "success",
                 "message": f"Order: '{customer} - {racket}: {order_date} - {paid_status}' added successfully"
             }), 201)
 
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
         except Exception as e:
-            app.logger.error(f"Failed to add order: {e}")
+            app.logger.error("Failed to add order: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "An internal error occurred while adding the order",
@@ -467,6 +910,137 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 500)
 
 
+    @app.route('/api/orders/bulk', methods=['POST'])
+    @login_required
+    def add_orders_bulk() -> Response:
+        """Route to create many orders in one request and one transaction.
+
+        Expected JSON Input:
+            - orders (list): Orders with the same fields as /api/create-order.
+            - all_or_nothing (bool, optional): Create nothing if any order is invalid.
+
+        Returns:
+            JSON response with the IDs of the created orders and the per-item errors.
+            201 if every order was created, 207 if only some were.
+
+        Raises:
+            400 error if the payload is invalid or no order could be created.
+            500 error if there is an issue adding the orders to the database.
+            503 error if the write queue does not commit the change in time.
+        """
+        app.logger.info("Received request to add orders in bulk")
+
+        try:
+            data = request.get_json()
+            orders = data.get("orders")
+            all_or_nothing = data.get("all_or_nothing", False)
+
+            if not isinstance(orders, list) or not orders:
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "orders must be a non-empty list"
+                }), 400)
+            if not isinstance(all_or_nothing, bool):
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "Invalid input types: all_or_nothing should be a bool"
+                }), 400)
+
+            for item in orders:
+                # Leave unparseable dates in place; model validation reports them per item.
+                if isinstance(item, dict) and isinstance(item.get("order_date"), str):
+                    try:
+                        item["order_date"] = datetime.datetime.strptime(item["order_date"], "%Y%m%d").date()
+                    except ValueError:
+                        pass
+
+            order_ids, errors = run_write(Orders.create_orders_bulk, orders, all_or_nothing=all_or_nothing)
+
+            if not order_ids:
+                app.logger.warning("No orders created in bulk: %s invalid", len(errors))
+                return make_response(jsonify({
+                    "status": "error",
+                    "message": "No orders were created",
+                    "errors": errors
+                }), 400)
+
+            app.logger.info("Created %s orders in bulk, %s rejected", len(order_ids), len(errors))
+            return make_response(jsonify({
+                "status": "success",
+                "message": f"{len(order_ids)} of {len(orders)} orders added successfully",
+                "order_ids": order_ids,
+                "errors": errors
+            }), 207 if errors else 201)
+
+        except ValueError as e:
+            app.logger.warning("Bulk order creation failed: %s", e)
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
+        except Exception as e:
+            app.logger.error("Failed to add orders in bulk: %s", e)
+            return make_response(jsonify({
+                "status": "error",
+                "message": "An internal error occurred while adding the orders",
+                "details": str(e)
+            }), 500)
+
+
+    @app.route('/api/orders/bulk/<string:action>', methods=['POST'])
+    @login_required
+    def update_orders_bulk(action: str) -> Response:
+        """Route to change the status of many orders at once.
+
+        Path Parameter:
+            - action (str): 'mark-completed', 'mark-paid' or 'assign-stringer'.
+
+        Expected JSON Input:
+            - order_ids (list[int], optional): The IDs of the orders to update.
+            - filter (dict, optional): Search filters selecting the orders instead
+              (customer, stringer, racket, string, paid, completed, date_from, date_to).
+            - stringer (str): The stringer to assign, for 'assign-stringer'.
+
+        Returns:
+            JSON response listing the changed, unchanged and missing order IDs.
+
+        Raises:
+            400 error for an unknown action or invalid IDs, filter or stringer.
+            500 error for database issues.
+            503 error if the write queue does not commit the change in time.
+        """
+        try:
+            app.logger.info("Received request to %s orders in bulk", action)
+            data = request.get_json()
+            order_ids = data.get("order_ids")
+            filters = parse_order_filter(data)
+
+            if action == "mark-completed":
+                result = run_write(Orders.mark_completed_bulk, order_ids=order_ids, filters=filters)
+            elif action == "mark-paid":
+                result = run_write(Orders.mark_paid_bulk, order_ids=order_ids, filters=filters)
+            elif action == "assign-stringer":
+                result = run_write(Orders.assign_stringer_bulk, data.get("stringer"), order_ids=order_ids, filters=filters)
+            else:
+                raise ValueError(f"Unknown bulk action: {action}")
+
+            app.logger.info("Bulk %s: %s changed, %s unchanged", action, len(result['changed']), len(result['unchanged']))
+            return make_response(jsonify({
+                "status": "success",
+                **result
+            }), 200)
+        except ValueError as e:
+            app.logger.warning("Bulk %s failed: %s", action, e)
+            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
+        except Exception as e:
+            app.logger.error("Internal error during bulk %s: %s", action, e)
+            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+
+
     @app.route('/api/delete-order/<int:order_id>', methods=['DELETE'])
     @login_required
     def delete_order(order_id: int) -> Response:
@@ -481,30 +1055,33 @@ def create_app(config_class=ProductionConfig) -> Flask:
         Raises:
             400 error if the order does not exist.
             500 error if there is an issue removing the order from the database.
+            503 error if the write queue does not commit the change in time.
 
         """
         try:
-            app.logger.info(f"Received request to delete order with ID {order_id}")
+            app.logger.info("Received request to delete order with ID %s", order_id)
 
             # Check if the order exists before attempting to delete
             order = Orders.get_order_by_id(order_id)
             if not order:
-                app.logger.warning(f"Order with ID {order_id} not found.")
+                app.logger.warning("Order with ID %s not found.", order_id)
                 return make_response(jsonify({
                     "status": "error",
                     "message": f"Order with ID {order_id} not found"
                 }), 400)
 
-            Orders.delete_order(order_id)
-            app.logger.info(f"Successfully deleted order with ID {order_id}")
+            run_write(Orders.delete_order, order_id)
+            app.logger.info("Successfully deleted order with ID %s", order_id)
 
             return make_response(jsonify({
                 "status": "success",
                 "message": f"Order with ID {order_id} deleted successfully"
             }), 200)
 
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
         except Exception as e:
-            app.logger.error(f"Failed to delete order: {e}")
+            app.logger.error("Failed to delete order: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "An internal error occurred while deleting the order",
@@ -517,29 +1094,61 @@ def create_app(config_class=ProductionConfig) -> Flask:
     def get_all_orders() -> Response:
         """Route to retrieve all orders from the history (non-deleted).
 
+        Query Parameters:
+            - limit (int, optional): Maximum number of orders returned, per page or per stream.
+            - after (int, optional): Return orders with an ID greater than this cursor.
+            - format (str, optional): 'ndjson' to stream the orders as newline-delimited JSON.
+            - chunk_size (int, optional): Orders fetched per query while streaming NDJSON.
+
         Returns:
-            JSON response containing the list of orders.
+            JSON response containing the list of orders and the cursor for the next page,
+            or a streamed NDJSON response.
 
         Raises:
+            400 error if the pagination parameters are invalid.
             500 error if there is an issue retrieving orders from the history.
 
         """
         try:
-            # Extract query parameter for sorting by play count
-            app.logger.info(f"Received request to retrieve all orders from history")
+            app.logger.info("Received request to retrieve all orders from history")
+
+            limit = parse_int_arg("limit")
+            after = parse_int_arg("after")
+
+            stream = request.args.get("format") == "ndjson" or request.accept_mimetypes.best == "application/x-ndjson"
+            if stream:
+                chunk_size = parse_int_arg("chunk_size")
+                chunks = Orders.iter_all_orders(chunk_size=STREAM_CHUNK_SIZE if chunk_size is None else chunk_size,
+                                                after=after, limit=limit)
+
+                def generate():
+                    for chunk in chunks:
+                        yield b"".join(app.json.dumps_bytes(order) + b"\n" for order in chunk)
+
+                app.logger.info("Streaming orders from history as NDJSON")
+                return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
-            orders = Orders.get_all_orders()
+            orders = Orders.get_all_orders(limit=limit, after=after)
 
-            app.logger.info(f"Successfully retrieved {len(orders)} orders from the catalog")
+            app.logger.info("Successfully retrieved %s orders from the catalog", len(orders))
+
+            next_after = orders[-1]["order_id"] if limit is not None and len(orders) == limit else None
 
             return make_response(jsonify({
                 "status": "success",
                 "message": "Orders retrieved successfully",
-                "orders": orders
+                "orders": orders,
+                "next_after": next_after
             }), 200)
 
+        except ValueError as e:
+            app.logger.warning("Invalid pagination parameters: %s", e)
+            return make_response(jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 400)
         except Exception as e:
-            app.logger.error(f"Failed to retrieve orders: {e}")
+            app.logger.error("Failed to retrieve orders: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "An internal error occurred while retrieving orders",
@@ -564,17 +1173,17 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
         """
         try:
-            app.logger.info(f"Received request to retrieve order with ID {order_id}")
+            app.logger.info("Received request to retrieve order with ID %s", order_id)
 
             order = Orders.get_order_by_id(order_id)
             if not order:
-                app.logger.warning(f"Order with ID {order_id} not found.")
+                app.logger.warning("Order with ID %s not found.", order_id)
                 return make_response(jsonify({
                     "status": "error",
                     "message": f"Order with ID {order_id} not found"
                 }), 400)
 
-            app.logger.info(f"Successfully retrieved order {order.order_id} for {order.customer}")
+            app.logger.info("Successfully retrieved order %s for %s", order.order_id, order.customer)
 
             return make_response(jsonify({
                 "status": "success",
@@ -583,13 +1192,106 @@ def create_app(config_class=ProductionConfig) -> Flask:
             }), 200)
 
         except Exception as e:
-            app.logger.error(f"Failed to retrieve order by ID: {e}")
+            app.logger.error("Failed to retrieve order by ID: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "An internal error occurred while retrieving the order",
                 "details": str(e)
             }), 500)
 
+    @app.route('/api/orders/<int:order_id>/status', methods=['GET'])
+    @login_required
+    def get_order_status(order_id: int) -> Response:
+        """Route to retrieve the progress of an order, polled by tablets at the counter.
+
+        Path Parameter:
+            - order_id (int): The ID of the order.
+
+        Query Parameters:
+            - wait (int, optional): Seconds to hold the request open until the status no
+              longer matches If-None-Match. Only the ASGI build (asgi.py) waits; this one
+              answers at once so no request thread is parked on a poll.
+
+        Returns:
+            JSON response with the stringer, completed and paid values and an ETag, or
+            304 if the status still matches the If-None-Match header.
+
+        Raises:
+            400 error if the order does not exist.
+            500 error if there is an issue retrieving the status.
+        """
+        try:
+            status = Orders.get_order_status(order_id)
+            response = make_response(jsonify({
+                "status": "success",
+                "order": status
+            }), 200)
+            response.add_etag()
+            return response.make_conditional(request)
+        except ValueError as e:
+            app.logger.warning("Order status lookup failed: %s", e)
+            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
+        except Exception as e:
+            app.logger.error("Internal error retrieving order status: %s", e)
+            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+
+    @app.route('/api/orders', methods=['GET'])
+    @login_required
+    def search_orders() -> Response:
+        """Route to search orders by any combination of filters.
+
+        Query Parameters:
+            - customer (str, optional): Name of the customer.
+            - stringer (str, optional): Name of the stringer.
+            - racket (str, optional): Name of the racket.
+            - string (str, optional): String used on the mains or the crosses.
+            - paid (str, optional): Either 'true' or 'false'.
+            - completed (str, optional): Either 'true' or 'false'.
+            - date_from (str, optional): Earliest order date, YYYYMMDD (inclusive).
+            - date_to (str, optional): Latest order date, YYYYMMDD (inclusive).
+            - sort (str, optional): 'order_id', '-order_id', 'order_date' or '-order_date'.
+            - limit (int, optional): Page size.
+            - cursor (str, optional): The next_cursor of the previous page.
+
+        Returns:
+            JSON response with one page of matching orders and the cursor for the next page.
+
+        Raises:
+            400 error for invalid filters, sort order or cursor.
+            500 error if there is an issue retrieving the orders.
+        """
+        try:
+            app.logger.info("Request to search orders: %s", request.args.to_dict())
+
+            filters = {name: request.args.get(name) for name in ("customer", "stringer", "racket", "string")}
+            filters.update(
+                paid=parse_bool_arg("paid"),
+                completed=parse_bool_arg("completed"),
+                date_from=parse_date_arg("date_from"),
+                date_to=parse_date_arg("date_to"),
+            )
+            limit = parse_int_arg("limit")
+
+            orders, next_cursor = Orders.search_orders(
+                sort=request.args.get("sort", "order_id"),
+                limit=SEARCH_DEFAULT_LIMIT if limit is None else limit,
+                cursor=request.args.get("cursor"),
+                **filters
+            )
+
+            app.logger.info("Search matched %s order(s)", len(orders))
+            return make_response(jsonify({
+                "status": "success",
+                "orders": orders,
+                "next_cursor": next_cursor
+            }), 200)
+        except ValueError as e:
+            app.logger.warning("Order search failed: %s", e)
+            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
+        except Exception as e:
+            app.logger.error("Internal error searching orders: %s", e)
+            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+
     @app.route('/api/orders/by-customer/<string:customer>', methods=['GET'])
     @login_required
     def get_orders_by_customer(customer: str) -> Response:
@@ -606,20 +1308,20 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error if there is an issue retrieving the orders.
         """
         try:
-            app.logger.info(f"Request to retrieve orders by customer: {customer}")
+            app.logger.info("Request to retrieve orders by customer: %s", customer)
             orders = Orders.get_orders_by_customer(customer)
             return make_response(jsonify({
                 "status": "success",
                 "orders": [g.order_id for g in orders] 
             }), 200)
         except ValueError as e:
-            app.logger.warning(f"Order retrieval failed: {e}")
+            app.logger.warning("Order retrieval failed: %s", e)
             return make_response(jsonify({
                 "status": "error",
                 "message": str(e)
             }), 400)
         except Exception as e:
-            app.logger.error(f"Internal error retrieving orders by customer: {e}")
+            app.logger.error("Internal error retrieving orders by customer: %s", e)
             return make_response(jsonify({
                 "status": "error", 
                 "message": "Internal server error"
@@ -641,7 +1343,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error for unexpected database issues.
         """
         try:
-            app.logger.info(f"Request to retrieve orders by completion status: {completed}")
+            app.logger.info("Request to retrieve orders by completion status: %s", completed)
             status = completed.lower() == 'true'
             orders = Orders.get_orders_by_completed(status)
             return make_response(jsonify({
@@ -649,10 +1351,10 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 "orders": [g.order_id for g in orders]
             }), 200)
         except ValueError as e:
-            app.logger.warning(f"Order retrieval failed: {e}")
+            app.logger.warning("Order retrieval failed: %s", e)
             return make_response(jsonify({"status": "error", "message": str(e)}), 400)
         except Exception as e:
-            app.logger.error(f"Internal error retrieving completed orders: {e}")
+            app.logger.error("Internal error retrieving completed orders: %s", e)
             return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
 
     @app.route('/api/orders/by-date/<string:order_date_string>', methods=['GET'])
@@ -671,7 +1373,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error if database issues occur.
         """
         try:
-            app.logger.info(f"Request to retrieve orders by order date: {order_date_string}")
+            app.logger.info("Request to retrieve orders by order date: %s", order_date_string)
             order_date = datetime.datetime.strptime(order_date_string, "%Y%m%d").date()
             orders = Orders.get_orders_by_order_date(order_date)
             return make_response(jsonify({
@@ -679,10 +1381,133 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 "orders": [g.order_id for g in orders]
             }), 200)
         except ValueError as e:
-            app.logger.warning(f"Order retrieval failed: {e}")
+            app.logger.warning("Order retrieval failed: %s", e)
+            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
+        except Exception as e:
+            app.logger.error("Error retrieving orders by order value: %s", e)
+            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+
+    @app.route('/api/orders', methods=['DELETE'])
+    @login_required
+    def delete_orders() -> Response:
+        """Route to delete every order matching a filter.
+
+        Expected JSON Input:
+            - filter (dict): Search filters selecting the orders (customer, stringer, racket,
+              string, paid, completed, date_from, date_to).
+
+        Returns:
+            JSON response with the number of deleted orders.
+
+        Raises:
+            400 error for an invalid filter or if no order matches it.
+            500 error on DB issues.
+            503 error if the write queue does not commit a chunk of the delete in time.
+        """
+        try:
+            data = request.get_json()
+            filters = parse_order_filter(data)
+            deleted = Orders.delete_orders(filters)
+            app.logger.info("Deleted %s order(s) matching %s.", deleted, filters)
+            return make_response(jsonify({"status": "success", "deleted": deleted}), 200)
+        except ValueError as e:
+            app.logger.warning("Order delete by filter failed: %s", e)
+            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
+        except Exception as e:
+            app.logger.error("Internal error deleting orders by filter: %s", e)
+            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+
+    @app.route('/api/orders/by-customer/<string:customer>', methods=['DELETE'])
+    @login_required
+    def delete_orders_by_customer(customer: str) -> Response:
+        """Route to delete every order of a customer.
+
+        Path Parameter:
+            - customer (str): Name of the customer.
+
+        Returns:
+            JSON response with the number of deleted orders.
+
+        Raises:
+            400 error if no order is found.
+            500 error on DB issues.
+            503 error if the write queue does not commit a chunk of the delete in time.
+        """
+        try:
+            deleted = Orders.delete_order_by_customer(customer)
+            app.logger.info("Deleted %s order(s) with customer %s.", deleted, customer)
+            return make_response(jsonify({"status": "success", "deleted": deleted}), 200)
+        except ValueError as e:
+            app.logger.warning("Order delete failed for customer %s: %s", customer, e)
             return make_response(jsonify({"status": "error", "message": str(e)}), 400)
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
         except Exception as e:
-            app.logger.error(f"Error retrieving orders by order value: {e}")
+            app.logger.error("Internal error deleting orders by customer %s: %s", customer, e)
+            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+
+    @app.route('/api/orders/by-date/<string:order_date_string>', methods=['DELETE'])
+    @login_required
+    def delete_orders_by_order_date(order_date_string: str) -> Response:
+        """Route to delete every order placed on a date.
+
+        Path Parameter:
+            - order_date_string (str): The date, YYYYMMDD.
+
+        Returns:
+            JSON response with the number of deleted orders.
+
+        Raises:
+            400 error for an invalid date or if no order is found.
+            500 error on DB issues.
+            503 error if the write queue does not commit a chunk of the delete in time.
+        """
+        try:
+            order_date = datetime.datetime.strptime(order_date_string, "%Y%m%d").date()
+            deleted = Orders.delete_order_by_order_date(order_date)
+            app.logger.info("Deleted %s order(s) with date %s.", deleted, order_date_string)
+            return make_response(jsonify({"status": "success", "deleted": deleted}), 200)
+        except ValueError as e:
+            app.logger.warning("Order delete failed for date %s: %s", order_date_string, e)
+            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
+        except Exception as e:
+            app.logger.error("Internal error deleting orders by date %s: %s", order_date_string, e)
+            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+
+    @app.route('/api/orders/by-completed/<string:completed>', methods=['DELETE'])
+    @login_required
+    def delete_orders_by_completed(completed: str) -> Response:
+        """Route to delete every order with a completion status.
+
+        Path Parameter:
+            - completed (str): Either 'true' or 'false'.
+
+        Returns:
+            JSON response with the number of deleted orders.
+
+        Raises:
+            400 error for a status other than 'true' or 'false', or if no order is found.
+            500 error on DB issues.
+            503 error if the write queue does not commit a chunk of the delete in time.
+        """
+        try:
+            if completed.lower() not in ('true', 'false'):
+                raise ValueError("completed must be either true or false.")
+            status = completed.lower() == 'true'
+            deleted = Orders.delete_order_by_completed(status)
+            app.logger.info("Deleted %s order(s) with completed status %s.", deleted, status)
+            return make_response(jsonify({"status": "success", "deleted": deleted}), 200)
+        except ValueError as e:
+            app.logger.warning("Delete by completed failed: %s", e)
+            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
+        except Exception as e:
+            app.logger.error("Error deleting orders by completed: %s", e)
             return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
 
     @app.route('/api/update-order/<int:order_id>', methods=['PATCH']) 
@@ -709,6 +1534,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
         Raises:
             400 error for invalid input or if order not found.
             500 error for database issues.
+            503 error if the write queue does not commit the change in time.
         """
         try:
             data = request.get_json()
@@ -717,7 +1543,6 @@ def create_app(config_class=ProductionConfig) -> Flask:
             new_customer = data.get("customer")
             
             new_order_date = data.get('order_date')
-            logger.info(new_order_date)
             new_racket = data.get("racket")
             new_mains_tension = data.get("mains_tension")
             new_mains_string = data.get("mains_string")
@@ -727,25 +1552,24 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
 
             old_fields = [order.customer, order.order_date.strftime('%Y%m%d'), order.racket, order.mains_tension, order.mains_string, order.crosses_tension, order.crosses_string, order.replacement_grip]
-            logger.info(old_fields[1])
             new_fields = [new_customer, new_order_date, new_racket, new_mains_tension, new_mains_string, new_crosses_tension, new_crosses_string, new_replacement_grip]
             updated_fields = []
             fields = []
 
             for i in range(len(old_fields)):
                 if old_fields[i] != new_fields[i]:
-                    logger.info(new_fields[i])
                     updated_fields.append(new_fields[i])
                     fields.append(new_fields[i])
                 else:
                     fields.append(None)
 
-            logger.info(datetime.datetime.strptime(fields[1], '%Y%m%d').date(), type(datetime.datetime.strptime(fields[1], '%Y%m%d').date()))
+            logger.debug("Updating order %s with new values %s", order_id, updated_fields)
 
-            updated_order = Orders.update_order(
+            updated_order = run_write(
+                Orders.update_order,
                 order_id,
                 customer=fields[0],
-                order_date=datetime.datetime.strptime(fields[1], '%Y%m%d').date(),
+                order_date=datetime.datetime.strptime(fields[1], '%Y%m%d').date() if fields[1] is not None else None,
                 racket=fields[2],
                 mains_tension=fields[3],
                 mains_string=fields[4],
@@ -753,7 +1577,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 crosses_string=fields[6],
                 replacement_grip=fields[7],
             )
-            app.logger.info(f"Updated order {order_id} successfully.")
+            app.logger.info("Updated order %s successfully.", order_id)
 
             return make_response(jsonify({
                 "status": "success", 
@@ -761,13 +1585,15 @@ def create_app(config_class=ProductionConfig) -> Flask:
                 "updated_fields": updated_fields
             }), 200)
         except ValueError as e:
-            app.logger.warning(f"Update failed for order {order_id}: {e}")
+            app.logger.warning("Update failed for order %s: %s", order_id, e)
             return make_response(jsonify({
                 "status": "error", 
                 "message": str(e)
             }), 400)
+        except WriteQueueUnavailable as e:
+            return write_queue_unavailable(e)
         except Exception as e:
-            app.logger.error(f"Internal error updating order {order_id}: {e}")
+            app.logger.error("Internal error updating order %s: %s", order_id, e)
             return make_response(jsonify({
                 "status": "error",
                 "message": "Internal server error"
@@ -1144,14 +1970,18 @@ def create_app(config_class=ProductionConfig) -> Flask:
     #             "details": str(e)
     #         }), 500)
 
+    # Opt-in X-Profile header for admins; wraps the views registered above
+    init_request_profiling(app)
+
     return app
 
 if __name__ == '__main__':
+    # Development server only; production runs gunicorn -c gunicorn.conf.py wsgi:app
     app = create_app()
-    app.logger.info("Starting Flask app...")
+    app.logger.info("Starting Flask development server...")
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        app.run(debug=os.getenv("FLASK_DEBUG", "false").lower() == "true", host='0.0.0.0', port=int(os.getenv("PORT", "5000")))
     except Exception as e:
-        app.logger.error(f"Flask app encountered an error: {e}")
+        app.logger.error("Flask app encountered an error: %s", e)
     finally:
         app.logger.info("Flask app has stopped.")
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""ASGI entry point for the async build: ``gunicorn -c gunicorn.conf.py -k uvicorn_worker.UvicornWorker asgi:app``."""
+from app import create_app
+from async_app import create_asgi_app
+
+
+app = create_asgi_app(create_app())
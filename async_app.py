@@ -0,0 +1,418 @@
+"""ASGI build of the API: the read routes run as async handlers on an aiosqlite engine.
+
+Every other path, and anything the async handlers do not cover (NDJSON streaming,
+HEAD, writes), is passed to the Flask app from create_app on a small thread pool, so
+both builds serve the same /api surface with the same sessions, tokens, JSON bodies,
+access log lines and metrics.
+
+The async routes are the ones that are a single query, plus long polling of an order's
+status for the tablets at the counter: ``GET /api/orders/<id>/status?wait=30`` with the
+last ETag in If-None-Match is held open until the order changes (or answers 304 when
+the wait runs out), at the cost of one idle coroutine per tablet instead of a thread.
+
+Usage:
+    gunicorn -c gunicorn.conf.py -k uvicorn_worker.UvicornWorker asgi:app
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+from flask import Flask
+from itsdangerous import BadSignature
+from sqlalchemy import select
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import generate_etag, parse_accept_header, parse_cookie, parse_etags, quote_etag
+from werkzeug.routing import Map, Rule
+
+from RacketTracker.models.order_model import ORDER_STATUS_FIELDS, Orders
+from RacketTracker.models.user_model import SessionUser, Users
+from RacketTracker.utils.api_tokens import InvalidToken
+from RacketTracker.utils.async_db import ChangeFeed, create_async_db_engine
+from RacketTracker.utils.logger import configure_logger
+from RacketTracker.utils.request_logging import REQUEST_ID_HEADER, VALID_REQUEST_ID, access_logger, should_log
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+# Routes served by async handlers, by handler name; the rules are the Flask ones so
+# metrics and access log lines carry the same route labels in both builds.
+ASYNC_ROUTES = {
+    "healthcheck": "/api/health",
+    "get_order_by_id": "/api/get-order-from-history-by-id/<int:order_id>",
+    "get_order_status": "/api/orders/<int:order_id>/status",
+    "get_orders_by_customer": "/api/orders/by-customer/<string:customer>",
+    "get_orders_by_completed": "/api/orders/by-completed/<string:completed>",
+    "get_orders_by_order_date": "/api/orders/by-date/<string:order_date_string>",
+    "get_all_orders": "/api/get-all-orders-from-history",
+}
+
+# Routes anyone may call; every other async route needs a session or an API token.
+PUBLIC_ROUTES = ("healthcheck",)
+
+
+class AsyncRequest:
+    """What an async handler needs to know about the request it serves."""
+    __slots__ = ("scope", "receive", "rule", "args", "query", "headers", "request_id", "start", "db_time", "db_queries")
+
+    def __init__(self, scope: dict, receive, rule: str, args: dict):
+        self.scope = scope
+        self.receive = receive
+        self.rule = rule
+        self.args = args
+        self.query = {name: values[0] for name, values in
+                      parse_qs(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True).items()}
+        self.headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+        incoming = self.headers.get(REQUEST_ID_HEADER.lower(), "")
+        self.request_id = incoming if VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        self.start = time.perf_counter()
+        self.db_time = 0.0
+        self.db_queries = 0
+
+    def int_arg(self, name: str) -> Optional[int]:
+        """Reads an optional integer query parameter, like parse_int_arg in app.py."""
+        value = self.query.get(name)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"{name} must be an integer.")
+
+
+class AsyncAPI:
+    """ASGI application serving the read routes itself and everything else through Flask.
+
+    The aiosqlite engine and the change feed are created on first use, inside the event
+    loop of the worker process that serves the request, so nothing is shared over fork.
+    """
+
+    def __init__(self, flask_app: Flask):
+        """
+        Args:
+            flask_app (Flask): The application from create_app; its config, session
+                signing, API tokens and metrics are shared.
+        """
+        self.flask_app = flask_app
+        config = flask_app.config
+        self.wsgi = WSGIMiddleware(flask_app, workers=int(config.get("ASYNC_WSGI_THREADS", 4)))
+        self.urls = Map([Rule(rule, endpoint=name, methods=["GET"]) for name, rule in ASYNC_ROUTES.items()],
+                        converters=flask_app.url_map.converters).bind("localhost")
+        self.max_wait = float(config.get("LONG_POLL_MAX_SECONDS", 60))
+        self.poll_interval = float(config.get("LONG_POLL_INTERVAL_MS", 250)) / 1000
+        self.session_cookie = config.get("SESSION_COOKIE_NAME", "session")
+        self.session_serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        self.session_max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+        self.log_enabled = config.get("REQUEST_LOG_ENABLED", True)
+        self.log_sample_rate = float(config.get("REQUEST_LOG_GET_SAMPLE_RATE", 1.0))
+        self.log_slow_ms = float(config.get("REQUEST_LOG_SLOW_MS", 500))
+        self.metrics = flask_app.extensions.get("metrics") if config.get("METRICS_ENABLED", True) else None
+        self.engine = None
+        self.feed: Optional[ChangeFeed] = None
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["method"] == "GET" and not self._wants_ndjson(scope):
+            try:
+                name, args = self.urls.match(scope["path"], "GET")
+            except HTTPException:
+                name = None
+            if name is not None:
+                await self._handle(name, args, scope, receive, send)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def close(self) -> None:
+        """Stops the change feed and closes the async engine's connections."""
+        if self.feed is not None:
+            await self.feed.close()
+            self.feed = None
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+
+    @staticmethod
+    def _wants_ndjson(scope: dict) -> bool:
+        """Streamed order exports stay with the Flask route."""
+        if b"format=ndjson" in scope.get("query_string", b""):
+            return True
+        for name, value in scope.get("headers", []):
+            if name.lower() == b"accept":
+                return parse_accept_header(value.decode("latin-1"), MIMEAccept).best == "application/x-ndjson"
+        return False
+
+    async def _handle(self, name: str, args: dict, scope: dict, receive, send) -> None:
+        req = AsyncRequest(scope, receive, ASYNC_ROUTES[name], args)
+        try:
+            if name not in PUBLIC_ROUTES and await self._current_user(req) is None:
+                status, body, headers = self._json(401, {"status": "error", "message": "Authentication required"})
+            else:
+                status, body, headers = await getattr(self, name)(req, **args)
+        except Exception as e:
+            logger.error("Unhandled error in %s: %s", name, e)
+            status, body, headers = self._json(500, {"status": "error", "message": "Internal server error"})
+        headers.append((REQUEST_ID_HEADER.encode(), req.request_id.encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+        self._finish(req, status)
+
+    def _json(self, status: int, payload: dict, headers: Optional[list] = None) -> tuple[int, bytes, list]:
+        """Encodes a body with the Flask app's JSON provider, byte for byte what jsonify sends."""
+        body = self.flask_app.json.dumps_bytes(payload, indent=self.flask_app.debug) + b"\n"
+        return status, body, [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"vary", b"Cookie"),
+            *(headers or []),
+        ]
+
+    def _finish(self, req: AsyncRequest, status: int) -> None:
+        """Writes the access log line and records the request metrics, as the Flask hooks do."""
+        elapsed = time.perf_counter() - req.start
+        if self.log_enabled and access_logger.isEnabledFor(logging.INFO) and should_log("GET", status, elapsed * 1000, self.log_sample_rate, self.log_slow_ms):
+            access_logger.info(json.dumps({
+                "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "request_id": req.request_id,
+                "method": "GET",
+                "route": req.rule,
+                "path": req.scope["path"],
+                "status": status,
+                "duration_ms": round(elapsed * 1000, 3),
+                "db_ms": round(req.db_time * 1000, 3),
+                "db_queries": req.db_queries,
+            }, separators=(",", ":")), extra={"raw": True})
+        if self.metrics is not None:
+            labels = (("route", req.rule), ("method", "GET"))
+            self.metrics.inc("http_requests_total", labels + (("status", status),))
+            if status >= 500:
+                self.metrics.inc("http_request_errors_total", labels)
+            self.metrics.observe("http_request_duration_seconds", labels, elapsed)
+            if req.db_queries:
+                self.metrics.inc("db_queries_total", labels, req.db_queries)
+                self.metrics.inc("db_query_duration_seconds_total", labels, req.db_time)
+
+    async def _fetch(self, req: AsyncRequest, stmt) -> list:
+        """Runs one query on the async engine and returns its rows."""
+        if self.engine is None:
+            self.engine = create_async_db_engine(self.flask_app)
+            self.feed = ChangeFeed(self.engine, self.poll_interval)
+        start = time.perf_counter()
+        try:
+            async with self.engine.connect() as conn:
+                return (await conn.execute(stmt)).all()
+        finally:
+            req.db_time += time.perf_counter() - start
+            req.db_queries += 1
+
+    async def _current_user(self, req: AsyncRequest) -> Optional[SessionUser]:
+        """
+        Resolves the user like Flask-Login does: the session cookie first, then a bearer token.
+        """
+        cookie = parse_cookie(req.headers.get("cookie", "")).get(self.session_cookie)
+        if cookie and self.session_serializer is not None:
+            try:
+                session = self.session_serializer.loads(cookie, max_age=self.session_max_age)
+            except BadSignature:
+                session = {}
+            username = session.get("_user_id")
+            if username:
+                user = Users.session_cache.get(username)
+                if user is None:
+                    rows = await self._fetch(req, select(Users.id, Users.username).where(Users.username == username))
+                    if rows:
+                        user = SessionUser(rows[0].id, rows[0].username)
+                        Users.session_cache.set(username, user)
+                if user is not None:
+                    return user
+
+        signer = self.flask_app.extensions.get("api_tokens")
+        scheme, _, token = req.headers.get("authorization", "").partition(" ")
+        if signer is None or scheme.lower() != "bearer" or not token.strip():
+            return None
+        try:
+            claims = signer.verify(token.strip())
+        except InvalidToken as e:
+            logger.info("Rejected API token: %s", e)
+            return None
+        return SessionUser(claims["uid"], claims["sub"])
+
+    async def _wait_for_change(self, req: AsyncRequest, timeout: float) -> bool:
+        """
+        Waits until the database changes, the timeout passes or the client hangs up.
+
+        Returns:
+            bool: True if the database changed.
+        """
+        changed = asyncio.ensure_future(self.feed.wait(timeout))
+        hung_up = asyncio.ensure_future(self._disconnected(req.receive))
+        done, pending = await asyncio.wait((changed, hung_up), return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        return changed in done and changed.result()
+
+    @staticmethod
+    async def _disconnected(receive) -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    async def healthcheck(self, req: AsyncRequest) -> tuple[int, bytes, list]:
+        """Async version of the /api/health route."""
+        logger.info("Health check endpoint hit")
+        return self._json(200, {
+            "status": "success",
+            "message": "Service is running"
+        })
+
+    async def get_order_by_id(self, req: AsyncRequest, order_id: int) -> tuple[int, bytes, list]:
+        """Async version of the /api/get-order-from-history-by-id route."""
+        try:
+            logger.info("Received request to retrieve order with ID %s", order_id)
+            rows = await self._fetch(req, select(Orders.order_id, Orders.customer).where(Orders.order_id == order_id))
+            if not rows:
+                # The WSGI route reports a missing order through its generic error branch.
+                raise ValueError(f"Order with ID {order_id} not found")
+
+            return self._json(200, {
+                "status": "success",
+                "message": "Order retrieved successfully",
+                "customer": rows[0].customer
+            })
+
+        except Exception as e:
+            logger.error("Failed to retrieve order by ID: %s", e)
+            return self._json(500, {
+                "status": "error",
+                "message": "An internal error occurred while retrieving the order",
+                "details": str(e)
+            })
+
+    async def get_order_status(self, req: AsyncRequest, order_id: int) -> tuple[int, bytes, list]:
+        """
+        Async version of the /api/orders/<id>/status route that honours ``wait``.
+
+        While the current status still matches If-None-Match, the request sleeps until
+        the database changes and then reads the row again, for up to ``wait`` seconds
+        (capped at LONG_POLL_MAX_SECONDS); if nothing changed by then it answers 304.
+        """
+        try:
+            wait = min(max(req.int_arg("wait") or 0, 0), self.max_wait)
+            known = parse_etags(req.headers.get("if-none-match"))
+            deadline = time.monotonic() + wait
+            stmt = select(*[getattr(Orders, field) for field in ORDER_STATUS_FIELDS]).where(Orders.order_id == order_id)
+            while True:
+                rows = await self._fetch(req, stmt)
+                if not rows:
+                    raise ValueError(f"Order with ID {order_id} not found")
+                status, body, headers = self._json(200, {"status": "success", "order": rows[0]._asdict()})
+                etag = generate_etag(body)
+                etag_header = (b"etag", quote_etag(etag).encode())
+                if not known.contains_weak(etag):
+                    return status, body, headers + [etag_header]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not await self._wait_for_change(req, remaining):
+                    return 304, b"", [etag_header, (b"vary", b"Cookie")]
+
+        except ValueError as e:
+            logger.warning("Order status lookup failed: %s", e)
+            return self._json(400, {"status": "error", "message": str(e)})
+        except Exception as e:
+            logger.error("Internal error retrieving order status: %s", e)
+            return self._json(500, {"status": "error", "message": "Internal server error"})
+
+    async def _order_ids(self, req: AsyncRequest, condition, missing: str) -> tuple[int, bytes, list]:
+        """Answers a lookup route with the matching order IDs, or a 400 when there are none."""
+        try:
+            rows = await self._fetch(req, select(Orders.order_id).where(condition))
+            if not rows:
+                raise ValueError(missing)
+            return self._json(200, {
+                "status": "success",
+                "orders": [row.order_id for row in rows]
+            })
+        except ValueError as e:
+            logger.warning("Order retrieval failed: %s", e)
+            return self._json(400, {"status": "error", "message": str(e)})
+
+    async def get_orders_by_customer(self, req: AsyncRequest, customer: str) -> tuple[int, bytes, list]:
+        """Async version of the /api/orders/by-customer route."""
+        logger.info("Request to retrieve orders by customer: %s", customer)
+        return await self._order_ids(req, Orders.customer == customer, f"No orders found for customer '{customer}'")
+
+    async def get_orders_by_completed(self, req: AsyncRequest, completed: str) -> tuple[int, bytes, list]:
+        """Async version of the /api/orders/by-completed route."""
+        logger.info("Request to retrieve orders by completion status: %s", completed)
+        status = completed.lower() == "true"
+        return await self._order_ids(req, Orders.completed == status, f"No orders found with completion status '{status}'")
+
+    async def get_orders_by_order_date(self, req: AsyncRequest, order_date_string: str) -> tuple[int, bytes, list]:
+        """Async version of the /api/orders/by-date route."""
+        logger.info("Request to retrieve orders by order date: %s", order_date_string)
+        try:
+            order_date = datetime.strptime(order_date_string, "%Y%m%d").date()
+        except ValueError as e:
+            logger.warning("Order retrieval failed: %s", e)
+            return self._json(400, {"status": "error", "message": str(e)})
+        return await self._order_ids(req, Orders.order_date == order_date,
+                                     f"No orders found with date '{order_date.strftime('%Y%m%d')}'")
+
+    async def get_all_orders(self, req: AsyncRequest) -> tuple[int, bytes, list]:
+        """Async version of the /api/get-all-orders-from-history route, JSON pages only."""
+        try:
+            logger.info("Received request to retrieve all orders from history")
+            limit = req.int_arg("limit")
+            after = req.int_arg("after")
+            orders = [row._asdict() for row in await self._fetch(req, Orders.page_query(limit=limit, after=after))]
+            next_after = orders[-1]["order_id"] if limit is not None and len(orders) == limit else None
+
+            return self._json(200, {
+                "status": "success",
+                "message": "Orders retrieved successfully",
+                "orders": orders,
+                "next_after": next_after
+            })
+
+        except ValueError as e:
+            logger.warning("Invalid pagination parameters: %s", e)
+            return self._json(400, {
+                "status": "error",
+                "message": str(e)
+            })
+        except Exception as e:
+            logger.error("Failed to retrieve orders: %s", e)
+            return self._json(500, {
+                "status": "error",
+                "message": "An internal error occurred while retrieving orders",
+                "details": str(e)
+            })
+
+
+def create_asgi_app(flask_app: Flask) -> AsyncAPI:
+    """
+    Wraps an application from create_app in the async build.
+
+    Args:
+        flask_app (Flask): The configured Flask application.
+
+    Returns:
+        AsyncAPI: The ASGI application.
+    """
+    return AsyncAPI(flask_app)
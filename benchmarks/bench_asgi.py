@@ -0,0 +1,201 @@
+"""Compares the WSGI build (gunicorn gthread workers) with the ASGI build (gunicorn + uvicorn workers).
+
+Both serve the same seeded database, one after the other, under two workloads:
+
+- lookups: concurrent clients sending the read routes the async build serves itself.
+- tablets: many tablets watching the status of an order while a stringer keeps
+  assigning orders, with lookups running alongside. Against the WSGI build a tablet
+  re-polls every --poll-interval seconds; against the ASGI build it holds a long poll
+  (``?wait=``) open. Reported: how long a tablet takes to see its order change, the
+  requests spent on watching, and the lookup latency meanwhile.
+
+Usage:
+    python -m benchmarks.bench_asgi [--orders 100000] [--concurrency 16] [--seconds 15]
+        [--tablets 100] [--poll-interval 2] [--changes 2] [--workers 1] [--threads 4]
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import requests
+
+from benchmarks.bench_servers import ROOT, wait_until_up
+from benchmarks.common import temp_database
+from benchmarks.loadgen import Request, ensure_user, open_session, run
+from RacketTracker.utils.data_generator import customer_count, populate
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def lookup_mix(rows: int, customers: int, seed: int = 1) -> Iterator[Request]:
+    """Endless read traffic over the routes the async build handles itself."""
+    rng = random.Random(seed)
+
+    def customer() -> str:
+        return f"Customer {min(int(10 * (rng.paretovariate(1.1) - 1)), customers - 1)}"
+
+    while True:
+        roll = rng.random()
+        if roll < 0.4:
+            yield Request("GET /api/orders/by-customer/<customer>", "GET", f"/api/orders/by-customer/{customer()}")
+        elif roll < 0.7:
+            yield Request("GET /api/orders/<id>/status", "GET", f"/api/orders/{rng.randint(1, rows)}/status")
+        elif roll < 0.9:
+            yield Request("GET /api/get-order-from-history-by-id/<id>", "GET",
+                          f"/api/get-order-from-history-by-id/{rng.randint(1, rows)}")
+        else:
+            yield Request("GET /api/get-all-orders-from-history?limit=20", "GET", "/api/get-all-orders-from-history",
+                          query=f"limit=20&after={rng.randint(0, rows)}")
+
+
+def percentiles(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    if not samples:
+        return {f"p{int(q * 100)}_ms": None for q in PERCENTILES}
+    return {f"p{int(q * 100)}_ms": round(samples[min(len(samples) - 1, int(len(samples) * q))] * 1000, 1)
+            for q in PERCENTILES}
+
+
+def watch_tablets(base_url: str, rows: int, tablets: int, long_poll: bool, poll_interval: float,
+                  changes_per_second: float, seconds: float) -> dict:
+    """
+    Runs the tablets and the stringer for the given time.
+
+    Returns:
+        dict: Status requests sent, changes made, and percentiles of the delay between a
+            change being committed and its tablet seeing it.
+    """
+    rng = random.Random(7)
+    watched = rng.sample(range(1, rows + 1), tablets)
+    cookies = open_session(base_url, "bench", "bench", 1).cookies
+    changed_at: dict[int, float] = {}
+    delays: list[float] = []
+    polls = [0] * tablets
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def tablet(index: int) -> None:
+        order_id = watched[index]
+        session = requests.Session()
+        session.cookies.update(cookies)
+        etag = None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            params = {"wait": max(1, int(remaining))} if long_poll else None
+            try:
+                response = session.get(f"{base_url}/api/orders/{order_id}/status", params=params,
+                                       headers={"If-None-Match": etag} if etag else {}, timeout=remaining + 30)
+            except requests.RequestException:
+                continue
+            polls[index] += 1
+            if response.status_code == 200:
+                if etag is not None:
+                    with lock:
+                        committed = changed_at.pop(order_id, None)
+                    if committed is not None:
+                        delays.append(time.monotonic() - committed)
+                etag = response.headers.get("ETag")
+            if not long_poll:
+                time.sleep(poll_interval)
+        session.close()
+
+    def stringer() -> None:
+        session = requests.Session()
+        session.cookies.update(cookies)
+        while time.monotonic() < deadline - 1:
+            order_id = rng.choice(watched)
+            # A name no earlier run used, so every assignment really changes the order.
+            response = session.post(f"{base_url}/api/orders/bulk/assign-stringer",
+                                    json={"order_ids": [order_id], "stringer": f"Stringer {time.time_ns()}"}, timeout=30)
+            if response.status_code == 200 and response.json().get("changed"):
+                with lock:
+                    changed_at.setdefault(order_id, time.monotonic())
+            time.sleep(1 / changes_per_second)
+        session.close()
+
+    threads = [threading.Thread(target=tablet, args=(index,), daemon=True) for index in range(tablets)]
+    threads.append(threading.Thread(target=stringer, daemon=True))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"status_requests": sum(polls), "changes_seen": len(delays), "notify_delay": percentiles(delays)}
+
+
+@contextmanager
+def server(command: list[str], env: dict, port: int) -> Iterator[str]:
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(command, cwd=ROOT, env={**os.environ, **env, "PORT": str(port)},
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(base_url, process)
+        ensure_user(base_url, "bench", "bench")
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+
+def bench(label: str, command: list[str], env: dict, port: int, args: argparse.Namespace, long_poll: bool) -> dict:
+    customers = customer_count(args.orders)
+    with server(command, env, port) as base_url:
+        lookups = run(lookup_mix(args.orders, customers), base_url, "bench", "bench", args.concurrency,
+                      rate=0, duration=args.seconds, limit=None)
+        p99 = max(route["p99_ms"] for route in lookups["routes"].values())
+        print(f"{label:>24} lookups: {lookups['rps']:8.1f} req/s, worst route p99 {p99:7.1f} ms, statuses {lookups['statuses']}")
+
+        results: dict = {}
+        background = threading.Thread(target=lambda: results.update(lookups=run(
+            lookup_mix(args.orders, customers, seed=2), base_url, "bench", "bench", max(1, args.concurrency // 4),
+            rate=args.lookup_rate, duration=args.seconds, limit=None)))
+        background.start()
+        tablets = watch_tablets(base_url, args.orders, args.tablets, long_poll, args.poll_interval, args.changes, args.seconds)
+        background.join()
+        alongside = results["lookups"]
+        p99 = max(route["p99_ms"] for route in alongside["routes"].values())
+        delay = tablets["notify_delay"]
+        print(f"{label:>24} tablets: {tablets['status_requests'] / args.seconds:8.1f} status req/s, "
+              f"{tablets['changes_seen']} changes seen, notify delay p50 {delay['p50_ms']} ms p95 {delay['p95_ms']} ms, "
+              f"lookups alongside p99 {p99:7.1f} ms ({alongside['rps']:.1f} req/s)")
+    return {"lookups": lookups, "tablets": tablets, "lookups_alongside_tablets": alongside}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--tablets", type=int, default=100)
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="seconds between status polls of a WSGI tablet")
+    parser.add_argument("--changes", type=float, default=2.0, help="orders reassigned per second while tablets watch")
+    parser.add_argument("--lookup-rate", type=float, default=20.0, help="lookups per second sent alongside the tablets")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with temp_database() as db_path:
+        populate(db_path, args.orders, users=0)
+        env = {
+            "DATABASE_URL": f"sqlite:///{db_path}",
+            "PASSWORD_KDF_ITERATIONS": "1000",
+            "REQUEST_LOG_ENABLED": "false",
+            "LOG_LEVEL": "WARNING",
+            "WEB_WORKERS": str(args.workers),
+            "WEB_THREADS": str(args.threads),
+        }
+        gunicorn = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"]
+        bench(f"wsgi gthread {args.workers}x{args.threads}", gunicorn + ["wsgi:app"], env, 5103, args, long_poll=False)
+        bench(f"asgi uvicorn {args.workers}", gunicorn + ["asgi:app"],
+              {**env, "WEB_WORKER_CLASS": "uvicorn_worker.UvicornWorker"}, 5104, args, long_poll=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Times serializing a page of orders with the old jsonify path and with FastJSONProvider.
+
+The orders are loaded once from a seeded database, as plain dictionaries (what the
+read routes return), as SQLAlchemy rows and as ORM instances, and each encoder turns
+the whole list into a response body:
+
+- flask default: jsonify through Flask's DefaultJSONProvider, the encoder used before.
+  Dates come out as HTTP dates, and rows and ORM instances are not supported.
+- json_serial: json.dumps with the date fallback the NDJSON export used.
+- fast (orjson) and fast (json): FastJSONProvider with orjson and on its stdlib fallback.
+
+Usage:
+    python -m benchmarks.bench_json [--orders 100000] [--runs 5]
+"""
+import argparse
+import json
+import time
+from datetime import date
+from typing import Any, Callable, Optional
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import select
+
+from benchmarks.common import make_app, quiet_logs, temp_database
+from RacketTracker.db import db
+from RacketTracker.models.order_model import ORDER_FIELDS, Orders
+from RacketTracker.utils import json_provider as json_provider_module
+from RacketTracker.utils.data_generator import populate
+from RacketTracker.utils.json_provider import FastJSONProvider
+
+
+def json_serial(obj: Any) -> Any:
+    """The date fallback app.py passed to json.dumps before FastJSONProvider."""
+    if isinstance(obj, date):
+        return obj.strftime('%Y%m%d')
+    raise TypeError("Type %s not serializable" % type(obj))
+
+
+def best_of(fn: Callable[[], bytes], runs: int) -> Optional[tuple[float, int]]:
+    """Fastest of several runs in seconds and the body size, or None if fn cannot encode the input."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            body = fn()
+        except TypeError:
+            return None
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(body)
+
+
+def encoders(app: Flask) -> dict[str, Callable[[list], bytes]]:
+    default = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    def fast_stdlib(orders: list) -> bytes:
+        backend, json_provider_module.orjson = json_provider_module.orjson, None
+        try:
+            return fast.response(orders).get_data()
+        finally:
+            json_provider_module.orjson = backend
+
+    return {
+        "flask default": lambda orders: default.response(orders).get_data(),
+        "json_serial": lambda orders: json.dumps(orders, default=json_serial, separators=(",", ":")).encode(),
+        f"fast ({fast.backend})": lambda orders: fast.response(orders).get_data(),
+        "fast (json)": fast_stdlib,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with temp_database() as db_path, quiet_logs():
+        populate(db_path, args.orders)
+        app = make_app(db_path)
+        with app.app_context():
+            columns = [getattr(Orders, field) for field in ORDER_FIELDS]
+            rows = db.session.execute(select(*columns).order_by(Orders.order_id)).all()
+            shapes = {
+                "dicts": [row._asdict() for row in rows],
+                "rows": rows,
+                "orm": db.session.execute(select(Orders).order_by(Orders.order_id)).scalars().all(),
+            }
+            print(f"{'encoder':>16} {'input':>6} {'ms':>9} {'orders/s':>12} {'MB':>7}")
+            for name, encode in encoders(app).items():
+                for shape, orders in shapes.items():
+                    result = best_of(lambda: encode(orders), args.runs)
+                    if result is None:
+                        print(f"{name:>16} {shape:>6} {'unsupported':>9}")
+                        continue
+                    seconds, size = result
+                    print(f"{name:>16} {shape:>6} {seconds * 1000:9.1f} {len(orders) / seconds:12.0f} {size / 1e6:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
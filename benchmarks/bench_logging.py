@@ -0,0 +1,102 @@
+"""Measures request throughput with logging off, logging written synchronously, and the queued pipeline.
+
+Log output goes to os.devnull in every mode, so the numbers compare the cost of the logging
+path itself rather than the speed of the terminal. --sink-delay-ms adds a pause to every write
+to model a slow log sink, such as a container runtime pipe under back-pressure.
+
+Usage:
+    python -m benchmarks.bench_logging [--threads 8] [--requests 500] [--sink-delay-ms 0]
+"""
+import argparse
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from benchmarks.common import make_app, run_threads, temp_database
+from RacketTracker.utils import logger as log_pipeline
+
+
+class SlowStream:
+    """File-like wrapper that pauses on every write."""
+
+    def __init__(self, stream, delay: float):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, data: str) -> int:
+        time.sleep(self.delay)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+@contextmanager
+def logging_mode(mode: str, devnull) -> Iterator[None]:
+    root = logging.getLogger()
+    queue_handler = log_pipeline._queue_handler
+    listener_handler = log_pipeline._listener.handlers[0]
+    previous_stream = listener_handler.setStream(devnull)
+    sync_handler = logging.StreamHandler(devnull)
+    sync_handler.setFormatter(log_pipeline.PipelineFormatter(log_pipeline.LOG_FORMAT))
+    sync_handler.addFilter(log_pipeline.RequestIdFilter())
+    if mode == "off":
+        logging.disable(logging.CRITICAL)
+    elif mode == "synchronous":
+        root.removeHandler(queue_handler)
+        root.addHandler(sync_handler)
+    try:
+        yield
+    finally:
+        logging.disable(logging.NOTSET)
+        if mode == "synchronous":
+            root.removeHandler(sync_handler)
+            root.addHandler(queue_handler)
+        log_pipeline._listener.stop()
+        listener_handler.setStream(previous_stream)
+        log_pipeline._listener.start()
+
+
+def bench(app, mode: str, threads: int, requests: int, devnull) -> float:
+    def worker(index: int) -> None:
+        client = app.test_client()
+        client.put("/api/create-user", json={"username": f"bench{index}", "password": "bench"})
+        client.post("/api/login", json={"username": f"bench{index}", "password": "bench"})
+        for n in range(requests):
+            client.get(f"/api/get-order-from-history-by-id/{n % 50 + 1}")
+
+    with logging_mode(mode, devnull):
+        elapsed = run_threads(threads, worker)
+    return threads * requests / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="requests per thread")
+    parser.add_argument("--sink-delay-ms", type=float, default=0, help="pause added to every log write")
+    args = parser.parse_args()
+
+    log_pipeline.configure_logging()
+    with temp_database() as db_path, open(os.devnull, "w") as null_stream:
+        devnull = SlowStream(null_stream, args.sink_delay_ms / 1000) if args.sink_delay_ms else null_stream
+        with logging_mode("off", devnull):
+            app = make_app(db_path, PASSWORD_KDF_ITERATIONS=1000)
+            client = app.test_client()
+            client.put("/api/create-user", json={"username": "seed", "password": "seed"})
+            client.post("/api/login", json={"username": "seed", "password": "seed"})
+            for n in range(50):
+                client.post("/api/create-order", json={
+                    "customer": f"Customer {n}", "order_date": "20250610", "racket": "Wilson Pro Staff",
+                    "mains_tension": 52, "crosses_tension": 52, "mains_string": "Luxilon ALU Power",
+                    "crosses_string": "Luxilon ALU Power", "replacement_grip": "None", "paid": False,
+                })
+        for mode in ("off", "synchronous", "queued"):
+            rate = bench(app, mode, args.threads, args.requests, devnull)
+            print(f"{mode:>12}: {rate:8.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
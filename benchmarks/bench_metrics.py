@@ -0,0 +1,88 @@
+"""Measures the overhead of request metrics on /api/get-all-orders-from-history.
+
+The same requests run against two apps that differ only in METRICS_ENABLED, alternating in
+rounds so drift on the host affects both equally. Access logging is off in both.
+
+Usage:
+    python -m benchmarks.bench_metrics [--orders 500] [--requests 2000] [--rounds 5]
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import make_app, quiet_logs, temp_database
+from RacketTracker.models.order_model import Orders
+from RacketTracker.utils.metrics import MetricsRegistry
+
+
+def logged_in_client(app, orders: int):
+    with app.app_context():
+        Orders.create_orders_bulk([
+            {
+                "customer": f"Customer {n % 50}",
+                "order_date": date(2025, 1, 1) + timedelta(days=n % 365),
+                "racket": "Wilson Pro Staff",
+                "mains_tension": 52,
+                "mains_string": "Luxilon ALU Power",
+            }
+            for n in range(orders)
+        ])
+    client = app.test_client()
+    client.put("/api/create-user", json={"username": "bench", "password": "bench"})
+    client.post("/api/login", json={"username": "bench", "password": "bench"})
+    return client
+
+
+def timed(client, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get("/api/get-all-orders-from-history")
+        assert response.status_code == 200, response.status_code
+    return time.perf_counter() - start
+
+
+def recording_cost(samples: int = 200_000) -> float:
+    """Seconds spent recording one request's metrics, measured without any request noise."""
+    registry = MetricsRegistry()
+    labels = (("route", "/api/get-all-orders-from-history"), ("method", "GET"))
+    status_labels = labels + (("status", 200),)
+    start = time.perf_counter()
+    for n in range(samples):
+        registry.inc("http_requests_total", status_labels)
+        registry.observe("http_request_duration_seconds", labels, 0.017)
+        registry.inc("db_queries_total", labels, 2)
+        registry.inc("db_query_duration_seconds_total", labels, 0.001)
+    return (time.perf_counter() - start) / samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per round and mode")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with quiet_logs(), temp_database() as off_path, temp_database() as on_path:
+        settings = {"REQUEST_LOG_ENABLED": False, "PASSWORD_KDF_ITERATIONS": 1000}
+        clients = {
+            "metrics off": logged_in_client(make_app(off_path, METRICS_ENABLED=False, **settings), args.orders),
+            "metrics on": logged_in_client(make_app(on_path, METRICS_ENABLED=True, **settings), args.orders),
+        }
+        totals = dict.fromkeys(clients, 0.0)
+        for client in clients.values():
+            timed(client, args.requests // 10)  # warm up
+        for _ in range(args.rounds):
+            for mode, client in clients.items():
+                totals[mode] += timed(client, args.requests)
+
+    count = args.requests * args.rounds
+    for mode, total in totals.items():
+        print(f"{mode:>12}: {count / total:8.0f} requests/s, {total / count * 1e6:8.1f} us/request")
+    overhead = totals["metrics on"] / totals["metrics off"] - 1
+    print(f"{'end to end':>12}: {overhead:+.2%} (includes run-to-run noise)")
+    cost = recording_cost()
+    print(f"{'recording':>12}: {cost * 1e6:8.2f} us/request = {cost / (totals['metrics off'] / count):.3%} of request time")
+
+
+if __name__ == "__main__":
+    main()
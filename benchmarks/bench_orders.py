@@ -0,0 +1,204 @@
+"""Times every Orders operation and the order routes against seeded databases of several sizes.
+
+Results are written as JSON tagged with the git commit, so runs on two commits can be
+diffed with --compare.
+
+Usage:
+    python -m benchmarks.bench_orders [--scales 10000 100000 1000000] [--budget 2]
+        [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from benchmarks.common import make_app, quiet_logs, temp_database
+from RacketTracker.db import db
+from RacketTracker.models.order_model import Orders
+from RacketTracker.utils.data_generator import STRINGERS, populate
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def measure(fn: Callable[[int], object], budget: float, max_runs: int = 500, min_runs: int = 3) -> dict:
+    """
+    Calls fn(run_index) until max_runs or the time budget is used up.
+
+    Lookups that find nothing raise ValueError; those runs count like any other.
+
+    Returns:
+        dict: Run count and latency statistics in milliseconds.
+    """
+    samples = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < max_runs and (len(samples) < min_runs or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        try:
+            fn(len(samples))
+        except ValueError:
+            pass
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": len(samples),
+        "mean_ms": round(sum(samples) / len(samples), 4),
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def pickers(rows: int, customers: int, rng: random.Random) -> tuple[Callable[[], str], Callable[[], int]]:
+    """Returns functions picking a customer (skewed like the data, so mostly regulars) and an order ID."""
+    def customer() -> str:
+        return f"Customer {min(int(10 * (rng.paretovariate(1.1) - 1)), customers - 1)}"
+
+    def order_id() -> int:
+        return rng.randint(1, rows)
+
+    return customer, order_id
+
+
+def model_operations(rows: int, customers: int, rng: random.Random) -> dict[str, Callable[[int], object]]:
+    """The Orders classmethods to time, each taking the run index."""
+    new_order = {
+        "customer": "Customer 1", "order_date": date(2025, 6, 30), "racket": "Head Speed MP",
+        "mains_tension": 54, "mains_string": "RPM Blast",
+    }
+    regular, any_id = pickers(rows, customers, rng)
+    return {
+        "create_order": lambda i: Orders.create_order(**new_order),
+        "create_orders_bulk_100": lambda i: Orders.create_orders_bulk([new_order] * 100),
+        "get_order_by_id": lambda i: Orders.get_order_by_id(any_id()),
+        "get_orders_by_customer": lambda i: Orders.get_orders_by_customer(regular()),
+        "get_orders_by_order_date": lambda i: Orders.get_orders_by_order_date(date(2025, 6, 1) - timedelta(days=i % 365)),
+        "get_orders_by_completed_open": lambda i: Orders.get_orders_by_completed(False),
+        "get_orders_by_completed_done": lambda i: Orders.get_orders_by_completed(True),
+        "get_all_orders_page_100": lambda i: Orders.get_all_orders(limit=100, after=any_id()),
+        "get_all_orders_full": lambda i: Orders.get_all_orders(),
+        "search_orders_customer": lambda i: Orders.search_orders(customer=regular(), sort="-order_date", limit=20),
+        "update_order": lambda i: Orders.update_order(any_id(), mains_tension=50 + i % 10),
+        "mark_completed": lambda i: Orders.mark_completed(any_id()),
+        "mark_paid": lambda i: Orders.mark_paid(any_id()),
+        "assign_stringer": lambda i: Orders.assign_stringer(any_id(), rng.choice(STRINGERS)),
+    }
+
+
+def route_operations(client, rows: int, customers: int, rng: random.Random) -> dict[str, Callable[[int], object]]:
+    """The order routes to time through the test client, each taking the run index."""
+    new_order = {
+        "customer": "Customer 1", "order_date": "20250630", "racket": "Head Speed MP", "mains_tension": 54,
+        "crosses_tension": None, "mains_string": "RPM Blast", "crosses_string": None, "replacement_grip": None,
+        "paid": False,
+    }
+    regular, any_id = pickers(rows, customers, rng)
+
+    def check(response):
+        if response.status_code >= 500:
+            raise RuntimeError(f"{response.request.path} returned {response.status_code}")
+        return response
+
+    return {
+        "POST /api/create-order": lambda i: check(client.post("/api/create-order", json=new_order)),
+        "GET /api/get-order-from-history-by-id": lambda i: check(client.get(f"/api/get-order-from-history-by-id/{any_id()}")),
+        "GET /api/orders/by-customer": lambda i: check(client.get(f"/api/orders/by-customer/{regular()}")),
+        "GET /api/orders?customer": lambda i: check(client.get("/api/orders", query_string={"customer": regular(), "limit": 20})),
+        "GET /api/orders/by-completed/false": lambda i: check(client.get("/api/orders/by-completed/false")),
+        "GET /api/get-all-orders-from-history?limit=100": lambda i: check(client.get("/api/get-all-orders-from-history", query_string={"limit": 100, "after": any_id()})),
+        "PATCH /api/update-order": lambda i: check(client.patch(f"/api/update-order/{any_id()}", json={"mains_tension": 50 + i % 10})),
+    }
+
+
+def bench_scale(rows: int, budget: float) -> dict:
+    with temp_database() as db_path:
+        start = time.perf_counter()
+        customers = populate(db_path, rows, today=date(2025, 6, 30))["customers"]
+        seed_seconds = time.perf_counter() - start
+        app = make_app(db_path, PASSWORD_KDF_ITERATIONS=1000, REQUEST_LOG_ENABLED=False, QUERY_MONITOR_ENABLED=False)
+        rng = random.Random(rows)
+        operations = {}
+        with app.app_context():
+            for name, fn in model_operations(rows, customers, rng).items():
+                operations[name] = measure(fn, budget)
+                print(f"  {name:<48} {operations[name]['p50_ms']:10.3f} ms p50  ({operations[name]['runs']} runs)")
+
+        client = app.test_client()
+        client.put("/api/create-user", json={"username": "bench", "password": "bench"})
+        client.post("/api/login", json={"username": "bench", "password": "bench"})
+        for name, fn in route_operations(client, rows, customers, rng).items():
+            operations[name] = measure(fn, budget)
+            print(f"  {name:<48} {operations[name]['p50_ms']:10.3f} ms p50  ({operations[name]['runs']} runs)")
+
+        with app.app_context():
+            db.engine.dispose()
+        return {"seed_seconds": round(seed_seconds, 3), "db_bytes": os.path.getsize(db_path), "operations": operations}
+
+
+def git_revision() -> dict:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True,
+                                  cwd=os.path.dirname(__file__)).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(status) if status is not None else None}
+
+
+def compare(baseline: dict, current: dict) -> None:
+    """Prints the p50 change of every operation present in both runs."""
+    print(f"\np50 change vs {(baseline.get('commit') or 'baseline')[:12]} (negative is faster)")
+    for scale, result in current["scales"].items():
+        before = baseline.get("scales", {}).get(scale, {}).get("operations", {})
+        for name, stats in result["operations"].items():
+            if name in before and before[name]["p50_ms"]:
+                change = (stats["p50_ms"] - before[name]["p50_ms"]) / before[name]["p50_ms"] * 100
+                print(f"  {scale:>8} {name:<48} {before[name]['p50_ms']:10.3f} -> {stats['p50_ms']:10.3f} ms  {change:+6.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds spent timing each operation")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/orders-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    results = {
+        "benchmark": "orders",
+        **revision,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "budget_seconds": args.budget,
+        "scales": {},
+    }
+    # Reassigning stringers and re-marking orders log warnings on every run.
+    logging.getLogger("RacketTracker.models.order_model").setLevel(logging.ERROR)
+    with quiet_logs():
+        for rows in args.scales:
+            print(f"{rows} orders")
+            results["scales"][str(rows)] = bench_scale(rows, args.budget)
+            print(f"  seeded in {results['scales'][str(rows)]['seed_seconds']:.1f} s")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"orders-{(revision['commit'] or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compares throughput of the Flask development server with gunicorn (gunicorn.conf.py).
+
+Both servers run the same app against the same seeded database and get the same
+synthetic busy-Saturday traffic from benchmarks.loadgen.
+
+Usage:
+    python -m benchmarks.bench_servers [--orders 100000] [--concurrency 16] [--seconds 15] [--workers 4] [--threads 4]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+from benchmarks.common import temp_database
+from benchmarks.loadgen import ensure_user, run, saturday_mix
+from RacketTracker.utils.data_generator import customer_count, populate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_until_up(base_url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Server at {base_url} did not come up")
+
+
+def bench(label: str, command: list[str], env: dict, port: int, orders: int, concurrency: int, seconds: float) -> dict:
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(command, cwd=ROOT, env={**os.environ, **env, "PORT": str(port)},
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(base_url, process)
+        ensure_user(base_url, "bench", "bench")
+        report = run(saturday_mix(customer_count(orders)), base_url, "bench", "bench", concurrency,
+                     rate=0, duration=seconds, limit=None)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    latencies = sorted(route["p50_ms"] for route in report["routes"].values())
+    worst_p99 = max(route["p99_ms"] for route in report["routes"].values())
+    print(f"{label:>22}: {report['rps']:8.1f} req/s, median route p50 {latencies[len(latencies) // 2]:7.1f} ms, "
+          f"worst route p99 {worst_p99:7.1f} ms, statuses {report['statuses']}")
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with temp_database() as db_path:
+        populate(db_path, args.orders)
+        env = {
+            "DATABASE_URL": f"sqlite:///{db_path}",
+            "PASSWORD_KDF_ITERATIONS": "1000",
+            "REQUEST_LOG_ENABLED": "false",
+            "LOG_LEVEL": "WARNING",
+        }
+        bench("flask dev server", [sys.executable, "app.py"], env, 5101, args.orders, args.concurrency, args.seconds)
+        bench(f"gunicorn {args.workers}x{args.threads}", [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+              {**env, "WEB_WORKERS": str(args.workers), "WEB_THREADS": str(args.threads)},
+              5102, args.orders, args.concurrency, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compares a mixed read/write load with SQLite's defaults and with the tuned SQLITE_PRAGMAS.
+
+Usage:
+    python -m benchmarks.bench_sqlite_pragmas [--readers 8] [--writers 4] [--seconds 5] [--rows 20000]
+"""
+import argparse
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import make_app, quiet_logs, run_threads, temp_database
+from config import ProductionConfig
+from RacketTracker.models.order_model import Orders
+
+
+def seed(app, rows: int) -> None:
+    with app.app_context():
+        start = date(2025, 1, 1)
+        for offset in range(0, rows, 1000):
+            Orders.create_orders_bulk([
+                {
+                    "customer": f"Customer {n % 500}",
+                    "order_date": start + timedelta(days=n % 365),
+                    "racket": "Wilson Pro Staff",
+                    "mains_tension": 52,
+                    "mains_string": "Luxilon ALU Power",
+                }
+                for n in range(offset, min(offset + 1000, rows))
+            ])
+
+
+def bench(label: str, pragmas: dict, readers: int, writers: int, seconds: float, rows: int) -> dict:
+    with temp_database() as db_path:
+        app = make_app(db_path, SQLITE_PRAGMAS=pragmas)
+        seed(app, rows)
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + seconds
+
+        def worker(index: int) -> None:
+            is_writer = index < writers
+            done = errors = 0
+            with app.app_context():
+                while time.monotonic() < deadline:
+                    try:
+                        if is_writer:
+                            Orders.create_order(
+                                customer=f"Customer {index}",
+                                order_date=date(2025, 6, 1),
+                                racket="Head Speed MP",
+                                mains_tension=54,
+                                mains_string="Head Velocity",
+                            )
+                        else:
+                            Orders.search_orders(customer=f"Customer {done % 500}", sort="-order_date", limit=20)
+                            Orders.get_all_orders(limit=100, after=(done * 97) % rows)
+                        done += 1
+                    except OperationalError:
+                        errors += 1
+            with lock:
+                counts["writes" if is_writer else "reads"] += done
+                counts["errors"] += errors
+
+        elapsed = run_threads(readers + writers, worker)
+        return {
+            "label": label,
+            "reads_per_sec": counts["reads"] / elapsed,
+            "writes_per_sec": counts["writes"] / elapsed,
+            "errors": counts["errors"],
+            "settings": app.extensions.get("sqlite_pragmas", {}),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    with quiet_logs():
+        for label, pragmas in (("defaults", {}), ("tuned", ProductionConfig.SQLITE_PRAGMAS)):
+            result = bench(label, pragmas, args.readers, args.writers, args.seconds, args.rows)
+            print(f"{result['label']:>8}: {result['reads_per_sec']:8.0f} reads/s, "
+                  f"{result['writes_per_sec']:6.0f} writes/s, {result['errors']} lock errors")
+            if result["settings"]:
+                print(" " * 10 + ", ".join(f"{name}={value}" for name, value in result["settings"].items()))
+
+
+if __name__ == "__main__":
+    main()
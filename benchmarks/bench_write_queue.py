@@ -0,0 +1,67 @@
+"""Compares concurrent create-order throughput with and without the write queue.
+
+Usage:
+    python -m benchmarks.bench_write_queue [--threads 16] [--writes 200]
+"""
+import argparse
+import threading
+from datetime import date
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import make_app, quiet_logs, run_threads, temp_database
+from RacketTracker.models.order_model import Orders
+from RacketTracker.utils.write_queue import run_write
+
+
+def bench(enabled: bool, threads: int, writes: int) -> dict:
+    with temp_database() as db_path:
+        app = make_app(db_path, WRITE_QUEUE_ENABLED=enabled)
+        errors = []
+        lock = threading.Lock()
+
+        def worker(index: int) -> None:
+            with app.app_context():
+                for n in range(writes):
+                    try:
+                        run_write(
+                            Orders.create_order,
+                            customer=f"Customer {index}",
+                            order_date=date(2025, 6, 1 + n % 28),
+                            racket="Wilson Pro Staff",
+                            mains_tension=52,
+                            mains_string="Luxilon ALU Power",
+                        )
+                    except OperationalError as e:
+                        with lock:
+                            errors.append(e)
+
+        elapsed = run_threads(threads, worker)
+        write_queue = app.extensions.get("write_queue")
+        committed = threads * writes - len(errors)
+        result = {
+            "mode": "write queue" if enabled else "direct commit",
+            "writes_per_sec": committed / elapsed,
+            "errors": len(errors),
+            "commits": write_queue.batches if write_queue else committed,
+        }
+        if write_queue:
+            write_queue.stop()
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200, help="writes per thread")
+    args = parser.parse_args()
+
+    with quiet_logs():
+        for enabled in (False, True):
+            result = bench(enabled, args.threads, args.writes)
+            print(f"{result['mode']:>14}: {result['writes_per_sec']:8.0f} writes/s, "
+                  f"{result['commits']} commits, {result['errors']} 'database is locked' errors")
+
+
+if __name__ == "__main__":
+    main()
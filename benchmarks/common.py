@@ -0,0 +1,71 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from flask import Flask
+
+from config import ProductionConfig
+
+
+@contextmanager
+def quiet_logs() -> Iterator[None]:
+    """Silences INFO/DEBUG logging so it does not dominate the measurements."""
+    logging.disable(logging.INFO)
+    try:
+        yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+@contextmanager
+def temp_database() -> Iterator[str]:
+    """Yields the path of a scratch SQLite file that is removed afterwards."""
+    with tempfile.TemporaryDirectory(prefix="racket-bench-") as directory:
+        yield os.path.join(directory, "bench.db")
+
+
+def make_app(db_path: str, **settings) -> Flask:
+    """
+    Creates the application against a file-backed SQLite database.
+
+    Args:
+        db_path (str): Path of the SQLite database file.
+        **settings: Extra configuration values overriding ProductionConfig.
+
+    Returns:
+        Flask: The configured application.
+    """
+    from app import create_app
+
+    config = type("BenchConfig", (ProductionConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        **settings,
+    })
+    return create_app(config)
+
+
+def run_threads(threads: int, worker: Callable[[int], None]) -> float:
+    """
+    Runs worker(thread_index) on several threads at once.
+
+    Returns:
+        float: Wall-clock seconds until every thread finished.
+    """
+    barrier = threading.Barrier(threads + 1)
+
+    def target(index: int) -> None:
+        barrier.wait()
+        worker(index)
+
+    pool = [threading.Thread(target=target, args=(index,)) for index in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
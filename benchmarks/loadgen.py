@@ -0,0 +1,304 @@
+"""HTTP load generator: replays recorded traffic or a synthetic busy-Saturday mix against a running server.
+
+Record a trace by starting the server with REQUEST_RECORD_ENABLED=true (requests are
+appended to REQUEST_RECORD_PATH, default requests.jsonl), then replay it. Every worker
+uses its own keep-alive session and logs in with the given credentials; recorded
+credential, token and reset requests are skipped on replay.
+
+Usage:
+    python -m benchmarks.loadgen replay requests.jsonl [--base-url http://localhost:5000]
+        [--concurrency 8] [--rate 0] [--duration 30] [--username load --password load]
+    python -m benchmarks.loadgen saturday [--customers 500] [--concurrency 8] [--rate 50] [--duration 30]
+
+With --rate, requests are started on a fixed schedule and latency is measured from the
+scheduled start, so a stalled server shows up as queueing delay instead of a lower rate.
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from collections import deque
+from datetime import date, timedelta
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Routes replaying would log the workers out, change credentials or wipe data.
+SKIPPED_ROUTES = {
+    "/api/login", "/api/logout", "/api/create-user", "/api/change-password",
+    "/api/tokens", "/api/tokens/revoke", "/api/reset-users", "/api/reset-orders",
+}
+
+STRINGS = ["Luxilon ALU Power", "RPM Blast", "Solinco Hyper-G", "Wilson NXT", "Head Lynx Tour"]
+RACKETS = ["Babolat Pure Aero", "Wilson Pro Staff 97", "Head Speed MP", "Yonex EZONE 98"]
+
+
+class Request:
+    """One request to send, labelled with the route it is reported under."""
+    __slots__ = ("label", "method", "path", "query", "body", "headers")
+
+    def __init__(self, label: str, method: str, path: str, query: str = "", body=None, headers: Optional[dict] = None):
+        self.label = label
+        self.method = method
+        self.path = path
+        self.query = query
+        self.body = body
+        self.headers = headers or {}
+
+
+def load_trace(path: str) -> list[Request]:
+    """
+    Reads a trace written by the request recorder.
+
+    Returns:
+        list[Request]: The replayable requests, in recorded order.
+    """
+    trace = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            route = entry.get("route") or entry["path"]
+            if route in SKIPPED_ROUTES or route.startswith("/api/admin/"):
+                continue
+            headers = {name: value for name, value in entry.get("headers", {}).items() if name != "X-Request-ID"}
+            trace.append(Request(f"{entry['method']} {route}", entry["method"], entry["path"],
+                                 entry.get("query", ""), entry.get("body"), headers))
+    return trace
+
+
+def saturday_mix(customers: int, seed: int = 1) -> Iterator[Request]:
+    """
+    Endless synthetic traffic of a busy Saturday at the shop.
+
+    Half the requests look up a customer's orders (mostly regulars), a quarter create
+    orders, and the rest are status updates: completing, marking paid, or editing an
+    order. Updates target order IDs seen in earlier lookup responses.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+
+    def customer() -> str:
+        return f"Customer {min(int(10 * (rng.paretovariate(1.1) - 1)), customers - 1)}"
+
+    while True:
+        roll = rng.random()
+        if roll < 0.25:
+            yield Request("POST /api/create-order", "POST", "/api/create-order", body={
+                "customer": customer(),
+                "order_date": (today - timedelta(days=rng.randint(0, 2))).strftime("%Y%m%d"),
+                "racket": rng.choice(RACKETS),
+                "mains_tension": rng.randint(48, 60),
+                "mains_string": rng.choice(STRINGS),
+                "crosses_tension": None,
+                "crosses_string": None,
+                "replacement_grip": None,
+                "paid": rng.random() < 0.5,
+            })
+        elif roll < 0.55:
+            yield Request("GET /api/orders/by-customer/<customer>", "GET", f"/api/orders/by-customer/{customer()}")
+        elif roll < 0.75:
+            yield Request("GET /api/orders?customer", "GET", "/api/orders",
+                          query=f"customer={customer().replace(' ', '+')}&sort=-order_date&limit=20")
+        elif roll < 0.85:
+            yield Request("POST /api/orders/bulk/mark-completed", "POST", "/api/orders/bulk/mark-completed",
+                          body={"order_ids": "known"})
+        elif roll < 0.95:
+            yield Request("POST /api/orders/bulk/mark-paid", "POST", "/api/orders/bulk/mark-paid",
+                          body={"order_ids": "known"})
+        else:
+            yield Request("PATCH /api/update-order/<id>", "PATCH", "/api/update-order/known",
+                          body={"mains_tension": rng.randint(48, 60)})
+
+
+class Stats:
+    """Latencies and status counts per route label."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.statuses: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, label: str, seconds: float, status: Optional[int]) -> None:
+        with self._lock:
+            self.latencies.setdefault(label, []).append(seconds)
+            if status is None or status >= 500:
+                self.errors[label] = self.errors.get(label, 0) + 1
+            self.statuses[status or 0] = self.statuses.get(status or 0, 0) + 1
+
+    def report(self, elapsed: float) -> dict:
+        routes = {}
+        for label, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            pick = lambda q: round(samples[min(len(samples) - 1, int(len(samples) * q))] * 1000, 3)
+            routes[label] = {
+                "requests": len(samples),
+                "errors": self.errors.get(label, 0),
+                "rps": round(len(samples) / elapsed, 2),
+                "p50_ms": pick(0.50),
+                "p95_ms": pick(0.95),
+                "p99_ms": pick(0.99),
+                "max_ms": round(samples[-1] * 1000, 3),
+            }
+        total = sum(route["requests"] for route in routes.values())
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "routes": routes,
+        }
+
+
+def open_session(base_url: str, username: str, password: str, pool_size: int) -> requests.Session:
+    """A keep-alive session logged in as the load user."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    response = session.post(f"{base_url}/api/login", json={"username": username, "password": password})
+    if response.status_code != 200:
+        raise SystemExit(f"Login as {username!r} failed with {response.status_code}: {response.text[:200]}")
+    return session
+
+
+def run(requests_iter: Iterator[Request], base_url: str, username: str, password: str, concurrency: int,
+        rate: float, duration: float, limit: Optional[int]) -> dict:
+    """
+    Sends requests from concurrency workers until the duration, the limit or the input runs out.
+
+    Returns:
+        dict: Overall and per-route throughput and latency percentiles.
+    """
+    sessions = [open_session(base_url, username, password, 1) for _ in range(concurrency)]
+    stats = Stats()
+    source_lock = threading.Lock()
+    counter = itertools.count()
+    known_ids: deque = deque(maxlen=1000)
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def next_request() -> Optional[tuple[int, Request]]:
+        with source_lock:
+            index = next(counter)
+            if limit is not None and index >= limit:
+                return None
+            item = next(requests_iter, None)
+            return None if item is None else (index, item)
+
+    def resolve(item: Request) -> Optional[Request]:
+        """Fills in order IDs for synthetic updates from the IDs seen so far; None until there are some."""
+        if not item.path.endswith("/known") and (not isinstance(item.body, dict) or item.body.get("order_ids") != "known"):
+            return item
+        if not known_ids:
+            return None
+        window = list(known_ids)
+        if item.path.endswith("/known"):
+            return Request(item.label, item.method, item.path.replace("known", str(random.choice(window))), body=item.body)
+        return Request(item.label, item.method, item.path, body={"order_ids": random.sample(window, min(3, len(window)))})
+
+    def learn_ids(response: requests.Response) -> None:
+        """Remembers the order IDs of a lookup response: a list of IDs or of order objects."""
+        try:
+            orders = response.json().get("orders") or []
+        except ValueError:
+            return
+        for order in orders[:50]:
+            order_id = order.get("order_id") if isinstance(order, dict) else order
+            if isinstance(order_id, int):
+                known_ids.append(order_id)
+
+    def worker(session: requests.Session) -> None:
+        while time.perf_counter() < deadline:
+            picked = next_request()
+            if picked is None:
+                return
+            index, item = picked
+            scheduled = start + index / rate if rate else None
+            if scheduled is not None:
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            item = resolve(item)
+            if item is None:
+                continue
+            sent = time.perf_counter()
+            status = None
+            try:
+                url = f"{base_url}{item.path}" + (f"?{item.query}" if item.query else "")
+                response = session.request(item.method, url, json=item.body, headers=item.headers, timeout=30)
+                status = response.status_code
+                if item.method == "GET" and status == 200:
+                    learn_ids(response)
+            except requests.RequestException:
+                pass
+            stats.add(item.label, time.perf_counter() - (scheduled or sent), status)
+
+    threads = [threading.Thread(target=worker, args=(session,)) for session in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for session in sessions:
+        session.close()
+    return stats.report(time.perf_counter() - start)
+
+
+def ensure_user(base_url: str, username: str, password: str) -> None:
+    """Creates the load user; an existing user with that name is fine."""
+    requests.put(f"{base_url}/api/create-user", json={"username": username, "password": password})
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['requests']} requests in {report['elapsed_seconds']:.1f} s = {report['rps']:.1f} req/s, "
+          f"statuses {report['statuses']}")
+    print(f"{'route':<48} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for label, route in report["routes"].items():
+        print(f"{label:<48} {route['requests']:>7} {route['errors']:>5} {route['rps']:>8.1f} "
+              f"{route['p50_ms']:>7.1f}ms {route['p95_ms']:>7.1f}ms {route['p99_ms']:>7.1f}ms {route['max_ms']:>7.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="mode", required=True)
+    replay = sub.add_parser("replay", help="replay a recorded trace")
+    replay.add_argument("trace")
+    replay.add_argument("--loop", action="store_true", help="restart the trace when it runs out")
+    saturday = sub.add_parser("saturday", help="synthetic busy-Saturday mix")
+    saturday.add_argument("--customers", type=int, default=500)
+    saturday.add_argument("--seed", type=int, default=1)
+    for mode in (replay, saturday):
+        mode.add_argument("--base-url", default="http://localhost:5000")
+        mode.add_argument("--username", default="loadgen")
+        mode.add_argument("--password", default="loadgen")
+        mode.add_argument("--concurrency", type=int, default=8)
+        mode.add_argument("--rate", type=float, default=0, help="requests per second in total; 0 sends as fast as possible")
+        mode.add_argument("--duration", type=float, default=30, help="seconds to run at most")
+        mode.add_argument("--requests", type=int, help="stop after this many requests")
+        mode.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    if args.mode == "replay":
+        trace = load_trace(args.trace)
+        if not trace:
+            raise SystemExit(f"No replayable requests in {args.trace}")
+        source: Iterator[Request] = itertools.cycle(trace) if args.loop else iter(trace)
+    else:
+        source = saturday_mix(args.customers, args.seed)
+
+    ensure_user(base_url, args.username, args.password)
+    report = run(source, base_url, args.username, args.password, args.concurrency, args.rate, args.duration, args.requests)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
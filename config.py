@@ -13,8 +13,55 @@ class ProductionConfig():
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "sqlite:////app/db/app.db")  # Production database URI from environment
+    SQLITE_PRAGMAS = {  # Applied to every new connection; set a variable to "" to keep SQLite's default
+        "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),  # Wait this long for a lock before "database is locked"
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),  # Readers no longer block the writer
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),  # Durable with WAL except on power loss
+        "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),  # Bytes of the database read through mmap
+        "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),  # Page cache; negative values are KiB
+        "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),  # Keep temp tables and sort spills in memory
+    }
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))  # Session users kept in memory
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # Seconds before a cached session user is reloaded
+    USER_CACHE_INVALIDATION_REFRESH = float(os.getenv("USER_CACHE_INVALIDATION_REFRESH", "5"))  # Seconds between checks for users deleted or changed by other workers, so the longest another worker still serves them from its cache
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or None  # Password hashing threads; 0 uses the CPU count
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))  # Logins verified or waiting before new ones get 503
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "5"))  # Seconds a login waits for the pool
+    PASSWORD_KDF_ITERATIONS = int(os.getenv("PASSWORD_KDF_ITERATIONS", "0")) or None  # PBKDF2 iterations; 0 calibrates at startup
+    PASSWORD_KDF_TARGET_MS = float(os.getenv("PASSWORD_KDF_TARGET_MS", "100"))  # Verify latency calibration aims for
+    PASSWORD_KDF_MIN_ITERATIONS = int(os.getenv("PASSWORD_KDF_MIN_ITERATIONS", "100000"))  # Calibration never goes below this
+    PASSWORD_KDF_REHASH_TOLERANCE = float(os.getenv("PASSWORD_KDF_REHASH_TOLERANCE", "0.2"))  # Calibrated cost shortfall tolerated before a hash is upgraded on login
+    API_TOKEN_SECRET = os.getenv("API_TOKEN_SECRET")  # Signs API tokens; falls back to SECRET_KEY
+    API_TOKEN_TTL = float(os.getenv("API_TOKEN_TTL", "43200"))  # Seconds an API token stays valid
+    API_TOKEN_REVOCATION_REFRESH = float(os.getenv("API_TOKEN_REVOCATION_REFRESH", "10"))  # Seconds between loads of token revocations made by other workers, so the longest other workers still accept a revoked token; 0 queries on every request
+    REQUEST_LOG_ENABLED = os.getenv("REQUEST_LOG_ENABLED", "true").lower() == "true"  # One JSON access line per request
+    REQUEST_LOG_GET_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_GET_SAMPLE_RATE", "1.0"))  # Fraction of successful GETs logged
+    REQUEST_LOG_SLOW_MS = float(os.getenv("REQUEST_LOG_SLOW_MS", "500"))  # Requests this slow are always logged
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # Record per-route metrics for /api/metrics
+    QUERY_MONITOR_ENABLED = os.getenv("QUERY_MONITOR_ENABLED", "true").lower() == "true"  # Record slow and repeated SQL statements
+    QUERY_MONITOR_SLOW_MS = float(os.getenv("QUERY_MONITOR_SLOW_MS", "100"))  # Statements this slow are logged with their query plan
+    QUERY_MONITOR_REPEAT_THRESHOLD = int(os.getenv("QUERY_MONITOR_REPEAT_THRESHOLD", "10"))  # More runs of one statement per request are flagged as N+1
+    QUERY_MONITOR_MAX_ENTRIES = int(os.getenv("QUERY_MONITOR_MAX_ENTRIES", "200"))  # Findings kept for /api/admin/queries
+    PROFILE_REQUESTS_ENABLED = os.getenv("PROFILE_REQUESTS_ENABLED", "false").lower() == "true"  # Let admins profile one request with an X-Profile header
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "")  # Where request profiles are written; empty uses the temp directory
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))  # Stack sampling interval while profiling a request
+    PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"  # Continuously sample request threads for /api/admin/profile
+    PROFILER_HZ = float(os.getenv("PROFILER_HZ", "100"))  # Samples per second of each busy request thread
+    PROFILER_WINDOW_SECONDS = float(os.getenv("PROFILER_WINDOW_SECONDS", "300"))  # Seconds of samples kept
+    REQUEST_RECORD_ENABLED = os.getenv("REQUEST_RECORD_ENABLED", "false").lower() == "true"  # Append every request to a trace for benchmarks/loadgen.py
+    REQUEST_RECORD_PATH = os.getenv("REQUEST_RECORD_PATH", "requests.jsonl")  # Trace file; credentials are scrubbed
+    ADMIN_USERS = os.getenv("ADMIN_USERS", "")  # Comma-separated usernames allowed on /api/admin routes
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")  # Database of the async build; empty uses DATABASE_URL with aiosqlite
+    ASYNC_WSGI_THREADS = int(os.getenv("ASYNC_WSGI_THREADS", "4"))  # Threads of the async build running routes it hands to Flask
+    LONG_POLL_MAX_SECONDS = float(os.getenv("LONG_POLL_MAX_SECONDS", "60"))  # Longest ?wait= a status poll is held open
+    LONG_POLL_INTERVAL_MS = float(os.getenv("LONG_POLL_INTERVAL_MS", "250"))  # How often waiting polls check the database for commits
+    WRITE_QUEUE_ENABLED = os.getenv("WRITE_QUEUE_ENABLED", "false").lower() == "true"  # Serialize writes through one group-committing writer per process (per gunicorn worker)
+    WRITE_QUEUE_MAX_BATCH = int(os.getenv("WRITE_QUEUE_MAX_BATCH", "64"))  # Writes committed together at most
+    WRITE_QUEUE_MAX_WAIT_MS = float(os.getenv("WRITE_QUEUE_MAX_WAIT_MS", "0"))  # How long a batch waits for more writes
+    WRITE_QUEUE_TIMEOUT = float(os.getenv("WRITE_QUEUE_TIMEOUT", "30"))  # Seconds a request waits for its write before a 503
 
 class TestConfig():
     """Testing configuration."""
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
\ No newline at end of file
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    PASSWORD_KDF_ITERATIONS = 1000  # Keep password hashing cheap in tests
\ No newline at end of file
@@ -13,5 +13,9 @@ else
     echo "Skipping database creation."
 fi
 
-# Start the Python application
-exec python app.py
\ No newline at end of file
+# Start the application under gunicorn (preforked workers, see gunicorn.conf.py);
+# ASYNC_SERVER=true serves the async build on uvicorn workers instead
+if [ "$ASYNC_SERVER" = "true" ]; then
+    exec gunicorn -c gunicorn.conf.py -k uvicorn_worker.UvicornWorker asgi:app
+fi
+exec gunicorn -c gunicorn.conf.py wsgi:app
\ No newline at end of file
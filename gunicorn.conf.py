@@ -0,0 +1,45 @@
+"""Gunicorn settings for serving wsgi:app with preforked, multi-threaded workers.
+
+The same settings serve the async build with WEB_WORKER_CLASS=uvicorn_worker.UvicornWorker
+and asgi:app; each worker then runs one event loop instead of WEB_THREADS threads.
+
+The app is imported once in the master (preload_app) and the objects it created are
+moved out of the garbage collector's reach with gc.freeze(), so forked workers share
+those pages copy-on-write instead of each touching, and so copying, them on every
+collection.
+
+Reloads:
+    kill -HUP <master>   Starts fresh workers with the new settings, then gracefully
+                         stops the old ones. The preloaded code itself is not re-imported.
+    kill -USR2 <master>  Starts a new master running the new code next to the old one;
+                         follow with -WINCH and -QUIT to the old master once it serves.
+
+Every setting can be overridden from the environment, see below.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_WORKERS", "0")) or multiprocessing.cpu_count()  # Processes; 0 uses the CPU count
+threads = int(os.getenv("WEB_THREADS", "4"))  # Request threads per gthread worker
+worker_class = os.getenv("WEB_WORKER_CLASS", "gthread")  # uvicorn_worker.UvicornWorker serves asgi:app
+preload_app = os.getenv("WEB_PRELOAD", "true").lower() == "true"  # Import the app once, before forking
+timeout = int(os.getenv("WEB_TIMEOUT", "30"))  # Seconds before a stuck worker is killed and replaced
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))  # Seconds workers get to finish requests on reload or stop
+keepalive = int(os.getenv("WEB_KEEPALIVE", "5"))  # Seconds an idle keep-alive connection is held open
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "0"))  # Recycle a worker after this many requests; 0 never does
+max_requests_jitter = max_requests // 10
+# The app writes one JSON access line per request itself.
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+
+def when_ready(server):
+    """Runs in the master after the app was preloaded, just before the workers are forked."""
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+        server.log.info("Froze %d objects of the preloaded app for copy-on-write sharing", gc.get_freeze_count())
+
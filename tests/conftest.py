@@ -47,10 +47,12 @@ def session(app):
     session_factory = sessionmaker(bind=connection)
     Session = scoped_session(session_factory)
 
+    original_session = db.session
     db.session = Session  # Override the global scoped session
 
     yield Session
 
     transaction.rollback()
     connection.close()
-    Session.remove()
\ No newline at end of file
+    Session.remove()
+    db.session = original_session
\ No newline at end of file
@@ -0,0 +1,146 @@
+import pytest
+from sqlalchemy import create_engine, event
+
+from RacketTracker.models.token_model import RevokedTokens
+from RacketTracker.utils import api_tokens
+from RacketTracker.utils.api_tokens import InvalidToken, RevocationList, TokenSigner
+
+
+@pytest.fixture
+def signer():
+    return TokenSigner("test-secret-key", ttl=60)
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(api_tokens.time, "time", lambda: now[0])
+    return now
+
+def test_issue_and_verify(signer):
+    """Test that a freshly issued token verifies to the user's identity."""
+    token, expires_at = signer.issue(7, "alex")
+    claims = signer.verify(token)
+    assert (claims["uid"], claims["sub"], claims["exp"]) == (7, "alex", expires_at)
+
+def test_tampered_token_is_rejected(signer):
+    """Test that changing the payload invalidates the signature."""
+    token, _ = signer.issue(7, "alex")
+    other, _ = signer.issue(8, "rocky")
+    forged = other.split(".")[0] + "." + token.split(".")[1]
+    with pytest.raises(InvalidToken, match="Invalid API token"):
+        signer.verify(forged)
+
+def test_token_from_other_secret_is_rejected(signer):
+    """Test that tokens signed with a different key are rejected."""
+    token, _ = TokenSigner("another-secret").issue(7, "alex")
+    with pytest.raises(InvalidToken, match="Invalid API token"):
+        signer.verify(token)
+
+@pytest.mark.parametrize("token", ["", "garbage", "a.b.c", "."])
+def test_malformed_token_is_rejected(signer, token):
+    """Test error on tokens that are not payload.signature."""
+    with pytest.raises(InvalidToken):
+        signer.verify(token)
+
+def test_expired_token_is_rejected(signer, clock):
+    """Test that a token is rejected once its TTL has passed."""
+    token, _ = signer.issue(7, "alex")
+    clock[0] += 61
+    with pytest.raises(InvalidToken, match="expired"):
+        signer.verify(token)
+
+def test_revoke_token(signer):
+    """Test that a revoked token is rejected while others stay valid."""
+    token, _ = signer.issue(7, "alex")
+    other, _ = signer.issue(7, "alex")
+    signer.revoke(token)
+    with pytest.raises(InvalidToken, match="revoked"):
+        signer.verify(token)
+    assert signer.verify(other)["sub"] == "alex"
+
+def test_revoke_user(signer, clock):
+    """Test that revoking a user rejects only that user's earlier tokens."""
+    alex, _ = signer.issue(7, "alex")
+    rocky, _ = signer.issue(8, "rocky")
+    clock[0] += 1
+    signer.revocations.revoke_user("alex")
+    clock[0] += 1
+    fresh, _ = signer.issue(7, "alex")
+    with pytest.raises(InvalidToken, match="revoked"):
+        signer.verify(alex)
+    assert signer.verify(rocky)["sub"] == "rocky"
+    assert signer.verify(fresh)["sub"] == "alex"
+
+def test_revoke_all(signer, clock):
+    """Test that revoking everyone rejects every earlier token."""
+    token, _ = signer.issue(7, "alex")
+    clock[0] += 1
+    signer.revocations.revoke_all()
+    with pytest.raises(InvalidToken, match="revoked"):
+        signer.verify(token)
+
+def test_revocations_are_shared_through_the_database(tmp_path):
+    """Test that a token revoked by one process is rejected by another using the same database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tokens.db'}")
+    RevokedTokens.__table__.create(engine)
+    workers = [TokenSigner("test-secret-key", ttl=60, revocations=RevocationList(engine, ttl=60, refresh_interval=0))
+               for _ in range(2)]
+    token, _ = workers[0].issue(7, "alex")
+    other, _ = workers[0].issue(8, "rocky")
+    assert workers[1].verify(token)["sub"] == "alex"
+
+    workers[0].revoke(token)
+    with pytest.raises(InvalidToken, match="revoked"):
+        workers[1].verify(token)
+    workers[1].revocations.revoke_user("rocky")
+    with pytest.raises(InvalidToken, match="revoked"):
+        workers[0].verify(other)
+    engine.dispose()
+
+def test_revocations_are_checked_in_memory(tmp_path, monkeypatch):
+    """Test that many verifications load revocations from the database at most once per refresh interval."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tokens.db'}")
+    RevokedTokens.__table__.create(engine)
+    selects = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: selects.append(statement) if statement.startswith("SELECT") else None)
+    now = [1000.0]
+    monkeypatch.setattr(api_tokens.time, "monotonic", lambda: now[0])
+    signer = TokenSigner("test-secret-key", ttl=60, revocations=RevocationList(engine, ttl=60, refresh_interval=10))
+    token, _ = signer.issue(7, "alex")
+
+    for _ in range(100):
+        signer.verify(token)
+    assert len(selects) == 1
+
+    # A revocation made by another worker is picked up once the interval has passed
+    RevocationList(engine, ttl=60).revoke_user("alex")
+    signer.verify(token)
+    now[0] += 10
+    with pytest.raises(InvalidToken, match="revoked"):
+        signer.verify(token)
+    assert len(selects) == 2
+    engine.dispose()
+
+def test_secret_key_required():
+    """Test error when no signing key is given."""
+    with pytest.raises(ValueError, match="secret key"):
+        TokenSigner("")
+
+def test_revocations_after_pruning_are_still_loaded(tmp_path, clock):
+    """Test that revocation IDs keep growing after expired rows are pruned, so other workers see new ones."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tokens.db'}")
+    RevokedTokens.__table__.create(engine)
+    workers = [TokenSigner("test-secret-key", ttl=60, revocations=RevocationList(engine, ttl=60, refresh_interval=0))
+               for _ in range(2)]
+    short_lived, _ = workers[0].issue(7, "alex")
+    workers[0].revoke(short_lived)
+    with pytest.raises(InvalidToken, match="revoked"):
+        workers[1].verify(short_lived)
+
+    clock[0] += 61  # the first revocation expires and is pruned by the next one
+    token, _ = workers[0].issue(7, "alex")
+    workers[0].revoke(token)
+    with pytest.raises(InvalidToken, match="revoked"):
+        workers[1].verify(token)
+    engine.dispose()
@@ -0,0 +1,195 @@
+import asyncio
+import time
+
+import pytest
+from flask import Flask
+
+from app import create_app
+from async_app import create_asgi_app
+from config import TestConfig
+from RacketTracker.db import db
+from RacketTracker.models.order_model import Orders
+from RacketTracker.utils.async_db import async_database_url
+from datetime import date
+
+
+@pytest.fixture(scope="module")
+def file_app(tmp_path_factory):
+    """An app on a database file, which the async engine can open next to the Flask one."""
+    path = tmp_path_factory.mktemp("async") / "app.db"
+    config = type("AsyncTestConfig", (TestConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "SECRET_KEY": "async-test-secret",
+        "REQUEST_LOG_ENABLED": False,
+        "LONG_POLL_INTERVAL_MS": 20,
+    })
+    app = create_app(config)
+    with app.app_context():
+        db.session.add_all([
+            Orders(customer="Alex", order_date=date(2025, 6, 10), racket="Wilson Pro Staff", mains_tension=52,
+                   mains_string="Luxilon ALU Power", paid=False, completed=False),
+            Orders(customer="Rocky", stringer="Alex", order_date=date(2025, 6, 18), racket="Head Speed MP",
+                   mains_tension=54, mains_string="Head Velocity", paid=True, completed=True),
+        ])
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def client(file_app):
+    client = file_app.test_client()
+    client.put("/api/create-user", json={"username": "tablet", "password": "tablet"})
+    client.post("/api/login", json={"username": "tablet", "password": "tablet"})
+    return client
+
+
+@pytest.fixture(scope="module")
+def cookie(client):
+    """The session cookie of the logged-in test client, for requests to the async build."""
+    return f"session={client.get_cookie('session').value}"
+
+
+async def call(asgi, path: str, query: str = "", headers: dict = None, method: str = "GET", body: bytes = b""):
+    """Sends one request to an ASGI app; returns the status, headers and body."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    headers = {**(headers or {}), **({"Content-Length": str(len(body))} if body else {})}
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "server": ("testserver", 80), "client": ("127.0.0.1", 50000),
+    }
+    await asgi(scope, receive, send)
+    headers = {name.decode(): value.decode() for name, value in sent[0]["headers"]}
+    return sent[0]["status"], headers, b"".join(message.get("body", b"") for message in sent[1:])
+
+
+def serve(flask_app: Flask, scenario):
+    """Runs scenario(asgi) on a fresh event loop and closes the async engine afterwards."""
+    asgi = create_asgi_app(flask_app)
+
+    async def main():
+        try:
+            return await scenario(asgi)
+        finally:
+            await asgi.close()
+
+    return asyncio.run(main())
+
+
+def test_async_routes_answer_like_flask(file_app, client, cookie):
+    """Test that every async route sends the same status and body as the Flask route."""
+    paths = [
+        "/api/health",
+        "/api/get-order-from-history-by-id/1",
+        "/api/get-order-from-history-by-id/999",
+        "/api/orders/1/status",
+        "/api/orders/by-customer/Rocky",
+        "/api/orders/by-customer/Nobody",
+        "/api/orders/by-completed/false",
+        "/api/orders/by-date/20250618",
+        "/api/orders/by-date/June",
+        "/api/get-all-orders-from-history?limit=1",
+        "/api/get-all-orders-from-history?limit=x",
+    ]
+
+    async def scenario(asgi):
+        for path in paths:
+            route, _, query = path.partition("?")
+            status, _, body = await call(asgi, route, query, {"Cookie": cookie})
+            expected = client.get(path)
+            assert (status, body) == (expected.status_code, expected.data), path
+
+    serve(file_app, scenario)
+
+
+def test_async_routes_require_authentication(file_app):
+    """Test that async routes reject anonymous requests and accept API tokens."""
+    client = file_app.test_client()
+    client.put("/api/create-user", json={"username": "kiosk", "password": "kiosk"})
+    token = client.post("/api/tokens", json={"username": "kiosk", "password": "kiosk"}).get_json()["token"]
+
+    async def scenario(asgi):
+        anonymous = await call(asgi, "/api/orders/1/status")
+        forged = await call(asgi, "/api/orders/1/status", headers={"Cookie": "session=forged"})
+        bearer = await call(asgi, "/api/orders/1/status", headers={"Authorization": f"Bearer {token}"})
+        return anonymous[0], forged[0], bearer[0]
+
+    assert serve(file_app, scenario) == (401, 401, 200)
+
+
+def test_status_poll_times_out_with_not_modified(file_app, cookie):
+    """Test that a poll whose ETag still matches is held for the wait and answered with 304."""
+    async def scenario(asgi):
+        _, headers, _ = await call(asgi, "/api/orders/1/status", headers={"Cookie": cookie})
+        start = time.monotonic()
+        status, _, body = await call(asgi, "/api/orders/1/status", "wait=1",
+                                     {"Cookie": cookie, "If-None-Match": headers["etag"]})
+        return status, body, time.monotonic() - start
+
+    status, body, elapsed = serve(file_app, scenario)
+    assert (status, body) == (304, b"")
+    assert elapsed >= 0.9
+
+
+def test_status_poll_wakes_up_on_commit(file_app, cookie):
+    """Test that a waiting poll answers as soon as another connection changes the order."""
+    async def complete_order():
+        await asyncio.sleep(0.2)
+
+        def write():
+            with file_app.app_context():
+                Orders.mark_completed(1)
+        await asyncio.to_thread(write)
+
+    async def scenario(asgi):
+        _, headers, _ = await call(asgi, "/api/orders/1/status", headers={"Cookie": cookie})
+        start = time.monotonic()
+        (status, _, body), _ = await asyncio.gather(
+            call(asgi, "/api/orders/1/status", "wait=10", {"Cookie": cookie, "If-None-Match": headers["etag"]}),
+            complete_order(),
+        )
+        return status, body, time.monotonic() - start
+
+    status, body, elapsed = serve(file_app, scenario)
+    assert status == 200
+    assert b'"completed":true' in body
+    assert elapsed < 5
+
+
+def test_other_requests_fall_through_to_flask(file_app, cookie):
+    """Test that writes and NDJSON exports are served by the Flask app."""
+    async def scenario(asgi):
+        update = await call(asgi, "/api/update-order/2", method="PATCH", body=b'{"mains_tension": 50}',
+                            headers={"Cookie": cookie, "Content-Type": "application/json"})
+        export = await call(asgi, "/api/get-all-orders-from-history", "format=ndjson", {"Cookie": cookie})
+        return update, export
+
+    update, export = serve(file_app, scenario)
+    assert update[0] == 200
+    assert export[1]["content-type"] == "application/x-ndjson"
+    assert len(export[2].splitlines()) == 2
+
+
+def test_async_database_url():
+    """Test that the async engine opens the Flask database file with aiosqlite."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:////data/app.db"
+    assert async_database_url(app) == "sqlite+aiosqlite:////data/app.db"
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    with pytest.raises(ValueError):
+        async_database_url(app)
@@ -0,0 +1,58 @@
+import pytest
+
+from RacketTracker.utils import cache as cache_module
+from RacketTracker.utils.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+def test_get_and_set():
+    """Test that cached values are returned and lookups are counted."""
+    cache = TTLCache(max_size=4, ttl=60)
+    assert cache.get("alex") is None
+    cache.set("alex", 1)
+    assert cache.get("alex") == 1
+    assert cache.stats() == {"size": 1, "max_size": 4, "ttl": 60, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_entries_expire(clock):
+    """Test that an entry is a miss once its TTL has passed."""
+    cache = TTLCache(ttl=10)
+    cache.set("alex", 1)
+    clock[0] += 9
+    assert cache.get("alex") == 1
+    clock[0] += 2
+    assert cache.get("alex") is None
+    assert cache.stats()["size"] == 0
+
+def test_least_recently_used_is_evicted():
+    """Test that a full cache evicts the entry used longest ago."""
+    cache = TTLCache(max_size=2)
+    cache.set("alex", 1)
+    cache.set("rocky", 2)
+    cache.get("alex")
+    cache.set("kempton", 3)
+    assert cache.get("rocky") is None
+    assert cache.get("alex") == 1
+    assert cache.get("kempton") == 3
+
+def test_pop_and_clear():
+    """Test invalidating one entry and every entry."""
+    cache = TTLCache()
+    cache.set("alex", 1)
+    cache.set("rocky", 2)
+    cache.pop("alex")
+    cache.pop("missing")
+    assert cache.get("alex") is None
+    cache.clear()
+    assert cache.stats()["size"] == 0
+
+def test_invalid_arguments():
+    """Test error on a zero size or negative TTL."""
+    with pytest.raises(ValueError, match="max_size"):
+        TTLCache(max_size=0)
+    with pytest.raises(ValueError, match="ttl"):
+        TTLCache(ttl=-1)
@@ -0,0 +1,106 @@
+import sqlite3
+from datetime import date
+
+import pytest
+from sqlalchemy import Index
+
+from config import ProductionConfig
+from RacketTracker.models.order_model import Orders
+from RacketTracker.utils import data_generator
+from RacketTracker.utils.data_generator import ORDER_COLUMNS, generate_orders, populate
+from RacketTracker.utils.kdf import PasswordHasher
+
+
+def test_generate_orders_is_deterministic():
+    """Test that equal seeds give equal data, split into the requested batches."""
+    first = [row for batch in generate_orders(250, seed=7, batch_size=100) for row in batch]
+    second = [row for batch in generate_orders(250, seed=7, batch_size=100) for row in batch]
+    assert first == second and len(first) == 250
+    assert [len(batch) for batch in generate_orders(250, seed=7, batch_size=100)] == [100, 100, 50]
+    assert all(len(row) == len(ORDER_COLUMNS) for row in first)
+
+def test_generated_orders_are_realistic():
+    """Test the skew of customers and the settled state of old orders."""
+    today = date(2025, 6, 30)
+    rows = [dict(zip(ORDER_COLUMNS, row)) for batch in generate_orders(5000, today=today) for row in batch]
+    counts = {}
+    for row in rows:
+        counts[row["customer"]] = counts.get(row["customer"], 0) + 1
+    top = sorted(counts.values(), reverse=True)
+    assert top[0] > 10 * (len(rows) / len(counts))
+    old = [row for row in rows if (today - date.fromisoformat(row["order_date"])).days > 30]
+    assert sum(row["completed"] for row in old) / len(old) > 0.9
+    assert all(row["stringer"] for row in rows if row["completed"])
+
+def test_populate(tmp_path):
+    """Test that populate loads rows, rebuilds every index and creates usable users."""
+    db_path = str(tmp_path / "generated.db")
+    stats = populate(db_path, orders=2000, users=3, password="s3cret", kdf_iterations=1000)
+    populate(db_path, orders=1000, users=3, password="other", kdf_iterations=1000)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT count(*) FROM orders").fetchone()[0] == 3000
+    indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'orders'")}
+    assert indexes == {index.name for index in Orders.__table__.indexes}
+    username, salt, password = conn.execute("SELECT username, salt, password FROM users ORDER BY id").fetchone()
+    assert conn.execute("SELECT count(*) FROM users").fetchone()[0] == 3
+    conn.close()
+    assert username == "user0" and PasswordHasher().verify("s3cret", salt, password)
+    assert stats["orders"] == 2000 and stats["customers"] == 250
+
+def test_users_need_a_password(tmp_path, capsys):
+    """Test that no accounts are created with a default password."""
+    with pytest.raises(ValueError, match="password"):
+        populate(str(tmp_path / "generated.db"), orders=10, users=3)
+    with pytest.raises(SystemExit):
+        data_generator.main([str(tmp_path / "generated.db"), "--orders", "10", "--users", "3"])
+    assert "--users requires --password" in capsys.readouterr().err
+
+def order_indexes(db_path: str) -> set:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'orders'")}
+    finally:
+        conn.close()
+
+def test_populate_failure_keeps_indexes(tmp_path, monkeypatch):
+    """Test that a failed load is rolled back and still leaves every index in place."""
+    db_path = str(tmp_path / "generated.db")
+
+    def broken_orders(*args):
+        yield [("Alex",) * len(ORDER_COLUMNS)]
+        raise RuntimeError("generator failed")
+
+    monkeypatch.setattr(data_generator, "generate_orders", broken_orders)
+    with pytest.raises(RuntimeError, match="generator failed"):
+        populate(db_path, orders=10)
+
+    assert order_indexes(db_path) == {index.name for index in Orders.__table__.indexes}
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT count(*) FROM orders").fetchone()[0] == 0
+    conn.close()
+
+def test_populate_keeps_indexes_of_a_loaded_database(tmp_path, monkeypatch):
+    """Test that topping up a database that already holds orders never drops its indexes."""
+    db_path = str(tmp_path / "generated.db")
+    populate(db_path, orders=100)
+    dropped = []
+    monkeypatch.setattr(Index, "drop", lambda index, *args, **kwargs: dropped.append(index.name))
+    populate(db_path, orders=100)
+    assert dropped == []
+    assert order_indexes(db_path) == {index.name for index in Orders.__table__.indexes}
+
+def test_populate_keeps_durability_of_a_loaded_database(tmp_path, monkeypatch):
+    """Test that only a fresh load relaxes journaling; a top-up uses the app's PRAGMAs."""
+    db_path = str(tmp_path / "generated.db")
+    applied = []
+    apply = data_generator.apply_sqlite_pragmas
+    monkeypatch.setattr(data_generator, "apply_sqlite_pragmas",
+                        lambda conn, pragmas: applied.append(pragmas) or apply(conn, pragmas))
+    populate(db_path, orders=100)
+    assert applied == []
+    populate(db_path, orders=100)
+    assert applied == [ProductionConfig.SQLITE_PRAGMAS]
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == ProductionConfig.SQLITE_PRAGMAS["journal_mode"].lower()
+    conn.close()
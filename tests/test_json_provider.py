@@ -0,0 +1,68 @@
+import json
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from flask import jsonify
+from sqlalchemy import select
+
+from RacketTracker.models.order_model import Orders
+from RacketTracker.models.user_model import SessionUser, Users
+from RacketTracker.utils import json_provider as json_provider_module
+
+
+@pytest.fixture(params=["orjson", "json"])
+def provider(request, app, monkeypatch):
+    """The app's provider, once with orjson and once on the stdlib fallback."""
+    if request.param == "json":
+        monkeypatch.setattr(json_provider_module, "orjson", None)
+    elif json_provider_module.orjson is None:
+        pytest.skip("orjson is not installed")
+    assert app.json.backend == request.param
+    return app.json
+
+@dataclass
+class Grip:
+    size: int
+    overgrip: bool
+
+def test_dates_use_the_api_format(provider):
+    """Test that dates are written as YYYYMMDD, compact and with sorted keys."""
+    assert provider.dumps({"order_date": date(2025, 6, 30), "customer": "Alex"}) == \
+        '{"customer":"Alex","order_date":"20250630"}'
+
+def test_orm_rows_and_slotted_objects(provider, session):
+    """Test that ORM instances, rows, slotted objects, dataclasses and decimals are encoded."""
+    session.add(Orders(customer="Alex", order_date=date(2025, 6, 10), racket="Wilson Pro Staff", mains_tension=52,
+                       mains_string="Luxilon ALU Power", paid=False, completed=False))
+    session.flush()
+    order = session.execute(select(Orders)).scalar_one()
+    row = session.execute(select(Orders.order_id, Orders.order_date)).one()
+
+    encoded = json.loads(provider.dumps([order, row, SessionUser(3, "rocky"), Grip(2, True), Decimal("1.25")]))
+    assert encoded[0]["customer"] == "Alex"
+    assert encoded[0]["order_date"] == "20250610"
+    assert encoded[0]["crosses_tension"] is None
+    assert encoded[1] == {"order_id": order.order_id, "order_date": "20250610"}
+    assert encoded[2] == {"id": 3, "username": "rocky"}
+    assert encoded[3] == {"size": 2, "overgrip": True}
+    assert encoded[4] == "1.25"
+
+def test_unsupported_types_raise(provider):
+    """Test that objects the provider cannot encode raise TypeError."""
+    with pytest.raises(TypeError):
+        provider.dumps({"order": object()})
+
+def test_models_without_json_fields_are_refused(provider):
+    """Test that a Users row is not encoded, so its salt and password never reach a client."""
+    with pytest.raises(TypeError):
+        provider.dumps(Users(username="alex", salt="salt", password="hash"))
+
+def test_jsonify_uses_the_provider(provider, app):
+    """Test that jsonify responses go through the provider and end in a newline."""
+    with app.test_request_context():
+        response = jsonify(status="success", order_date=date(2025, 6, 30))
+    assert response.mimetype == "application/json"
+    assert response.data == b'{"order_date":"20250630","status":"success"}\n'
+    assert provider.loads(response.data)["order_date"] == "20250630"
@@ -0,0 +1,57 @@
+import hashlib
+
+import pytest
+
+from RacketTracker.utils.kdf import PasswordHasher, calibrate
+
+
+SALT = "ab" * 16
+
+def test_hash_and_verify():
+    """Test that a hash records its parameters and verifies only the right password."""
+    hasher = PasswordHasher(iterations=1000)
+    encoded = hasher.hash("securepassword123", SALT)
+    assert encoded.startswith("pbkdf2_sha256$1000$")
+    assert hasher.verify("securepassword123", SALT, encoded) is True
+    assert hasher.verify("wrongpassword", SALT, encoded) is False
+
+def test_verify_uses_stored_iterations():
+    """Test that hashes made at an older cost still verify after the cost changes."""
+    encoded = PasswordHasher(iterations=1000).hash("securepassword123", SALT)
+    assert PasswordHasher(iterations=2000).verify("securepassword123", SALT, encoded) is True
+
+def test_verify_legacy_sha256():
+    """Test that the original SHA-256 hashes are still accepted."""
+    legacy = hashlib.sha256(("securepassword123" + SALT).encode()).hexdigest()
+    hasher = PasswordHasher(iterations=1000)
+    assert hasher.verify("securepassword123", SALT, legacy) is True
+    assert hasher.verify("wrongpassword", SALT, legacy) is False
+
+def test_verify_malformed_hash():
+    """Test that a corrupt KDF hash never verifies."""
+    assert PasswordHasher(iterations=1000).verify("securepassword123", SALT, "pbkdf2_sha256$abc$00") is False
+
+def test_needs_rehash():
+    """Test that legacy and cheaper hashes are flagged for an upgrade."""
+    hasher = PasswordHasher(iterations=2000)
+    assert hasher.needs_rehash("0" * 64) is True
+    assert hasher.needs_rehash(PasswordHasher(iterations=1000).hash("pw", SALT)) is True
+    assert hasher.needs_rehash(hasher.hash("pw", SALT)) is False
+
+def test_needs_rehash_tolerance():
+    """Test that hashes within the tolerance of a recalibrated cost are kept."""
+    hasher = PasswordHasher(iterations=100_000, rehash_tolerance=0.2)
+    assert hasher.needs_rehash(PasswordHasher(iterations=85_000).hash("pw", SALT)) is False
+    assert hasher.needs_rehash(PasswordHasher(iterations=79_000).hash("pw", SALT)) is True
+    with pytest.raises(ValueError):
+        PasswordHasher(iterations=1000, rehash_tolerance=1)
+
+def test_calibrate_respects_bounds():
+    """Test that calibration stays within the configured floor and ceiling."""
+    assert calibrate(0.001, min_iterations=5000, max_iterations=10000, probe_iterations=100) == 5000
+    assert calibrate(10_000, min_iterations=5000, max_iterations=10000, probe_iterations=100) == 10000
+
+def test_invalid_iterations():
+    """Test error when the iteration count is not positive."""
+    with pytest.raises(ValueError, match="iterations"):
+        PasswordHasher(iterations=0)
@@ -0,0 +1,38 @@
+import logging
+import logging.handlers
+
+import pytest
+
+from RacketTracker.utils.logger import configure_logger, parse_log_levels
+
+
+def test_configure_logger_is_idempotent():
+    """Test that repeated calls never add handlers, so each record is emitted once."""
+    logger = logging.getLogger("RacketTracker.tests.idempotent")
+    for _ in range(3):
+        configure_logger(logger)
+    assert logger.handlers == []
+    assert logger.propagate is True
+    queue_handlers = [h for h in logging.getLogger().handlers if isinstance(h, logging.handlers.QueueHandler)]
+    assert len(queue_handlers) == 1
+
+def test_configure_logger_removes_own_handlers():
+    """Test that handlers attached directly to a logger are dropped in favour of the root pipeline."""
+    logger = logging.getLogger("RacketTracker.tests.own_handler")
+    logger.addHandler(logging.StreamHandler())
+    configure_logger(logger)
+    assert logger.handlers == []
+
+def test_parse_log_levels():
+    """Test parsing per-logger levels from the LOG_LEVELS format."""
+    assert parse_log_levels("RacketTracker.models=debug, werkzeug=WARNING,") == {
+        "RacketTracker.models": logging.DEBUG,
+        "werkzeug": logging.WARNING,
+    }
+    assert parse_log_levels("") == {}
+
+@pytest.mark.parametrize("spec", ["werkzeug", "=DEBUG", "werkzeug=LOUD"])
+def test_parse_log_levels_invalid(spec):
+    """Test error on malformed entries and unknown levels."""
+    with pytest.raises(ValueError):
+        parse_log_levels(spec)
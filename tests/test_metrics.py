@@ -0,0 +1,81 @@
+import threading
+
+from RacketTracker.utils.metrics import LatencyTracker, MetricsRegistry
+
+
+def test_latency_percentiles():
+    """Test nearest-rank p50/p99 over the recorded samples."""
+    tracker = LatencyTracker()
+    for ms in range(1, 101):
+        tracker.observe(ms / 1000)
+    assert tracker.summary() == {"count": 100, "p50_ms": 50.0, "p99_ms": 99.0}
+
+def test_latency_window_keeps_recent_samples():
+    """Test that old samples fall out of the window but still count."""
+    tracker = LatencyTracker(window=2)
+    for seconds in (10.0, 0.001, 0.002):
+        tracker.observe(seconds)
+    assert tracker.percentile(99) == 0.002
+    assert tracker.count == 3
+
+def test_latency_without_samples():
+    """Test the summary before anything was recorded."""
+    assert LatencyTracker().summary() == {"count": 0, "p50_ms": None, "p99_ms": None}
+
+def test_latency_time_records_on_error():
+    """Test that the timing block records a sample even when it raises."""
+    tracker = LatencyTracker()
+    try:
+        with tracker.time():
+            raise ValueError("bad login")
+    except ValueError:
+        pass
+    assert tracker.count == 1
+
+def test_registry_sums_thread_shards():
+    """Test that counters written from several threads are summed on collection."""
+    registry = MetricsRegistry()
+    labels = (("route", "/api/orders"), ("method", "GET"))
+
+    def work():
+        for _ in range(100):
+            registry.inc("http_requests_total", labels)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.inc("http_requests_total", labels)
+    counters, _ = registry.collect()
+    assert counters[("http_requests_total", labels)] == 401
+
+def test_registry_renders_prometheus_text():
+    """Test the exposition format of counters, gauges and histograms."""
+    registry = MetricsRegistry(buckets=(0.01, 0.1))
+    registry.describe("http_request_duration_seconds", "histogram", "Request latency.")
+    labels = (("route", "/api/orders"),)
+    for seconds in (0.005, 0.05, 5):
+        registry.observe("http_request_duration_seconds", labels, seconds)
+    registry.inc("http_requests_total", labels + (("status", 200),))
+    text = registry.render([("user_cache_entries", (), 3), ("user_cache_hit_ratio", (), None)])
+    assert text.splitlines() == [
+        "# HELP http_request_duration_seconds Request latency.",
+        "# TYPE http_request_duration_seconds histogram",
+        'http_request_duration_seconds_bucket{route="/api/orders",le="0.01"} 1',
+        'http_request_duration_seconds_bucket{route="/api/orders",le="0.1"} 2',
+        'http_request_duration_seconds_bucket{route="/api/orders",le="+Inf"} 3',
+        'http_request_duration_seconds_sum{route="/api/orders"} 5.055',
+        'http_request_duration_seconds_count{route="/api/orders"} 3',
+        'http_requests_total{route="/api/orders",status="200"} 1',
+        "user_cache_entries 3",
+    ]
+
+def test_metrics_endpoint(client):
+    """Test that /api/metrics reports the requests the app has handled."""
+    client.get("/api/health")
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert 'http_requests_total{route="/api/health",method="GET",status="200"}' in response.text
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
@@ -2,6 +2,9 @@ import pytest
 
 from RacketTracker.models.order_model import Orders # , Customers, Strings, Rackets
 from pytest_mock import MockerFixture
+from sqlalchemy import event
+
+from RacketTracker.db import db
 from datetime import date
 
 # --- Fixtures ---
@@ -129,6 +132,52 @@ def test_create_order_invalid_data(customer, order_date, racket, mains_tension,
         Orders.create_order(customer, order_date, racket, mains_tension, mains_string, crosses_tension, crosses_string, replacement_grip, paid)
 
 
+# --- Bulk create ---
+
+def bulk_order(**overrides) -> dict:
+    order = {
+        "customer": "Alex",
+        "order_date": date(2025, 6, 10),
+        "racket": "Wilson Pro Staff",
+        "mains_tension": 52,
+        "mains_string": "Luxilon ALU Power",
+        "crosses_tension": 52,
+        "crosses_string": "Luxilon ALU Power",
+        "replacement_grip": None,
+        "paid": False,
+    }
+    order.update(overrides)
+    return order
+
+def test_create_orders_bulk(session):
+    """Test creating several orders in one batch."""
+    order_ids, errors = Orders.create_orders_bulk([bulk_order(), bulk_order(customer="Rocky", paid=True)])
+    assert errors == []
+    assert len(order_ids) == 2
+    created = [session.get(Orders, order_id) for order_id in order_ids]
+    assert [order.customer for order in created] == ["Alex", "Rocky"]
+    assert [order.paid for order in created] == [False, True]
+    assert not any(order.completed for order in created)
+
+def test_create_orders_bulk_partial_errors(session):
+    """Test that invalid items are reported by index and the rest are created."""
+    order_ids, errors = Orders.create_orders_bulk([bulk_order(), bulk_order(mains_tension="52"), bulk_order(notes="x")])
+    assert len(order_ids) == 1
+    assert [error["index"] for error in errors] == [1, 2]
+    assert session.query(Orders).count() == 1
+
+def test_create_orders_bulk_all_or_nothing(session):
+    """Test that nothing is created when any item is invalid in all-or-nothing mode."""
+    order_ids, errors = Orders.create_orders_bulk([bulk_order(), bulk_order(racket=1)], all_or_nothing=True)
+    assert order_ids == []
+    assert errors == [{"index": 1, "message": "racket must be a non-empty string."}]
+    assert session.query(Orders).count() == 0
+
+def test_create_orders_bulk_too_many(session):
+    """Test that oversized batches are rejected."""
+    with pytest.raises(ValueError, match="At most"):
+        Orders.create_orders_bulk([bulk_order()] * 1001)
+
 # --- Get order ---
 
 def test_get_order_by_id(order_wilson: Orders):
@@ -205,6 +254,73 @@ def test_get_all_orders(session, order_wilson: Orders, order_head: Orders):
     ]
     assert orders == expected
 
+def test_get_all_orders_paginated(session, order_wilson: Orders, order_head: Orders):
+    """Test keyset pagination of all orders."""
+    first_page = Orders.get_all_orders(limit=1)
+    assert [order["order_id"] for order in first_page] == [order_wilson.order_id]
+    second_page = Orders.get_all_orders(limit=1, after=first_page[-1]["order_id"])
+    assert [order["order_id"] for order in second_page] == [order_head.order_id]
+    assert Orders.get_all_orders(limit=1, after=second_page[-1]["order_id"]) == []
+
+@pytest.mark.parametrize("limit, after", [(0, None), (-1, None), ("10", None), (10, -1)])
+def test_get_all_orders_invalid_page(session, limit, after):
+    """Test validation errors for invalid pagination arguments."""
+    with pytest.raises(ValueError):
+        Orders.get_all_orders(limit=limit, after=after)
+
+def test_iter_all_orders(session, order_wilson: Orders, order_head: Orders):
+    """Test streaming all orders in chunks."""
+    chunks = list(Orders.iter_all_orders(chunk_size=1))
+    assert [[order["order_id"] for order in chunk] for chunk in chunks] == [[order_wilson.order_id], [order_head.order_id]]
+    assert list(Orders.iter_all_orders(after=order_wilson.order_id))[0][0]["customer"] == order_head.customer
+
+def test_iter_all_orders_limit(session, order_wilson: Orders, order_head: Orders):
+    """Test that a limit caps the streamed orders, not just the chunk size."""
+    chunks = list(Orders.iter_all_orders(chunk_size=5, limit=1))
+    assert [[order["order_id"] for order in chunk] for chunk in chunks] == [[order_wilson.order_id]]
+    assert sum(len(chunk) for chunk in Orders.iter_all_orders(chunk_size=1, limit=5)) == 2
+
+def test_iter_all_orders_invalid_chunk_size(session):
+    """Test that invalid chunk sizes are rejected before iterating."""
+    with pytest.raises(ValueError, match="limit must be a positive integer"):
+        Orders.iter_all_orders(chunk_size=0)
+
+# --- Search ---
+
+def test_search_orders_combined_filters(session, order_wilson: Orders, order_head: Orders):
+    """Test searching orders by several filters at once."""
+    orders, next_cursor = Orders.search_orders(stringer="Alex", paid=True, date_from=date(2025, 6, 15))
+    assert [order["order_id"] for order in orders] == [order_head.order_id]
+    assert next_cursor is None
+
+def test_search_orders_by_string(session, order_wilson: Orders, order_head: Orders):
+    """Test that the string filter matches either the mains or the crosses."""
+    orders, _ = Orders.search_orders(string="Head Synthetic Gut")
+    assert [order["order_id"] for order in orders] == [order_head.order_id]
+
+def test_search_orders_sorted_pages(session, order_wilson: Orders, order_head: Orders):
+    """Test keyset paging through a date-sorted search."""
+    first_page, next_cursor = Orders.search_orders(sort="-order_date", limit=1)
+    assert [order["order_id"] for order in first_page] == [order_head.order_id]
+    assert next_cursor == "20250618:2"
+    second_page, next_cursor = Orders.search_orders(sort="-order_date", limit=1, cursor=next_cursor)
+    assert [order["order_id"] for order in second_page] == [order_wilson.order_id]
+    assert next_cursor is None
+
+@pytest.mark.parametrize("kwargs", [
+    {"sort": "racket"},
+    {"limit": 0},
+    {"cursor": "not-a-cursor"},
+    {"sort": "order_date", "cursor": "2025:1"},
+    {"paid": "yes"},
+    {"customer": ""},
+    {"date_from": date(2025, 6, 2), "date_to": date(2025, 6, 1)},
+])
+def test_search_orders_invalid(session, kwargs):
+    """Test validation errors for invalid search arguments."""
+    with pytest.raises(ValueError):
+        Orders.search_orders(**kwargs)
+
 # --- Update ---
 def test_update_order(session, order_wilson: Orders):
     """Test updating an existing order."""
@@ -247,6 +363,90 @@ def test_assign_stringer_invalid_stringer(session, order_head: Orders):
     with pytest.raises(ValueError, match="stringer must be a non-empty string"):
         Orders.assign_stringer(order_head.order_id, 1)
 
+# --- Bulk status changes ---
+
+def test_mark_paid_bulk(session, order_wilson: Orders, order_head: Orders):
+    """Test marking many orders as paid by ID."""
+    result = Orders.mark_paid_bulk(order_ids=[order_wilson.order_id, order_head.order_id, 999])
+    assert result == {"changed": [order_wilson.order_id], "unchanged": [order_head.order_id], "not_found": [999]}
+    assert session.get(Orders, order_wilson.order_id).paid
+
+def test_mark_paid_bulk_chunks_ids(session, mocker: MockerFixture, order_wilson: Orders, order_head: Orders):
+    """Test that bulk IDs are bound in IN lists of at most IN_CLAUSE_CHUNK_SIZE."""
+    mocker.patch("RacketTracker.models.order_model.IN_CLAUSE_CHUNK_SIZE", 1)
+    in_lists = []
+    def capture(conn, cursor, statement, parameters, *args):
+        if "order_id IN (" in statement:
+            in_lists.append(statement.split("order_id IN (", 1)[1].split(")", 1)[0].count("?"))
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        result = Orders.mark_paid_bulk(order_ids=[order_head.order_id, 999, order_wilson.order_id])
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+    assert result == {"changed": [order_wilson.order_id], "unchanged": [order_head.order_id], "not_found": [999]}
+    assert in_lists and max(in_lists) == 1
+
+def test_mark_paid_bulk_counts_only_what_it_changed(session, order_wilson: Orders, order_head: Orders):
+    """Test that an order another writer marks paid just before the UPDATE is reported unchanged."""
+    def concurrent_payment(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE orders"):
+            cursor.connection.execute("UPDATE orders SET paid = 1 WHERE order_id = ?", (order_wilson.order_id,))
+    event.listen(db.engine, "before_cursor_execute", concurrent_payment)
+    try:
+        result = Orders.mark_paid_bulk(order_ids=[order_wilson.order_id, order_head.order_id])
+    finally:
+        event.remove(db.engine, "before_cursor_execute", concurrent_payment)
+    assert result == {"changed": [], "unchanged": [order_wilson.order_id, order_head.order_id], "not_found": []}
+
+def test_assign_stringer_bulk_sets_missing_stringers(session, order_wilson: Orders, order_head: Orders):
+    """Test that orders without a stringer count as changed when one is assigned."""
+    session.add(Orders(order_id=3, customer="Rocky", order_date=date(2025, 6, 20), racket="Head Speed MP",
+                       mains_tension=54, mains_string="Head Velocity", paid=False, completed=False))
+    session.commit()
+    result = Orders.assign_stringer_bulk("Alex", filters={"customer": "Rocky"})
+    assert result == {"changed": [3], "unchanged": [order_head.order_id], "not_found": []}
+
+def test_mark_completed_bulk_by_filter(session, order_wilson: Orders, order_head: Orders):
+    """Test marking the orders selected by a filter as completed."""
+    result = Orders.mark_completed_bulk(filters={"customer": "Rocky"})
+    assert result == {"changed": [order_head.order_id], "unchanged": [], "not_found": []}
+    assert session.get(Orders, order_head.order_id).completed
+    assert not session.get(Orders, order_wilson.order_id).completed
+
+def test_assign_stringer_bulk(session, order_wilson: Orders, order_head: Orders):
+    """Test assigning a stringer to many orders."""
+    Orders.assign_stringer(order_head.order_id, "Kempton")
+    result = Orders.assign_stringer_bulk("Kempton", order_ids=[order_wilson.order_id, order_head.order_id])
+    assert result["changed"] == [order_wilson.order_id]
+    assert result["unchanged"] == [order_head.order_id]
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"order_ids": [1], "filters": {"customer": "Alex"}},
+    {"order_ids": []},
+    {"order_ids": ["1"]},
+    {"filters": {}},
+    {"filters": {"paid": "no"}},
+    {"filters": {"customer": None}},
+    {"filters": {"notes": "x"}},
+])
+def test_mark_paid_bulk_invalid(session, kwargs):
+    """Test validation errors for invalid bulk targets."""
+    with pytest.raises(ValueError):
+        Orders.mark_paid_bulk(**kwargs)
+
+def test_mark_paid_bulk_filter_too_broad(session, mocker: MockerFixture, order_wilson: Orders, order_head: Orders):
+    """Test that a filter matching more than BULK_MAX_ORDERS orders changes nothing."""
+    mocker.patch("RacketTracker.models.order_model.BULK_MAX_ORDERS", 1)
+    with pytest.raises(ValueError, match="more than 1 orders"):
+        Orders.mark_paid_bulk(filters={"completed": False})
+    assert not session.get(Orders, order_wilson.order_id).paid
+
+def test_assign_stringer_bulk_invalid_stringer(session, order_head: Orders):
+    """Test error when assigning an invalid stringer in bulk."""
+    with pytest.raises(ValueError, match="stringer must be a non-empty string"):
+        Orders.assign_stringer_bulk(1, order_ids=[order_head.order_id])
+
 # --- Delete order ---
 
 def test_delete_order_by_id(session, order_wilson: Orders):
@@ -277,6 +477,36 @@ def test_delete_order_by_completed(session, order_wilson: Orders):
     deleted = session.query(Orders).filter_by(completed=order_wilson.completed).first()
     assert deleted is None
 
+def test_delete_order_by_customer_deletes_all(session, order_wilson: Orders, order_head: Orders):
+    """Test that every order of the customer is deleted, in chunks."""
+    Orders.update_order(order_head.order_id, customer="Alex")
+    deleted = Orders.delete_order_by_customer("Alex", chunk_size=1)
+    assert deleted == 2
+    assert session.query(Orders).count() == 0
 
-
+def test_delete_order_by_customer_not_found(session, order_wilson: Orders):
+    """Test error when deleting orders of a nonexistent customer."""
+    with pytest.raises(ValueError, match="not found"):
+        Orders.delete_order_by_customer("nonexistent_customer")
+
+def test_delete_order_by_completed_count(session, order_wilson: Orders, order_head: Orders):
+    """Test that the number of deleted orders is returned."""
+    assert Orders.delete_order_by_completed(False) == 2
+
+def test_delete_orders_by_filter(session, order_wilson: Orders, order_head: Orders):
+    """Test deleting the orders matching a filter."""
+    assert Orders.delete_orders({"paid": True, "date_from": date(2025, 6, 15)}) == 1
+    assert [order.customer for order in session.query(Orders).all()] == ["Alex"]
+
+@pytest.mark.parametrize("filters, chunk_size", [
+    ({}, 10),
+    ({"customer": "Alex"}, 0),
+    ({"customer": None}, 10),
+    ({"notes": "x"}, 10),
+])
+def test_delete_orders_invalid(session, order_wilson: Orders, filters, chunk_size):
+    """Test validation errors for invalid delete filters and chunk sizes."""
+    with pytest.raises(ValueError):
+        Orders.delete_orders(filters, chunk_size=chunk_size)
+    assert session.query(Orders).count() == 1
 
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from collections import Counter
+
+import pytest
+from flask import Flask
+from flask_login import LoginManager
+
+from RacketTracker.models.user_model import SessionUser
+from RacketTracker.utils import profiling
+from RacketTracker.utils.profiling import (
+    PROFILE_FILE_HEADER, PROFILE_HEADER, ContinuousProfiler, StackSampler, collect_stack,
+    init_continuous_profiler, init_request_profiling, to_collapsed, to_speedscope,
+)
+
+
+def busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def make_app(tmp_path, enabled=True) -> Flask:
+    """A bare app whose requests authenticate as the user named in X-User."""
+    app = Flask(__name__)
+    app.config.update(PROFILE_REQUESTS_ENABLED=enabled, PROFILE_DIR=str(tmp_path), ADMIN_USERS="alex")
+    login_manager = LoginManager(app)
+    login_manager.request_loader(lambda req: SessionUser(1, req.headers["X-User"]) if "X-User" in req.headers else None)
+
+    @app.route("/slow")
+    def slow():
+        busy(0.05)
+        return "done"
+
+    init_request_profiling(app)
+    return app
+
+def test_collect_stack_outermost_first():
+    """Test that stacks are listed from the outermost frame and can be cut at a frame."""
+    def inner():
+        import sys
+        return sys._getframe()
+
+    def outer():
+        return inner()
+
+    stack = collect_stack(outer(), stop_at=None)
+    assert stack[-1].startswith("test_collect_stack_outermost_first.<locals>.inner (test_profiling.py:")
+    assert collect_stack(outer(), stop_at=test_collect_stack_outermost_first.__code__) == stack[-2:]
+
+def test_collapsed_and_speedscope():
+    """Test both export formats from the same stack counts."""
+    stacks = Counter({("main", "handler", "json"): 3, ("main", "handler"): 1})
+    assert to_collapsed(stacks) == "main;handler;json 3\nmain;handler 1\n"
+    doc = to_speedscope(stacks, "req", interval=0.001)
+    frames = [frame["name"] for frame in doc["shared"]["frames"]]
+    profile = doc["profiles"][0]
+    assert frames == ["main", "handler", "json"]
+    assert profile["samples"] == [[0, 1, 2], [0, 1]]
+    assert profile["weights"] == [3.0, 1.0] and profile["endValue"] == 4.0
+
+def test_stack_sampler_sees_busy_function():
+    """Test that sampling another thread attributes time to the function it runs."""
+    sampler = StackSampler(threading.get_ident(), interval=0.001).start()
+    busy(0.05)
+    stacks = sampler.stop()
+    assert sum(stacks.values()) > 0
+    assert any(stack and stack[-1].startswith("busy ") for stack in stacks)
+
+def test_admin_request_is_profiled(tmp_path):
+    """Test that an admin's X-Profile request writes collapsed and speedscope files."""
+    response = make_app(tmp_path).test_client().get("/slow", headers={PROFILE_HEADER: "1", "X-User": "alex"})
+    assert response.status_code == 200 and response.data == b"done"
+    name = response.headers[PROFILE_FILE_HEADER]
+    collapsed = (tmp_path / f"{name}.collapsed.txt").read_text()
+    assert "slow (test_profiling.py:" in collapsed and "busy (test_profiling.py:" in collapsed
+    assert json.loads((tmp_path / f"{name}.speedscope.json").read_text())["profiles"][0]["type"] == "sampled"
+
+@pytest.mark.parametrize("headers", [{PROFILE_HEADER: "1", "X-User": "rocky"}, {PROFILE_HEADER: "1"}, {"X-User": "alex"}])
+def test_other_requests_are_not_profiled(tmp_path, headers):
+    """Test that the header is ignored from non-admins and that admins must opt in."""
+    response = make_app(tmp_path).test_client().get("/slow", headers=headers)
+    assert response.status_code == 200
+    assert PROFILE_FILE_HEADER not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+def test_disabled_by_default(tmp_path):
+    """Test that nothing is wrapped unless profiling is enabled."""
+    app = make_app(tmp_path, enabled=False)
+    assert app.view_functions["slow"].__name__ == "slow"
+    assert not hasattr(app.view_functions["slow"], "__wrapped__")
+
+def test_continuous_profiler_samples_tracked_threads_only():
+    """Test that only threads handling a request are sampled."""
+    profiler = ContinuousProfiler()
+    profiler.sample()
+    assert profiler.samples == 0
+
+    profiler.track()
+    profiler.sample()
+    profiler.sample()
+    profiler.untrack()
+    profiler.sample()
+    stacks = profiler.snapshot()
+    assert profiler.samples == 2 and sum(stacks.values()) == 2
+    assert any(stack[-1].startswith("ContinuousProfiler.sample ") for stack in stacks)
+
+def test_continuous_profiler_window(monkeypatch):
+    """Test that samples older than the window are dropped and snapshots can be narrowed."""
+    clock = [1000.0]
+    monkeypatch.setattr(profiling.time, "monotonic", lambda: clock[0])
+    profiler = ContinuousProfiler(window=60, bucket_seconds=10)
+    profiler.track()
+    profiler.sample()
+    clock[0] += 30
+    profiler.sample()
+    assert sum(profiler.snapshot().values()) == 2
+    assert sum(profiler.snapshot(seconds=5).values()) == 1
+    clock[0] += 45
+    profiler.sample()
+    assert sum(profiler.snapshot().values()) == 2
+
+def test_continuous_profiler_sees_requests(tmp_path):
+    """Test that the background thread attributes request time to the view."""
+    app = make_app(tmp_path, enabled=False)
+    app.config.update(PROFILER_ENABLED=True, PROFILER_HZ=500)
+    profiler = init_continuous_profiler(app)
+    try:
+        app.test_client().get("/slow")
+    finally:
+        profiler.stop()
+    stacks = profiler.snapshot()
+    assert any("slow (test_profiling.py:" in ";".join(stack) for stack in stacks)
+    assert profiler.stats()["samples"] == sum(stacks.values())
+
+def test_admin_profile_disabled(app, client, session, monkeypatch):
+    """Test that the profile endpoint reports a disabled profiler."""
+    monkeypatch.setitem(app.config, "SECRET_KEY", "test-secret-key")
+    monkeypatch.setitem(app.config, "ADMIN_USERS", "alex")
+    client.put("/api/create-user", json={"username": "alex", "password": "pw"})
+    client.post("/api/login", json={"username": "alex", "password": "pw"})
+    assert client.get("/api/admin/profile").status_code == 404
+    client.post("/api/logout")
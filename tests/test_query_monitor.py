@@ -0,0 +1,84 @@
+import pytest
+from flask import Flask, g
+from sqlalchemy import create_engine, text
+
+from RacketTracker.utils.query_monitor import QueryMonitor, parameter_shape, statement_shape
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer TEXT)"))
+        conn.execute(text("CREATE INDEX ix_orders_customer ON orders (customer)"))
+    yield engine
+    engine.dispose()
+
+def test_statement_shape():
+    """Test that whitespace and expanded IN lists do not change the shape."""
+    assert statement_shape("SELECT *\n  FROM orders WHERE id IN (?, ?, ?)") == "SELECT * FROM orders WHERE id IN (?...)"
+    assert statement_shape("SELECT * FROM orders WHERE id IN (?,?)") == "SELECT * FROM orders WHERE id IN (?...)"
+    assert statement_shape("SELECT * FROM orders WHERE id = ?") == "SELECT * FROM orders WHERE id = ?"
+
+def test_parameter_shape_has_no_values():
+    """Test that parameters are described by type only."""
+    assert parameter_shape((7, "alex"), False) == "(int, str)"
+    assert parameter_shape({"customer": "alex"}, False) == "{customer: str}"
+    assert parameter_shape([(1, "a"), (2, "b")], True) == "2 x (int, str)"
+
+def test_slow_query_recorded_with_plan(engine):
+    """Test that statements over the threshold are kept with their query plan."""
+    monitor = QueryMonitor(slow_ms=0)
+    monitor.attach(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT id FROM orders WHERE customer = :customer"), {"customer": "alex"})
+    entry = monitor.report()["slow_queries"][-1]
+    assert entry["statement"] == "SELECT id FROM orders WHERE customer = ?"
+    assert entry["parameters"] == "(str)"
+    assert any("ix_orders_customer" in step for step in entry["plan"])
+    assert "alex" not in str(entry)
+
+def test_fast_queries_not_recorded(engine):
+    """Test that statements under the threshold are not kept."""
+    monitor = QueryMonitor(slow_ms=10_000)
+    monitor.attach(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert monitor.report()["slow_queries"] == []
+
+def test_repeated_statement_flagged(engine):
+    """Test that a request running one statement shape too often is flagged once."""
+    monitor = QueryMonitor(slow_ms=10_000, repeat_threshold=3)
+    monitor.attach(engine)
+    with Flask(__name__).test_request_context("/api/orders"):
+        g.request_id = "req-1"
+        with engine.connect() as conn:
+            for order_id in range(5):
+                conn.execute(text("SELECT customer FROM orders WHERE id = :id"), {"id": order_id})
+            conn.execute(text("SELECT count(*) FROM orders"))
+        findings = monitor.end_request()
+    assert len(findings) == 1
+    assert findings[0]["count"] == 5 and findings[0]["request_id"] == "req-1"
+    assert monitor.report()["repeated_queries"] == findings
+    monitor.clear()
+    assert monitor.report()["repeated_queries"] == []
+
+def test_admin_queries_requires_login(client):
+    """Test that the admin endpoint rejects anonymous requests."""
+    assert client.get("/api/admin/queries").status_code == 401
+
+def test_admin_queries_requires_admin(app, client, session, monkeypatch):
+    """Test that only users listed in ADMIN_USERS may read the findings."""
+    monkeypatch.setitem(app.config, "SECRET_KEY", "test-secret-key")
+    client.put("/api/create-user", json={"username": "alex", "password": "pw"})
+    client.post("/api/login", json={"username": "alex", "password": "pw"})
+
+    monkeypatch.setitem(app.config, "ADMIN_USERS", "rocky")
+    assert client.get("/api/admin/queries").status_code == 403
+
+    monkeypatch.setitem(app.config, "ADMIN_USERS", "rocky, alex")
+    response = client.get("/api/admin/queries")
+    assert response.status_code == 200
+    assert {"slow_queries", "repeated_queries", "slow_ms", "repeat_threshold"} <= response.get_json().keys()
+    assert client.delete("/api/admin/queries").status_code == 200
+    client.post("/api/logout")
@@ -0,0 +1,101 @@
+import re
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from RacketTracker.db import db
+from RacketTracker.models.order_model import Orders
+from datetime import date
+
+# A plan line such as "SCAN orders" (without "USING ... INDEX") means a full table scan.
+FULL_SCAN = re.compile(r"^SCAN orders(?! USING)")
+
+# --- Fixtures ---
+
+@pytest.fixture
+def orders(session):
+    rows = [
+        Orders(customer="Alex", stringer="Kempton", order_date=date(2025, 6, 10), racket="Wilson Pro Staff",
+               mains_tension=52, mains_string="Luxilon ALU Power", paid=False, completed=False),
+        Orders(customer="Rocky", stringer="Alex", order_date=date(2025, 6, 18), racket="Head Speed MP",
+               mains_tension=54, mains_string="Head Velocity", paid=True, completed=True),
+    ]
+    session.add_all(rows)
+    session.commit()
+    return rows
+
+@contextmanager
+def captured_statements():
+    """Records every statement sent to the database while the block runs."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+def full_scans(session, statements) -> list[str]:
+    """Runs EXPLAIN QUERY PLAN for each statement and returns the ones that scan orders."""
+    cursor = session.connection().connection.cursor()
+    scans = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            continue
+        plan = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        scans.extend(f"{statement} -> {row[3]}" for row in plan if FULL_SCAN.match(row[3]))
+    return scans
+
+# --- Query plans ---
+
+MODEL_QUERIES = {
+    "get_order_by_id": lambda: Orders.get_order_by_id(1),
+    "get_orders_by_customer": lambda: Orders.get_orders_by_customer("Alex"),
+    "get_orders_by_order_date": lambda: Orders.get_orders_by_order_date(date(2025, 6, 10)),
+    "get_orders_by_completed_open": lambda: Orders.get_orders_by_completed(False),
+    # get_orders_by_completed(True) is left out: completed orders are nearly the whole
+    # history, so reading them is a table scan by design.
+    "get_all_orders_page": lambda: Orders.get_all_orders(limit=10, after=0),
+    "iter_all_orders": lambda: list(Orders.iter_all_orders(chunk_size=1, after=0)),
+    "search_by_customer_sorted_by_date": lambda: Orders.search_orders(customer="Alex", sort="-order_date"),
+    "search_by_date_range": lambda: Orders.search_orders(date_from=date(2025, 6, 1), date_to=date(2025, 6, 30), sort="order_date", cursor="20250601:0"),
+    "search_by_stringer_and_completed": lambda: Orders.search_orders(stringer="Kempton", completed=False),
+    "search_unpaid_page": lambda: Orders.search_orders(paid=False, cursor="0"),
+    "update_order": lambda: Orders.update_order(1, racket="Head Speed MP"),
+    "mark_completed": lambda: Orders.mark_completed(1),
+    "mark_paid": lambda: Orders.mark_paid(1),
+    "assign_stringer": lambda: Orders.assign_stringer(1, "Kempton"),
+    "mark_paid_bulk": lambda: Orders.mark_paid_bulk(order_ids=[1, 2]),
+    "mark_completed_bulk_by_customer": lambda: Orders.mark_completed_bulk(filters={"customer": "Alex"}),
+    "assign_stringer_bulk_open_orders": lambda: Orders.assign_stringer_bulk("Kempton", filters={"completed": False}),
+    "delete_order": lambda: Orders.delete_order(1),
+    "delete_order_by_customer": lambda: Orders.delete_order_by_customer("Alex"),
+    "delete_order_by_order_date": lambda: Orders.delete_order_by_order_date(date(2025, 6, 10)),
+    "delete_order_by_completed": lambda: Orders.delete_order_by_completed(False),
+    "delete_orders_by_date_range": lambda: Orders.delete_orders({"date_from": date(2025, 6, 1), "date_to": date(2025, 6, 12)}, chunk_size=1),
+}
+
+@pytest.mark.parametrize("name", MODEL_QUERIES)
+def test_model_queries_use_indexes(session, orders, name):
+    """Every Orders query must be answered from the primary key or a secondary index."""
+    with captured_statements() as statements:
+        MODEL_QUERIES[name]()
+    assert statements, f"{name} issued no statements"
+    assert full_scans(session, statements) == []
+
+def test_managed_indexes_exist(session):
+    """Test that every managed index is present on the orders table."""
+    names = {row[1] for row in session.connection().exec_driver_sql("PRAGMA index_list('orders')")}
+    assert {index.name for index in Orders.__table__.indexes} <= names
+
+def test_retired_indexes_are_dropped(session):
+    """Test that ensure_indexes removes indexes an older version created."""
+    db.session.connection().exec_driver_sql("CREATE INDEX ix_orders_done ON orders (order_id) WHERE completed = 1")
+    db.session.commit()
+    Orders.ensure_indexes()
+    names = {row[1] for row in session.connection().exec_driver_sql("PRAGMA index_list('orders')")}
+    assert "ix_orders_done" not in names
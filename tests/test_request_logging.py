@@ -0,0 +1,52 @@
+import json
+import logging
+
+import pytest
+
+from RacketTracker.utils import request_logging
+from RacketTracker.utils.request_logging import REQUEST_ID_HEADER, should_log
+
+
+@pytest.fixture
+def access_lines(monkeypatch):
+    """Collects the JSON access lines written during the test."""
+    lines = []
+    monkeypatch.setattr(request_logging.access_logger, "info", lambda msg, *args, **kwargs: lines.append(json.loads(msg)))
+    return lines
+
+def test_request_id_is_returned(client):
+    """Test that each response carries a generated request ID."""
+    first = client.get("/api/health").headers[REQUEST_ID_HEADER]
+    second = client.get("/api/health").headers[REQUEST_ID_HEADER]
+    assert len(first) == 32 and first != second
+
+def test_incoming_request_id_is_kept(client):
+    """Test that a well-formed incoming request ID is reused and a malformed one replaced."""
+    assert client.get("/api/health", headers={REQUEST_ID_HEADER: "pos-42"}).headers[REQUEST_ID_HEADER] == "pos-42"
+    assert client.get("/api/health", headers={REQUEST_ID_HEADER: "bad id!"}).headers[REQUEST_ID_HEADER] != "bad id!"
+
+def test_access_line(client, session, access_lines):
+    """Test that one access line records route, status, timing and database usage."""
+    response = client.put("/api/create-user", json={"username": "alex", "password": "pw"})
+    assert len(access_lines) == 1
+    line = access_lines[0]
+    assert line["request_id"] == response.headers[REQUEST_ID_HEADER]
+    assert (line["method"], line["route"], line["status"]) == ("PUT", "/api/create-user", 201)
+    assert line["db_queries"] >= 1
+    assert line["duration_ms"] >= line["db_ms"] >= 0
+
+def test_log_records_carry_request_id(client, caplog):
+    """Test that free-text log lines written during a request carry its ID."""
+    with caplog.at_level(logging.INFO):
+        client.get("/api/health", headers={REQUEST_ID_HEADER: "trace-me"})
+    health = [record for record in caplog.records if record.getMessage() == "Health check endpoint hit"]
+    assert health and health[0].request_id == "trace-me"
+
+def test_should_log_sampling(monkeypatch):
+    """Test that only fast, successful GETs are sampled."""
+    monkeypatch.setattr(request_logging.random, "random", lambda: 0.9)
+    assert should_log("GET", 200, 5, sample_rate=0.1, slow_ms=500) is False
+    assert should_log("GET", 200, 600, sample_rate=0.1, slow_ms=500) is True
+    assert should_log("GET", 404, 5, sample_rate=0.1, slow_ms=500) is True
+    assert should_log("POST", 201, 5, sample_rate=0.1, slow_ms=500) is True
+    assert should_log("GET", 200, 5, sample_rate=1.0, slow_ms=500) is True
@@ -0,0 +1,58 @@
+import json
+
+from flask import Flask, jsonify
+
+from RacketTracker.utils.request_recorder import init_request_recorder, scrub
+
+
+def make_app(tmp_path, enabled=True) -> Flask:
+    app = Flask(__name__)
+    app.config.update(REQUEST_RECORD_ENABLED=enabled, REQUEST_RECORD_PATH=str(tmp_path / "trace.jsonl"))
+
+    @app.route("/api/login", methods=["POST"])
+    def login():
+        return jsonify({"status": "success"})
+
+    @app.route("/api/orders/by-customer/<string:customer>")
+    def by_customer(customer):
+        return jsonify({"orders": []})
+
+    @app.route("/api/admin/queries")
+    def admin():
+        return jsonify({})
+
+    init_request_recorder(app)
+    return app
+
+def read_trace(tmp_path) -> list[dict]:
+    return [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+
+def test_scrub_nested_credentials():
+    """Test that credential fields are replaced at any depth and other fields kept."""
+    body = {"username": "alex", "Password": "pw", "nested": [{"new_password": "x", "paid": True}]}
+    assert scrub(body) == {"username": "alex", "Password": "***", "nested": [{"new_password": "***", "paid": True}]}
+    assert scrub(None) is None
+
+def test_requests_are_recorded(tmp_path):
+    """Test that each request becomes one replayable line without secrets."""
+    client = make_app(tmp_path).test_client()
+    client.post("/api/login", json={"username": "alex", "password": "secret"}, headers={"Authorization": "Bearer abc"})
+    client.get("/api/orders/by-customer/Rocky?limit=5")
+    login, lookup = read_trace(tmp_path)
+    assert (login["method"], login["route"], login["status"]) == ("POST", "/api/login", 200)
+    assert login["body"] == {"username": "alex", "password": "***"}
+    assert "Authorization" not in login["headers"]
+    assert "secret" not in (tmp_path / "trace.jsonl").read_text()
+    assert (lookup["route"], lookup["path"], lookup["query"]) == ("/api/orders/by-customer/<string:customer>", "/api/orders/by-customer/Rocky", "limit=5")
+    assert lookup["body"] is None and lookup["offset"] >= login["offset"]
+
+def test_admin_requests_not_recorded(tmp_path):
+    """Test that admin endpoints stay out of the trace."""
+    client = make_app(tmp_path).test_client()
+    client.get("/api/admin/queries")
+    assert read_trace(tmp_path) == []
+
+def test_disabled_by_default(tmp_path):
+    """Test that nothing is written unless recording is enabled."""
+    make_app(tmp_path, enabled=False).test_client().get("/api/orders/by-customer/Rocky")
+    assert not (tmp_path / "trace.jsonl").exists()
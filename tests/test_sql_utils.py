@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+
+import pytest
+
+from RacketTracker.utils import sql_utils
+from RacketTracker.utils.sql_utils import SQLiteConnectionPool, apply_sqlite_pragmas, read_sqlite_pragmas
+
+
+@pytest.fixture
+def sqlite_conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "pragmas.db")
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), max_size=2, timeout=0.1, pragmas={"journal_mode": "WAL"})
+    yield pool
+    pool.close()
+
+# --- PRAGMAs ---
+
+def test_apply_sqlite_pragmas(sqlite_conn):
+    """Test that configured PRAGMAs take effect and are reported by name."""
+    pragmas = {"busy_timeout": 2500, "journal_mode": "WAL", "synchronous": "NORMAL",
+               "cache_size": -8192, "temp_store": "MEMORY"}
+    apply_sqlite_pragmas(sqlite_conn, pragmas)
+    assert read_sqlite_pragmas(sqlite_conn, pragmas) == {
+        "busy_timeout": 2500, "journal_mode": "WAL", "synchronous": "NORMAL",
+        "cache_size": -8192, "temp_store": "MEMORY",
+    }
+
+def test_apply_sqlite_pragmas_skips_empty_values(sqlite_conn):
+    """Test that empty values leave SQLite's default in place."""
+    apply_sqlite_pragmas(sqlite_conn, {"journal_mode": "", "synchronous": None})
+    assert read_sqlite_pragmas(sqlite_conn, ["journal_mode", "synchronous"]) == {
+        "journal_mode": "DELETE", "synchronous": "FULL",
+    }
+
+def test_apply_sqlite_pragmas_unknown_name(sqlite_conn):
+    """Test error when an unsupported PRAGMA is configured."""
+    with pytest.raises(ValueError, match="Unsupported SQLite PRAGMA"):
+        apply_sqlite_pragmas(sqlite_conn, {"writable_schema": "ON"})
+
+def test_apply_sqlite_pragmas_invalid_value(sqlite_conn):
+    """Test error when a PRAGMA value is not a plain number or keyword."""
+    with pytest.raises(ValueError, match="Invalid value for PRAGMA journal_mode"):
+        apply_sqlite_pragmas(sqlite_conn, {"journal_mode": "WAL; DROP TABLE orders"})
+
+# --- Connection pool ---
+
+def test_pool_reuses_connections(pool):
+    """Test that a released connection is handed out again instead of opening a new one."""
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    assert pool.opened == 1
+
+def test_pool_applies_pragmas_once(pool):
+    """Test that PRAGMAs are applied when the connection is opened."""
+    with pool.connection() as conn:
+        assert read_sqlite_pragmas(conn, ["journal_mode"]) == {"journal_mode": "WAL"}
+
+def test_pool_is_bounded(pool):
+    """Test error when every connection stays checked out past the timeout."""
+    with pool.connection(), pool.connection():
+        with pytest.raises(sqlite3.OperationalError, match="Timed out"):
+            pool.acquire()
+    assert pool.opened == 2
+
+def test_pool_waits_for_release(pool):
+    """Test that a waiting thread gets the connection another thread returns."""
+    pool.timeout = 5
+    first, second = pool.acquire(), pool.acquire()
+    threading.Timer(0.05, pool.release, args=(first,)).start()
+    assert pool.acquire() is first
+    pool.release(first)
+    pool.release(second)
+
+def test_pool_replaces_broken_connection(pool):
+    """Test that a connection failing the health check is replaced on checkout."""
+    with pool.connection() as conn:
+        pass
+    conn.close()
+    with pool.connection() as replacement:
+        assert replacement is not conn
+        assert replacement.execute("SELECT 1").fetchone() == (1,)
+    assert pool.opened == 2
+
+def test_pool_rolls_back_on_release(pool):
+    """Test that uncommitted work is discarded when the connection goes back."""
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+
+def test_get_db_connection_uses_pool(tmp_path, monkeypatch):
+    """Test that the module helpers share one pooled connection."""
+    monkeypatch.setattr(sql_utils, "DB_PATH", str(tmp_path / "helpers.db"))
+    with sql_utils.get_db_connection() as conn:
+        conn.execute("CREATE TABLE orders (order_id INTEGER PRIMARY KEY)")
+        conn.commit()
+    sql_utils.check_database_connection()
+    sql_utils.check_table_exists("orders")
+    with pytest.raises(Exception, match="does not exist"):
+        sql_utils.check_table_exists("customers")
+    assert sql_utils.get_pool().opened == 1
+    sql_utils.get_pool().close()
+
+def test_configure_pool_sets_helper_pragmas(tmp_path, monkeypatch):
+    """Test that the helpers open connections with the PRAGMAs passed to configure_pool."""
+    monkeypatch.setattr(sql_utils, "DB_PATH", str(tmp_path / "helpers.db"))
+    monkeypatch.setattr(sql_utils, "_pool_pragmas", {})
+    sql_utils.configure_pool({"journal_mode": "WAL", "busy_timeout": "1234"})
+    with sql_utils.get_db_connection() as conn:
+        assert read_sqlite_pragmas(conn, ["journal_mode", "busy_timeout"]) == {"journal_mode": "WAL", "busy_timeout": 1234}
+
+    # Other PRAGMAs replace the pool instead of reusing connections opened with the old ones
+    old_pool = sql_utils.get_pool()
+    sql_utils.configure_pool({"busy_timeout": "4321"})
+    with sql_utils.get_db_connection() as conn:
+        assert read_sqlite_pragmas(conn, ["busy_timeout"]) == {"busy_timeout": 4321}
+    assert sql_utils.get_pool() is not old_pool
+    sql_utils.get_pool().close()
+
+def test_connections_returned_to_a_replaced_pool_are_closed(tmp_path, monkeypatch):
+    """Test that a connection checked out while the pool was replaced is closed when returned."""
+    monkeypatch.setattr(sql_utils, "DB_PATH", str(tmp_path / "helpers.db"))
+    monkeypatch.setattr(sql_utils, "_pool_pragmas", {})
+    old_pool = sql_utils.get_pool()
+    idle, conn = old_pool.acquire(), old_pool.acquire()
+    old_pool.release(idle)
+
+    sql_utils.configure_pool({"busy_timeout": "4321"})
+    assert sql_utils.get_pool() is not old_pool
+    with pytest.raises(sqlite3.ProgrammingError):
+        idle.execute("SELECT 1")
+
+    old_pool.release(conn)
+    assert old_pool.stats()["idle"] == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    sql_utils.get_pool().close()
@@ -1,6 +1,12 @@
+import hashlib
+import threading
+
 import pytest
+from sqlalchemy import event
 
-from RacketTracker.models.user_model import Users
+from RacketTracker.db import db
+from RacketTracker.models.user_model import SessionUser, UserInvalidations, Users
+from RacketTracker.utils.cache import TTLCache
 
 
 @pytest.fixture
@@ -10,6 +16,21 @@ def sample_user():
         "password": "securepassword123"
     }
 
+@pytest.fixture
+def legacy_user(session, sample_user):
+    """A user whose password was stored with the original single SHA-256 scheme."""
+    salt = "0" * 32
+    legacy_hash = hashlib.sha256((sample_user["password"] + salt).encode()).hexdigest()
+    session.add(Users(username=sample_user["username"], salt=salt, password=legacy_hash))
+    session.commit()
+    return legacy_hash
+
+@pytest.fixture
+def session_cache(monkeypatch):
+    cache = TTLCache(max_size=8, ttl=60)
+    monkeypatch.setattr(Users, "session_cache", cache)
+    return cache
+
 
 ##########################################################
 # User Creation
@@ -26,7 +47,19 @@ def test_create_user(session, sample_user):
     assert user is not None, "User should be created in the database."
     assert user.username == sample_user["username"], "Username should match the input."
     assert len(user.salt) == 32, "Salt should be 32 characters (hex)."
-    assert len(user.password) == 64, "Password should be a 64-character SHA-256 hash."
+    assert user.password.startswith("pbkdf2_sha256$"), "Password should be a PBKDF2-SHA256 hash."
+    assert user.password != sample_user["password"], "Password should not be stored in plain text."
+
+def test_passwords_are_hashed_on_the_password_pool(session, sample_user, monkeypatch):
+    """Test that creating a user hashes on the pool, so a queued write only stores the hash."""
+    threads = []
+    generate = Users._generate_hashed_password
+    monkeypatch.setattr(Users, "_generate_hashed_password",
+                        classmethod(lambda cls, password: threads.append(threading.current_thread().name) or generate(password)))
+    Users.create_user(**sample_user)
+    Users.update_password(sample_user["username"], "newpassword456")
+    assert len(threads) == 2
+    assert all(name.startswith(Users.password_pool.name) for name in threads)
 
 def test_create_duplicate_user(session, sample_user):
     """Test attempting to create a user with a duplicate username."""
@@ -53,6 +86,45 @@ def test_check_password_user_not_found(session):
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         Users.check_password("nonexistentuser", "password")
 
+def test_check_password_upgrades_legacy_hash(session, sample_user, legacy_user):
+    """Test that a legacy SHA-256 hash is replaced with a KDF hash on a correct password."""
+    assert Users.check_password(**sample_user) is True
+    user = session.query(Users).filter_by(username=sample_user["username"]).first()
+    assert user.password.startswith("pbkdf2_sha256$")
+    assert Users.check_password(**sample_user) is True
+
+def test_check_password_keeps_legacy_hash_on_failure(session, sample_user, legacy_user):
+    """Test that a wrong password does not touch the stored legacy hash."""
+    assert Users.check_password(sample_user["username"], "wrongpassword") is False
+    user = session.query(Users).filter_by(username=sample_user["username"]).first()
+    assert user.password == legacy_user
+
+def test_authenticate_upgrades_weaker_hash(session, sample_user, session_cache, monkeypatch):
+    """Test that a hash made with fewer iterations is rehashed at the current cost."""
+    Users.create_user(**sample_user)
+    monkeypatch.setattr(Users.password_hasher, "iterations", Users.password_hasher.iterations + 1)
+    assert Users.authenticate(**sample_user) is not None
+    user = session.query(Users).filter_by(username=sample_user["username"]).first()
+    assert user.password.startswith(f"pbkdf2_sha256${Users.password_hasher.iterations}$")
+
+def test_authenticate(session, sample_user, session_cache):
+    """Test that a correct password returns the user and caches it for the session."""
+    Users.create_user(**sample_user)
+    user = Users.authenticate(**sample_user)
+    assert isinstance(user, SessionUser)
+    assert user.username == sample_user["username"]
+    assert Users.load_session_user(sample_user["username"]) is user
+
+def test_authenticate_incorrect_password(session, sample_user, session_cache):
+    """Test that a wrong password returns None."""
+    Users.create_user(**sample_user)
+    assert Users.authenticate(sample_user["username"], "wrongpassword") is None
+
+def test_authenticate_user_not_found(session):
+    """Test authenticating a non-existent user."""
+    with pytest.raises(ValueError, match="User nonexistentuser not found"):
+        Users.authenticate("nonexistentuser", "password")
+
 ##########################################################
 # Update Password
 ##########################################################
@@ -111,4 +183,64 @@ def test_get_id_by_username_user_not_found(session):
     Test failure when retrieving a non-existent user's ID by their username.
     """
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
-        Users.get_id_by_username("nonexistentuser")
\ No newline at end of file
+        Users.get_id_by_username("nonexistentuser")
+
+##########################################################
+# Session User Cache
+##########################################################
+
+def test_load_session_user(session, sample_user, session_cache):
+    """Test that the session user is loaded once and then served from the cache."""
+    Users.create_user(**sample_user)
+    user = Users.load_session_user(sample_user["username"])
+    assert isinstance(user, SessionUser)
+    assert user.get_id() == sample_user["username"]
+    assert user.id == Users.get_id_by_username(sample_user["username"])
+    assert Users.load_session_user(sample_user["username"]) is user
+    assert session_cache.stats()["hits"] == 1
+    assert session_cache.stats()["misses"] == 1
+
+def test_load_session_user_not_found(session, session_cache):
+    """Test that unknown usernames resolve to None and are not cached."""
+    assert Users.load_session_user("nonexistentuser") is None
+    assert session_cache.stats()["size"] == 0
+
+def test_update_password_invalidates_session_user(session, sample_user, session_cache):
+    """Test that changing the password drops the cached session user."""
+    Users.create_user(**sample_user)
+    Users.load_session_user(sample_user["username"])
+    Users.update_password(sample_user["username"], "newpassword456")
+    assert session_cache.stats()["size"] == 0
+
+def test_delete_user_invalidates_session_user(session, sample_user, session_cache):
+    """Test that a deleted user can no longer be resolved from the cache."""
+    Users.create_user(**sample_user)
+    Users.load_session_user(sample_user["username"])
+    Users.delete_user(sample_user["username"])
+    assert Users.load_session_user(sample_user["username"]) is None
+
+def test_invalidations_from_other_processes(session, sample_user, session_cache, monkeypatch):
+    """Test that invalidations recorded elsewhere empty the cache, checked once per refresh interval."""
+    Users.create_user(**sample_user)
+    monkeypatch.setattr(Users, "session_cache_refresh", 60.0)
+    monkeypatch.setattr(Users, "_next_invalidation_check", 0.0)
+    selects = []
+    def count(conn, cursor, statement, *args):
+        if statement.startswith("SELECT") and "user_invalidations" in statement:
+            selects.append(statement)
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        user = Users.load_session_user(sample_user["username"])
+        for _ in range(50):
+            assert Users.load_session_user(sample_user["username"]) is user
+        assert len(selects) == 1
+
+        # Another worker deletes the user; this one notices at its next check
+        session.add(UserInvalidations(username=sample_user["username"], invalidated_at=0.0))
+        session.commit()
+        assert Users.load_session_user(sample_user["username"]) is user
+        monkeypatch.setattr(Users, "_next_invalidation_check", 0.0)
+        assert Users.load_session_user(sample_user["username"]) is not user
+        assert len(selects) == 2
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
@@ -0,0 +1,37 @@
+import threading
+
+import pytest
+
+from RacketTracker.utils.worker_pool import BoundedWorkerPool, WorkerPoolBusy
+
+
+@pytest.fixture
+def pool():
+    pool = BoundedWorkerPool(max_workers=1, max_pending=1, timeout=0.1, name="test")
+    yield pool
+    pool.shutdown()
+
+def test_run_returns_result(pool):
+    """Test that the result of the job is returned to the caller."""
+    assert pool.run(lambda x, y: x * y, 6, y=7) == 42
+
+def test_run_reraises_job_error(pool):
+    """Test that an exception raised by the job reaches the caller."""
+    def fail():
+        raise ValueError("bad hash")
+
+    with pytest.raises(ValueError, match="bad hash"):
+        pool.run(fail)
+
+def test_slow_job_times_out_and_holds_its_slot(pool):
+    """Test errors when a job outlives the timeout and the pool is then saturated."""
+    release = threading.Event()
+    try:
+        with pytest.raises(WorkerPoolBusy, match="did not finish"):
+            pool.run(release.wait, 5)
+        with pytest.raises(WorkerPoolBusy, match="saturated"):
+            pool.run(lambda: None)
+    finally:
+        release.set()
+    pool.timeout = 5
+    assert pool.run(lambda: "free") == "free"
@@ -0,0 +1,195 @@
+import threading
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app import create_app
+from config import TestConfig
+from RacketTracker.db import db
+from RacketTracker.models.order_model import Orders
+from RacketTracker.utils.write_queue import WriteQueue, WriteQueueUnavailable
+
+
+@pytest.fixture
+def write_queue(app):
+    write_queue = WriteQueue(app)
+    yield write_queue
+    write_queue.stop(timeout=5)
+
+
+@pytest.fixture
+def queued_app(tmp_path):
+    """An app on a database file with the write queue enabled, counting the commits it makes."""
+    config = type("WriteQueueTestConfig", (TestConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}",
+        "REQUEST_LOG_ENABLED": False,
+        "WRITE_QUEUE_ENABLED": True,
+    })
+    app = create_app(config)
+    app.commits = 0
+    with app.app_context():
+        @event.listens_for(db.engine, "commit")
+        def _count(conn):
+            app.commits += 1
+    yield app
+    app.extensions["write_queue"].stop(timeout=5)
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def new_order(customer: str, **overrides) -> dict:
+    return {"customer": customer, "order_date": date(2025, 6, 10), "racket": "Wilson Pro Staff",
+            "mains_tension": 52, "mains_string": "Luxilon ALU Power", **overrides}
+
+
+def test_run_returns_result(write_queue):
+    """Test that each caller gets its own return value."""
+    assert write_queue.run(lambda x, y: x + y, 2, y=3) == 5
+
+
+def test_failed_write_is_isolated(write_queue):
+    """Test that one failing write does not fail the rest of its batch."""
+    def fail():
+        raise ValueError("bad order")
+
+    futures = [write_queue.submit(fail), write_queue.submit(lambda: "ok")]
+    with pytest.raises(ValueError, match="bad order"):
+        futures[0].result(timeout=5)
+    assert futures[1].result(timeout=5) == "ok"
+
+
+def test_concurrent_writes_are_group_committed(write_queue):
+    """Test that writes queued while the writer is busy share one commit."""
+    release = threading.Event()
+    blocker = write_queue.submit(release.wait, 5)
+    futures = [write_queue.submit(lambda n=n: n) for n in range(10)]
+    release.set()
+
+    assert blocker.result(timeout=5) is True
+    assert [future.result(timeout=5) for future in futures] == list(range(10))
+    assert write_queue.jobs == 11
+    assert write_queue.batches <= 2
+
+
+def test_run_times_out(write_queue):
+    """Test that a write stuck behind a busy writer raises instead of waiting forever."""
+    release = threading.Event()
+    blocker = write_queue.submit(release.wait, 5)
+    write_queue.timeout = 0.1
+    with pytest.raises(WriteQueueUnavailable):
+        write_queue.run(lambda: "late")
+    release.set()
+    assert blocker.result(timeout=5) is True
+
+
+class WriterDied(BaseException):
+    pass
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_dead_writer_is_restarted(write_queue, monkeypatch):
+    """Test that a batch the writer cannot finish fails its callers and a dead writer is replaced."""
+    monkeypatch.setattr(write_queue, "_run_batch", lambda session, batch: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        write_queue.run(lambda: "lost")
+
+    def die(session, batch):
+        raise WriterDied()
+
+    monkeypatch.setattr(write_queue, "_run_batch", die)
+    write_queue.timeout = 0.5
+    with pytest.raises(WriteQueueUnavailable):
+        write_queue.run(lambda: "lost")
+    write_queue._thread.join(timeout=5)
+    assert not write_queue._thread.is_alive()
+
+    monkeypatch.undo()
+    assert write_queue.run(lambda: "ok") == "ok"
+
+
+def test_orders_batch_commits_once_and_isolates_failures(queued_app):
+    """Test that real writes share one commit and a failing one is rolled back on its own."""
+    write_queue = queued_app.extensions["write_queue"]
+    release = threading.Event()
+    write_queue.submit(release.wait, 5)  # occupy the writer so the next writes batch up
+
+    def duplicate_id():
+        db.session.add(Orders(order_id=1, **new_order("Duplicate")))
+        db.session.commit()
+
+    def paid_then_fail():
+        Orders.mark_paid_bulk(filters={"customer": "Alex"})
+        raise ValueError("payment declined")
+
+    futures = [
+        write_queue.submit(Orders.create_order, **new_order("Alex")),
+        write_queue.submit(duplicate_id),
+        write_queue.submit(paid_then_fail),
+        write_queue.submit(Orders.create_orders_bulk, [new_order("Rocky"), new_order("Kempton", paid=True)]),
+    ]
+    commits = queued_app.commits
+    release.set()
+
+    assert futures[0].result(timeout=5) is None
+    with pytest.raises(IntegrityError):
+        futures[1].result(timeout=5)
+    with pytest.raises(ValueError, match="payment declined"):
+        futures[2].result(timeout=5)
+    assert futures[3].result(timeout=5) == ([2, 3], [])
+    assert queued_app.commits == commits + 1
+
+    with queued_app.app_context():
+        orders = db.session.query(Orders.customer, Orders.paid).order_by(Orders.order_id).all()
+    assert [tuple(order) for order in orders] == [("Alex", False), ("Rocky", False), ("Kempton", True)]
+
+
+def test_session_commit_and_rollback_are_scoped_to_the_write(queued_app):
+    """Test that a write's commit only flushes and its rollback discards only that write."""
+    write_queue = queued_app.extensions["write_queue"]
+    release = threading.Event()
+    write_queue.submit(release.wait, 5)
+
+    def create_then_undo():
+        Orders.create_order(**new_order("Rocky"))
+        db.session.add(Orders(**new_order("Kempton")))
+        db.session.flush()
+        db.session.rollback()
+        return db.session.query(Orders).count()
+
+    futures = [write_queue.submit(Orders.create_order, **new_order("Alex")), write_queue.submit(create_then_undo)]
+    commits = queued_app.commits
+    release.set()
+
+    assert futures[0].result(timeout=5) is None
+    assert futures[1].result(timeout=5) == 1
+    assert queued_app.commits == commits + 1
+    with queued_app.app_context():
+        assert [order.customer for order in db.session.query(Orders).all()] == ["Alex"]
+
+
+def test_chunked_delete_queues_each_chunk(queued_app):
+    """Test that a chunked delete submits every chunk as its own write, leaving room for others."""
+    write_queue = queued_app.extensions["write_queue"]
+    with queued_app.app_context():
+        Orders.create_orders_bulk([new_order("Alex") for _ in range(5)] + [new_order("Rocky")])
+        jobs = write_queue.jobs
+        assert Orders.delete_order_by_customer("Alex", chunk_size=2) == 5
+        assert write_queue.jobs == jobs + 3
+        assert [order.customer for order in db.session.query(Orders).all()] == ["Rocky"]
+
+
+def test_resets_and_nested_writes_go_through_the_queue(queued_app):
+    """Test that table resets are queued and a write queued from the writer runs inline."""
+    write_queue = queued_app.extensions["write_queue"]
+    with queued_app.app_context():
+        Orders.create_order(**new_order("Alex"))
+    jobs = write_queue.jobs
+    response = queued_app.test_client().delete("/api/reset-orders")
+    assert response.status_code == 200
+    assert write_queue.jobs == jobs + 1
+    assert write_queue.run(write_queue.run, lambda: "inner") == "inner"
+    with queued_app.app_context():
+        assert db.session.query(Orders).count() == 0